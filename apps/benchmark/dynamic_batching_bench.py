@@ -0,0 +1,126 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Load generator for the dynamic batching front end of the graph executor.
+Many clients send single-row requests concurrently, which are served by a
+module compiled for a batch, by a pool of single-row modules, or one by one.
+see README.md for the usage of this script.
+"""
+import argparse
+import threading
+import time
+
+import numpy as np
+
+import tvm
+from tvm import relay
+from tvm.contrib import graph_executor
+from tvm.contrib.dynamic_batching import DynamicBatcher
+from tvm.relay import testing
+
+
+def build_modules(network, batch_size, num_instances, target):
+    if network == "mlp":
+        mod, params = testing.mlp.get_workload(batch_size=batch_size)
+    else:
+        mod, params = testing.resnet.get_workload(batch_size=batch_size, num_layers=18)
+    with tvm.transform.PassContext(opt_level=3):
+        lib = relay.build(mod, target=target, params=params)
+    input_name = mod["main"].params[0].name_hint
+    input_shape = [int(x) for x in mod["main"].params[0].checked_type.shape]
+    modules = [graph_executor.GraphModule(lib["default"](tvm.cpu(0))) for _ in range(num_instances)]
+    return modules, input_name, input_shape[1:]
+
+
+def run_load(infer, input_name, row_shape, num_clients, duration):
+    """Send requests back to back from num_clients threads for duration seconds.
+
+    Returns
+    -------
+    latencies : numpy.ndarray
+        The latency of every request, in milliseconds.
+
+    throughput : float
+        The number of requests served per second.
+    """
+    latencies = [[] for _ in range(num_clients)]
+    data = np.random.uniform(size=[1] + row_shape).astype("float32")
+    start = time.perf_counter()
+    stop = start + duration
+
+    def client(costs):
+        while time.perf_counter() < stop:
+            tic = time.perf_counter()
+            infer(**{input_name: data})
+            costs.append((time.perf_counter() - tic) * 1000)
+
+    threads = [threading.Thread(target=client, args=(costs,)) for costs in latencies]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies = np.concatenate([np.array(costs) for costs in latencies])
+    return latencies, len(latencies) / elapsed
+
+
+def report(name, latencies, throughput):
+    print(
+        "%-24s %10.3f %10.3f %12.1f"
+        % (name, np.median(latencies), np.percentile(latencies, 99), throughput)
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--network", type=str, choices=["mlp", "resnet-18"], default="mlp")
+    parser.add_argument("--target", type=str, default="llvm")
+    parser.add_argument("--batch-size", type=int, default=8, help="The batch of the module")
+    parser.add_argument(
+        "--num-instances", type=int, default=4, help="The number of modules in the pool"
+    )
+    parser.add_argument("--max-latency-ms", type=float, default=2.0)
+    parser.add_argument("--clients", type=int, default=16, help="The number of concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per setup")
+    args = parser.parse_args()
+
+    print("------------------------------------------------------------")
+    print("%-24s %10s %10s %12s" % ("Setup", "p50 (ms)", "p99 (ms)", "Requests/s"))
+    print("------------------------------------------------------------")
+
+    # one module serving the requests one at a time
+    modules, input_name, row_shape = build_modules(args.network, 1, 1, args.target)
+    lock = threading.Lock()
+
+    def infer_serial(**inputs):
+        with lock:
+            modules[0].run(**inputs)
+            return [modules[0].get_output(0).numpy()]
+
+    report("serial", *run_load(infer_serial, input_name, row_shape, args.clients, args.duration))
+
+    setups = [
+        ("batch %d" % args.batch_size, args.batch_size, 1),
+        ("pool of %d" % args.num_instances, 1, args.num_instances),
+    ]
+    for name, batch_size, num_instances in setups:
+        modules, input_name, row_shape = build_modules(
+            args.network, batch_size, num_instances, args.target
+        )
+        with DynamicBatcher(modules, [input_name], args.max_latency_ms) as batcher:
+            report(
+                name, *run_load(batcher.infer, input_name, row_shape, args.clients, args.duration)
+            )
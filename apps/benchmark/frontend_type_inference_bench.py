@@ -0,0 +1,95 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Benchmark the type inference done while importing models in the Relay frontends.
+Each model is rebuilt node by node the way a frontend converts it, inferring the shape
+of every new node, with the full InferType pass and with IncrementalTypeInference.
+see README.md for the usage of this script.
+"""
+import argparse
+import time
+
+import tvm
+from tvm import relay
+from tvm.relay import testing
+from tvm.relay.expr_functor import ExprMutator
+from tvm.relay.frontend.common import IncrementalTypeInference, infer_shape
+
+
+class Reimporter(ExprMutator):
+    """Copy an expression bottom up, inferring the shape of each new call."""
+
+    def visit_call(self, call):
+        new_call = relay.Call(
+            call.op, [self.visit(arg) for arg in call.args], call.attrs, call.type_args, call.span
+        )
+        infer_shape(new_call)
+        return new_call
+
+
+def get_models(num_layers):
+    models = [
+        ("resnet-50", testing.resnet.get_workload(num_layers=50)[0]),
+        ("mobilenet", testing.mobilenet.get_workload()[0]),
+        ("inception_v3", testing.inception_v3.get_workload()[0]),
+    ]
+    # a deep synthetic transformer-like chain
+    x = relay.var("x", shape=(1, 128, 256))
+    y = x
+    for i in range(num_layers):
+        w = relay.var("w%d" % i, shape=(256, 256))
+        z = relay.nn.batch_matmul(y, relay.expand_dims(w, 0))
+        z = relay.nn.relu(z + relay.const(0.1))
+        z = relay.reshape(z, (1, 128, 4, 64))
+        z = relay.reshape(relay.transpose(z, (0, 2, 1, 3)), (1, 128, 256))
+        y = relay.nn.layer_norm(
+            y + z, relay.ones((256,), "float32"), relay.zeros((256,), "float32")
+        )
+    models.append(("synthetic-%d" % num_layers, tvm.IRModule.from_expr(y)))
+    return models
+
+
+def measure(mod, incremental):
+    tic = time.perf_counter()
+    if incremental:
+        with IncrementalTypeInference():
+            Reimporter().visit(mod["main"].body)
+    else:
+        Reimporter().visit(mod["main"].body)
+    return time.perf_counter() - tic
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--num-layers", type=int, default=100, help="The number of layers of the synthetic graph"
+    )
+    parser.add_argument(
+        "--skip-full", action="store_true", help="Skip the full pass, which is quadratic"
+    )
+    args = parser.parse_args()
+
+    print("--------------------------------------------------------")
+    print("%-20s %8s %12s %14s" % ("Model", "Nodes", "Full (s)", "Incremental (s)"))
+    print("--------------------------------------------------------")
+    for name, mod in get_models(args.num_layers):
+        num_nodes = [0]
+        relay.analysis.post_order_visit(
+            mod["main"], lambda n: num_nodes.__setitem__(0, num_nodes[0] + 1)
+        )
+        full = float("nan") if args.skip_full else measure(mod, incremental=False)
+        incremental = measure(mod, incremental=True)
+        print("%-20s %8d %12.3f %14.3f" % (name, num_nodes[0], full, incremental))
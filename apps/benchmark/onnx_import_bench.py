@@ -0,0 +1,130 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Benchmark the import of a deep ONNX transformer encoder, with every layer converted
+node by node, and with the repeated layers converted once and instantiated.
+see README.md for the usage of this script.
+"""
+import argparse
+import time
+
+import numpy as np
+from onnx import TensorProto, helper, numpy_helper
+
+import tvm
+from tvm import relay
+
+
+def get_model(num_layers, seq_len, hidden, num_heads):
+    """Build a BERT-like encoder of num_layers layers."""
+    head = hidden // num_heads
+    nodes = []
+    initializer = []
+
+    def weight(name, shape):
+        initializer.append(
+            numpy_helper.from_array(np.random.uniform(-0.1, 0.1, shape).astype("float32"), name)
+        )
+        return name
+
+    def const(name, value, dtype):
+        initializer.append(numpy_helper.from_array(np.array(value, dtype), name))
+        return name
+
+    def node(op, inputs, name, **attrs):
+        nodes.append(helper.make_node(op, inputs, [name], **attrs))
+        return name
+
+    def dense(x, prefix, units):
+        out = node("MatMul", [x, weight(prefix + "_w", (hidden, units))], prefix + "_mm")
+        return node("Add", [out, weight(prefix + "_b", (units,))], prefix + "_out")
+
+    def layer_norm(x, prefix):
+        mean = node("ReduceMean", [x], prefix + "_mean", axes=[-1])
+        diff = node("Sub", [x, mean], prefix + "_diff")
+        var = node("Mul", [diff, diff], prefix + "_sq")
+        var = node("ReduceMean", [var], prefix + "_var", axes=[-1])
+        var = node("Add", [var, const(prefix + "_eps", 1e-5, "float32")], prefix + "_var_eps")
+        out = node("Div", [diff, node("Sqrt", [var], prefix + "_std")], prefix + "_norm")
+        out = node("Mul", [out, weight(prefix + "_gamma", (hidden,))], prefix + "_scaled")
+        return node("Add", [out, weight(prefix + "_beta", (hidden,))], prefix + "_out")
+
+    def heads(x, prefix):
+        split = const(prefix + "_shape", [seq_len, num_heads, head], "int64")
+        out = node("Reshape", [x, split], prefix + "_split")
+        return node("Transpose", [out], prefix + "_heads", perm=[1, 0, 2])
+
+    x = "x"
+    for i in range(num_layers):
+        p = "layer%d" % i
+        q = heads(dense(x, p + "_q", hidden), p + "_q")
+        k = heads(dense(x, p + "_k", hidden), p + "_k")
+        v = heads(dense(x, p + "_v", hidden), p + "_v")
+        kt = node("Transpose", [k], p + "_kt", perm=[0, 2, 1])
+        scores = node("MatMul", [q, kt], p + "_scores")
+        scale = const(p + "_scale", 1.0 / np.sqrt(head), "float32")
+        scores = node("Mul", [scores, scale], p + "_scaled_scores")
+        probs = node("Softmax", [scores], p + "_probs", axis=-1)
+        ctx = node("MatMul", [probs, v], p + "_ctx")
+        ctx = node("Transpose", [ctx], p + "_ctx_t", perm=[1, 0, 2])
+        merge = const(p + "_merge", [seq_len, hidden], "int64")
+        ctx = node("Reshape", [ctx, merge], p + "_ctx_merged")
+        attn = dense(ctx, p + "_o", hidden)
+        x = layer_norm(node("Add", [x, attn], p + "_res1"), p + "_ln1")
+        ffn = node("Relu", [dense(x, p + "_ffn1", hidden)], p + "_ffn_relu")
+        ffn = dense(ffn, p + "_ffn2", hidden)
+        x = layer_norm(node("Add", [x, ffn], p + "_res2"), p + "_ln2")
+
+    graph = helper.make_graph(
+        nodes,
+        "encoder",
+        inputs=[helper.make_tensor_value_info("x", TensorProto.FLOAT, [seq_len, hidden])],
+        outputs=[helper.make_tensor_value_info(x, TensorProto.FLOAT, [seq_len, hidden])],
+        initializer=initializer,
+    )
+    return helper.make_model(graph, producer_name="onnx_import_bench")
+
+
+def measure(model, shape, deduplicate):
+    config = {"deduplicate_repeated_blocks": deduplicate}
+    tic = time.perf_counter()
+    mod, _ = relay.frontend.from_onnx(model, {"x": shape}, convert_config=config)
+    return time.perf_counter() - tic, mod
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-layers", type=int, default=48)
+    parser.add_argument("--seq-len", type=int, default=128)
+    parser.add_argument("--hidden", type=int, default=256)
+    parser.add_argument("--num-heads", type=int, default=4)
+    args = parser.parse_args()
+
+    model = get_model(args.num_layers, args.seq_len, args.hidden, args.num_heads)
+    shape = (args.seq_len, args.hidden)
+    repeats = relay.frontend.onnx._find_repeated_blocks(model.graph)
+
+    print("--------------------------------------------------------")
+    print(
+        "%d layers, %d nodes, repeated runs: %s" % (args.num_layers, len(model.graph.node), repeats)
+    )
+    print("%-24s %12s %10s" % ("Setup", "Import (s)", "Speedup"))
+    print("--------------------------------------------------------")
+    baseline, mod_ref = measure(model, shape, deduplicate=False)
+    print("%-24s %12.2f %10.2f" % ("node by node", baseline, 1.0))
+    elapsed, mod = measure(model, shape, deduplicate=True)
+    print("%-24s %12.2f %10.2f" % ("repeated blocks", elapsed, baseline / elapsed))
+    tvm.ir.assert_structural_equal(mod["main"], mod_ref["main"])
@@ -0,0 +1,94 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Benchmark the scaling of relay.build with the number of threads generating
+the kernels, and the rebuild time with the persistent kernel cache.
+see README.md for the usage of this script.
+"""
+import argparse
+import os
+import time
+
+import tvm
+from tvm import relay
+from tvm.contrib import utils
+from tvm.relay import testing
+
+
+def get_network(name, batch_size):
+    if name == "mobilenet":
+        return testing.mobilenet.get_workload(batch_size=batch_size)
+    if name == "inception_v3":
+        return testing.inception_v3.get_workload(batch_size=batch_size)
+    num_layers = int(name.split("-")[1])
+    return testing.resnet.get_workload(batch_size=batch_size, num_layers=num_layers)
+
+
+def measure_build(mod, params, target, config):
+    """Return the time of relay.build and of exporting the library, in seconds."""
+    temp = utils.tempdir()
+    tic = time.perf_counter()
+    with tvm.transform.PassContext(opt_level=3, config=config):
+        lib = relay.build(mod, target=target, params=params)
+    build_time = time.perf_counter() - tic
+    tic = time.perf_counter()
+    lib.export_library(temp.relpath("lib.so"))
+    return build_time, time.perf_counter() - tic
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--network",
+        type=str,
+        choices=["resnet-18", "resnet-50", "mobilenet", "inception_v3"],
+        default="resnet-50",
+    )
+    parser.add_argument("--target", type=str, default="llvm")
+    parser.add_argument(
+        "--max-workers", type=int, default=os.cpu_count(), help="The largest number of threads"
+    )
+    args = parser.parse_args()
+
+    mod, params = get_network(args.network, batch_size=1)
+    workers = [1]
+    while workers[-1] * 2 <= args.max_workers:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != args.max_workers:
+        workers.append(args.max_workers)
+
+    print("--------------------------------------------------------")
+    print("%-24s %10s %10s %10s" % ("Setup", "build (s)", "export (s)", "speedup"))
+    print("--------------------------------------------------------")
+    baseline = None
+    for num_workers in workers:
+        config = {"relay.backend.num_build_workers": num_workers}
+        build_time, export_time = measure_build(mod, params, args.target, config)
+        baseline = baseline or build_time
+        print(
+            "%-24s %10.2f %10.2f %10.2f"
+            % ("%d workers" % num_workers, build_time, export_time, baseline / build_time)
+        )
+
+    # a cold build filling the cache, then a rebuild from it
+    cache = utils.tempdir()
+    config = {
+        "relay.backend.kernel_cache_dir": cache.relpath("kernels"),
+        "relay.backend.num_build_workers": args.max_workers,
+    }
+    for name in ["cold cache", "warm cache"]:
+        build_time, export_time = measure_build(mod, params, args.target, config)
+        print("%-24s %10.2f %10.2f %10.2f" % (name, build_time, export_time, baseline / build_time))
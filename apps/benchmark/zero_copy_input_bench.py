@@ -0,0 +1,118 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Benchmark the latency of binding large NumPy inputs to the CPU executors,
+copying them with set_input against aliasing them with set_input_zero_copy.
+see README.md for the usage of this script.
+"""
+import argparse
+import time
+
+import numpy as np
+
+import tvm
+from tvm import relay
+from tvm.contrib import graph_executor
+from tvm.runtime.vm import VirtualMachine
+
+
+def build_model(shape, executor):
+    """A light model over a video frame, so that binding the input dominates."""
+    x = relay.var("x", shape=shape, dtype="float32")
+    y = relay.sum(x, axis=[2, 3])
+    mod = tvm.IRModule.from_expr(relay.Function([x], y))
+    target = tvm.target.Target("llvm")
+    with tvm.transform.PassContext(opt_level=3):
+        if executor == "graph":
+            lib = relay.build(mod, target=target)
+            return graph_executor.GraphModule(lib["default"](tvm.cpu(0)))
+        exe = relay.vm.compile(mod, target=target)
+        return VirtualMachine(exe, tvm.cpu(0))
+
+
+def measure(func, frames, repeat):
+    """Return the latencies of func over the frames, in milliseconds."""
+    costs = []
+    for i in range(repeat):
+        frame = frames[i % len(frames)]
+        tic = time.perf_counter()
+        func(frame)
+        costs.append((time.perf_counter() - tic) * 1000)
+    return np.array(costs)
+
+
+def benchmark(executor, shape, repeat):
+    module = build_model(shape, executor)
+    frames = [tvm.nd.aligned_numpy_empty(shape, "float32") for _ in range(4)]
+    for frame in frames:
+        frame[:] = np.random.uniform(size=shape)
+
+    if executor == "graph":
+
+        def run_copy(frame):
+            module.set_input("x", frame)
+            module.run()
+
+        def run_zero_copy(frame):
+            module.set_input_zero_copy("x", frame)
+            module.run()
+
+    else:
+
+        def run_copy(frame):
+            module.set_input("main", frame)
+            module.invoke("main")
+
+        def run_zero_copy(frame):
+            module.set_input_zero_copy("main", frame)
+            module.invoke("main")
+
+    for name, func in [("copy", run_copy), ("zero-copy", run_zero_copy)]:
+        measure(func, frames, 10)
+        costs = measure(func, frames, repeat)
+        print(
+            "%-8s %-10s %10.3f %10.3f %10.3f"
+            % (
+                executor,
+                name,
+                np.median(costs),
+                np.percentile(costs, 99),
+                np.max(costs),
+            )
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--shape",
+        type=int,
+        nargs="+",
+        default=[1, 3, 1080, 1920],
+        help="The shape of the input frame",
+    )
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument(
+        "--executor", type=str, choices=["graph", "vm", "all"], default="all", help="The executor"
+    )
+    args = parser.parse_args()
+
+    executors = ["graph", "vm"] if args.executor == "all" else [args.executor]
+    print("--------------------------------------------------------")
+    print("%-8s %-10s %10s %10s %10s" % ("Executor", "Binding", "p50 (ms)", "p99 (ms)", "max (ms)"))
+    print("--------------------------------------------------------")
+    for executor in executors:
+        benchmark(executor, tuple(args.shape), args.repeat)
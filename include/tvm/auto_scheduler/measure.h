@@ -415,6 +415,8 @@ class RPCRunnerNode : public ProgramRunnerNode {
   int priority;
   /*! \brief The number of tasks run in parallel. */
   int n_parallel;
+  /*! \brief Whether each parallel worker keeps its remote session and inputs across runs. */
+  bool reuse_session;
 
   Array<MeasureResult> Run(const Array<MeasureInput>& inputs,
                            const Array<BuildResult>& build_results, int verbose) final;
@@ -443,10 +445,12 @@ class RPCRunner : public ProgramRunner {
    * \param min_repeat_ms The minimum duration of one repeat in milliseconds.
    * \param cooldown_interval The cool down interval between two measurements.
    * \param enable_cpu_cache_flush Whether to flush cache on CPU between repeated measurements.
+   * \param reuse_session Whether each parallel worker keeps its remote session and inputs
+   * across runs.
    */
   RPCRunner(const String& key, const String& host, int port, int priority, int n_parallel,
             int timeout, int number, int repeat, int min_repeat_ms, double cooldown_interval,
-            bool enable_cpu_cache_flush);
+            bool enable_cpu_cache_flush, bool reuse_session = false);
 
   TVM_DEFINE_MUTABLE_OBJECT_REF_METHODS(RPCRunner, ProgramRunner, RPCRunnerNode);
 };
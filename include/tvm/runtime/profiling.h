@@ -30,6 +30,8 @@
 #include <tvm/runtime/packed_func.h>
 #include <tvm/runtime/registry.h>
 
+#include <chrono>
+#include <mutex>
 #include <stack>
 #include <string>
 #include <unordered_map>
@@ -407,6 +409,82 @@ class Profiler {
   std::vector<MetricCollector> collectors_;
 };
 
+/*! \brief Profiler recording the calls of every Nth run of an executor.
+ *
+ * Unlike `Profiler`, it is meant to stay enabled while serving: a run that is not
+ * sampled only increments a counter, and the durations of the calls of the sampled
+ * runs are kept in a ring buffer holding the last `capacity` sampled runs. Nothing
+ * else is recorded, copied or written out.
+ *
+ * Example usage:
+ * \code{.cpp}
+ * SamplingProfiler sampler(100, 64);
+ * // in every run
+ * if (sampler.StartRun()) {
+ *   sampler.StartCall("my_kernel", dev);
+ *   my_kernel();
+ *   sampler.StopCall();
+ *   sampler.StopRun();
+ * } else {
+ *   my_kernel();
+ * }
+ * // at any time, from any thread
+ * std::cout << sampler.Report()->AsTable() << std::endl;
+ * \endcode
+ */
+class SamplingProfiler {
+ public:
+  /*! Constructor.
+   * \param interval Record one run out of `interval`.
+   * \param capacity The number of sampled runs kept.
+   */
+  SamplingProfiler(int interval, size_t capacity);
+  /*! \brief Start a run.
+   * \returns Whether the run is sampled, in which case its calls are to be recorded
+   *  with `StartCall` and `StopCall`, and the run ended with `StopRun`.
+   */
+  bool StartRun();
+  /*! \brief Start a call of the sampled run.
+   * \param name The name of the function being called.
+   * \param dev The device on which the function is running.
+   */
+  void StartCall(const String& name, Device dev);
+  /*! \brief Stop the last `StartCall`. */
+  void StopCall();
+  /*! \brief Stop the sampled run and record it in the buffer, replacing the oldest one. */
+  void StopRun();
+  /*! \brief Summarize the sampled runs in the buffer. Can be called while runs are recorded.
+   *  \returns A `Report` with the total duration and count of the calls to each function
+   *  on each device, and the total duration and count of the sampled runs.
+   */
+  profiling::Report Report();
+
+ private:
+  struct SampledCall {
+    size_t name;
+    Device dev;
+    Timer timer;
+    int64_t nanos;
+  };
+  struct SampledRun {
+    std::vector<SampledCall> calls;
+    int64_t nanos;
+  };
+  int interval_;
+  uint64_t num_runs_{0};
+  /*! \brief The run being sampled. */
+  SampledRun current_;
+  std::chrono::high_resolution_clock::time_point run_start_;
+  /*! \brief The ring buffer of sampled runs, `next_` is the slot written next. */
+  std::vector<SampledRun> runs_;
+  size_t next_{0};
+  size_t num_sampled_{0};
+  /*! \brief The function names, indexed by `SampledCall::name`. */
+  std::vector<String> names_;
+  std::unordered_map<std::string, size_t> name_index_;
+  std::mutex mutex_;
+};
+
 /* \brief A duration in time. */
 class DurationNode : public Object {
  public:
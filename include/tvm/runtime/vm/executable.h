@@ -97,6 +97,29 @@ class Executable : public ModuleNode {
    */
   static runtime::Module Load(const std::string& code, const runtime::Module lib);
 
+  /*!
+   * \brief Save the executable to a file whose constants can be memory-mapped.
+   *
+   * The file holds the serialized executable without the constant data, followed
+   * by the constants at page aligned offsets.
+   *
+   * \param path The file path.
+   */
+  void SaveToMappableFile(const std::string& path);
+
+  /*!
+   * \brief Load an executable saved by SaveToMappableFile.
+   *
+   * The file is mapped into memory and the constants view the mapping, so their
+   * data is only read from the file when it is first used.
+   *
+   * \param path The file path.
+   * \param lib The compiled runtime library.
+   *
+   * \return exe The constructed executable.
+   */
+  static runtime::Module LoadFromMappableFile(const std::string& path, const runtime::Module lib);
+
   /*!
    * \brief Get the serialized form of the `functions`. This is
    * essentially bytecode serialization.
@@ -192,6 +215,15 @@ class Executable : public ModuleNode {
   std::vector<Index> const_device_type;
 
  private:
+  /*!
+   * \brief Save all the sections.
+   *
+   * \param strm The input stream.
+   * \param with_constant_data Whether the data of the constants is saved in the
+   *  constant section, otherwise it only records their number and devices.
+   */
+  void SaveSections(dmlc::Stream* strm, bool with_constant_data);
+
   /*!
    * \brief Save the globals.
    *
@@ -203,8 +235,9 @@ class Executable : public ModuleNode {
    * \brief Save the constant pool.
    *
    * \param strm The input stream.
+   * \param with_data Whether the data of the constants is saved.
    */
-  void SaveConstantSection(dmlc::Stream* strm);
+  void SaveConstantSection(dmlc::Stream* strm, bool with_data);
 
   /*!
    * \brief Save primitive op names.
@@ -220,6 +253,15 @@ class Executable : public ModuleNode {
    */
   void SaveCodeSection(dmlc::Stream* strm);
 
+  /*!
+   * \brief Load all the sections.
+   *
+   * \param strm The input stream.
+   * \param with_constant_data Whether the constant section holds the data of the
+   *  constants, otherwise `constants` must be filled before.
+   */
+  void LoadSections(dmlc::Stream* strm, bool with_constant_data);
+
   /*!
    * \brief Load the globals.
    *
@@ -231,8 +273,9 @@ class Executable : public ModuleNode {
    * \brief Load the constant pool.
    *
    * \param strm The input stream.
+   * \param with_data Whether the section holds the data of the constants.
    */
-  void LoadConstantSection(dmlc::Stream* strm);
+  void LoadConstantSection(dmlc::Stream* strm, bool with_data);
 
   /*!
    * \brief Load primitive op names.
@@ -28,6 +28,7 @@
 #include <tvm/runtime/module.h>
 #include <tvm/runtime/object.h>
 #include <tvm/runtime/packed_func.h>
+#include <tvm/runtime/profiling.h>
 #include <tvm/runtime/registry.h>
 #include <tvm/runtime/vm/bytecode.h>
 #include <tvm/runtime/vm/executable.h>
@@ -294,6 +295,12 @@ class VirtualMachine : public runtime::ModuleNode {
    * object to avoid rellocation of constants during inference.
    */
   std::vector<ObjectRef> const_pool_;
+  /*! \brief The sampling profiler recording some of the invocations, when enabled. */
+  std::shared_ptr<profiling::SamplingProfiler> sampler_;
+  /*! \brief The names of the packed functions, for the sampling profiler. */
+  std::vector<String> packed_names_;
+  /*! \brief The sampling profiler when the current invocation is sampled, otherwise null. */
+  profiling::SamplingProfiler* sampling_{nullptr};
 };
 
 }  // namespace vm
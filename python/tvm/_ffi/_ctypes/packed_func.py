@@ -145,16 +145,16 @@ def _make_tvm_args(args, temp_args):
             values[i].v_int64 = _device_to_int64(arg)
             type_codes[i] = ArgTypeCode.DLDEVICE
         elif isinstance(arg, (bytearray, bytes)):
-            # from_buffer only taeks in bytearray.
-            if isinstance(arg, bytes):
-                byte_arr = bytearray(arg)
-                temp_args.append(byte_arr)
-                arg = byte_arr
-
             arr = TVMByteArray()
-            arr.data = ctypes.cast(
-                (ctypes.c_byte * len(arg)).from_buffer(arg), ctypes.POINTER(ctypes.c_byte)
-            )
+            if isinstance(arg, bytes):
+                # from_buffer only takes in bytearray, point at the immutable buffer instead of
+                # copying it.
+                arr.data = ctypes.cast(ctypes.c_char_p(arg), ctypes.POINTER(ctypes.c_byte))
+                temp_args.append(arg)
+            else:
+                arr.data = ctypes.cast(
+                    (ctypes.c_byte * len(arg)).from_buffer(arg), ctypes.POINTER(ctypes.c_byte)
+                )
             arr.size = len(arg)
             values[i].v_handle = ctypes.c_void_p(ctypes.addressof(arr))
             temp_args.append(arr)
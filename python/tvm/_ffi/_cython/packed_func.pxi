@@ -144,16 +144,17 @@ cdef inline int make_arg(object arg,
             <unsigned long long>ctypes.addressof(arg)))[0]
         tcode[0] = kDLDevice
     elif isinstance(arg, (bytes, bytearray)):
-        # from_buffer only taeks in bytearray.
-        if isinstance(arg, bytes):
-            byte_arr = bytearray(arg)
-            temp_args.append(byte_arr)
-            arg = byte_arr
-
         arr = TVMByteArray()
-        arr.data = ctypes.cast(
-            (ctypes.c_byte * len(arg)).from_buffer(arg),
-            ctypes.POINTER(ctypes.c_byte))
+        if isinstance(arg, bytes):
+            # from_buffer only takes in bytearray, point at the
+            # immutable buffer instead of copying it.
+            arr.data = ctypes.cast(
+                ctypes.c_char_p(arg), ctypes.POINTER(ctypes.c_byte))
+            temp_args.append(arg)
+        else:
+            arr.data = ctypes.cast(
+                (ctypes.c_byte * len(arg)).from_buffer(arg),
+                ctypes.POINTER(ctypes.c_byte))
         arr.size = len(arg)
         value[0].v_handle = <void*>(
             <unsigned long long>ctypes.addressof(arr))
@@ -239,12 +240,17 @@ cdef inline int FuncCall3(void* chandle,
                           int* ret_tcode) except -1:
     cdef TVMValue[3] values
     cdef int[3] tcodes
+    cdef int ret
     nargs = len(args)
     temp_args = []
     for i in range(nargs):
         make_arg(args[i], &values[i], &tcodes[i], temp_args)
-    CALL(TVMFuncCall(chandle, &values[0], &tcodes[0],
-                     nargs, ret_val, ret_tcode))
+    # Python callbacks take the GIL back, so other Python threads can
+    # run while the function runs.
+    with nogil:
+        ret = TVMFuncCall(chandle, &values[0], &tcodes[0],
+                          nargs, ret_val, ret_tcode)
+    CALL(ret)
     return 0
 
 cdef inline int FuncCall(void* chandle,
@@ -252,6 +258,7 @@ cdef inline int FuncCall(void* chandle,
                          TVMValue* ret_val,
                          int* ret_tcode) except -1:
     cdef int nargs
+    cdef int ret
     nargs = len(args)
     if nargs <= 3:
         FuncCall3(chandle, args, nargs, ret_val, ret_tcode)
@@ -264,8 +271,10 @@ cdef inline int FuncCall(void* chandle,
     temp_args = []
     for i in range(nargs):
         make_arg(args[i], &values[i], &tcodes[i], temp_args)
-    CALL(TVMFuncCall(chandle, &values[0], &tcodes[0],
-                     nargs, ret_val, ret_tcode))
+    with nogil:
+        ret = TVMFuncCall(chandle, &values[0], &tcodes[0],
+                          nargs, ret_val, ret_tcode)
+    CALL(ret)
     return 0
 
 
@@ -454,6 +454,13 @@ class RPCRunner(ProgramRunner):
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    reuse_session: bool = False
+        Whether each of the `n_parallel` workers keeps one remote session (and so one device)
+        and the input tensors of the current task across runs, instead of requesting a new
+        session and re-creating the inputs for every program. A session is kept for at most
+        `20 * timeout` seconds. `n_parallel` should not exceed the number of devices
+        registered under `key`. Call :py:func:`release_rpc_runner_sessions` to return the
+        devices to the tracker before that.
     """
 
     def __init__(
@@ -469,6 +476,7 @@ class RPCRunner(ProgramRunner):
         min_repeat_ms=100,
         cooldown_interval=0.0,
         enable_cpu_cache_flush=False,
+        reuse_session=False,
     ):
         self.__init_handle_by_constructor__(
             _ffi_api.RPCRunner,
@@ -483,6 +491,7 @@ class RPCRunner(ProgramRunner):
             min_repeat_ms,
             cooldown_interval,
             enable_cpu_cache_flush,
+            reuse_session,
         )
 
         if check_remote(key, host, port, priority, timeout):
@@ -533,6 +542,9 @@ class LocalRPCMeasureContext:
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    reuse_session: bool = False
+        Whether the runner workers keep their remote session and inputs across runs.
+        See :py:class:`RPCRunner`.
     """
 
     def __init__(
@@ -545,6 +557,7 @@ class LocalRPCMeasureContext:
         min_repeat_ms=0,
         cooldown_interval=0.0,
         enable_cpu_cache_flush=False,
+        reuse_session=False,
     ):
         # pylint: disable=import-outside-toplevel
         from tvm.rpc.tracker import Tracker
@@ -556,6 +569,7 @@ class LocalRPCMeasureContext:
             set_cuda_target_arch(cuda_arch)
         self.tracker = Tracker(port=9000, port_end=10000, silent=True)
         device_key = "$local$device$%d" % self.tracker.port
+        self.device_key = device_key
         self.server = Server(
             port=self.tracker.port,
             port_end=10000,
@@ -575,12 +589,14 @@ class LocalRPCMeasureContext:
             min_repeat_ms,
             cooldown_interval,
             enable_cpu_cache_flush,
+            reuse_session,
         )
         # Wait for the processes to start
         time.sleep(0.5)
 
     def __del__(self):
         # Close the tracker and server before exit
+        release_rpc_runner_sessions(self.device_key, "127.0.0.1", self.tracker.port)
         self.tracker.terminate()
         self.server.terminate()
         time.sleep(0.5)
@@ -1071,6 +1087,7 @@ def _rpc_run(
     cooldown_interval,
     enable_cpu_cache_flush,
     verbose,
+    reuse_session=False,
 ):
     inp = MeasureInput.deserialize(inp_serialized)
     tic = time.time()
@@ -1078,7 +1095,10 @@ def _rpc_run(
     error_msg = None
     try:
         # upload built module
-        remote = request_remote(key, host, port, priority, timeout)
+        if reuse_session:
+            remote = _RPCSessionCache.get_remote(key, host, port, priority, timeout)
+        else:
+            remote = request_remote(key, host, port, priority, timeout)
         remote.upload(build_res.filename)
         func = remote.load_module(os.path.split(build_res.filename)[1])
         dev = remote.device(str(inp.task.target), 0)
@@ -1101,6 +1121,8 @@ def _rpc_run(
         costs = (MAX_FLOAT,)
         error_no = MeasureErrorNo.COMPILE_DEVICE
         error_msg = make_traceback_info()
+        if reuse_session:
+            _RPCSessionCache.reset()
 
     if error_no == 0:
         try:
@@ -1112,17 +1134,22 @@ def _rpc_run(
             ), "Please make sure USE_RANDOM is ON in the config.cmake on the remote devices"
 
             assert len(args) == len(build_res.args)
-            # pylint: disable=consider-using-enumerate
-            for idx in range(len(args)):
-                if args[idx] is None:
-                    build_res_arg = build_res.args[idx]
-                    empty_array = ndarray.empty(
-                        get_const_tuple(build_res_arg.shape), build_res_arg.dtype, dev
-                    )
-                    random_fill(empty_array)
-                    args[idx] = empty_array
-                else:
-                    args[idx] = ndarray.array(args[idx], dev)
+            if reuse_session:
+                args = _RPCSessionCache.get_args(
+                    remote, dev, inp.task.workload_key, build_res, args, random_fill
+                )
+            else:
+                # pylint: disable=consider-using-enumerate
+                for idx in range(len(args)):
+                    if args[idx] is None:
+                        build_res_arg = build_res.args[idx]
+                        empty_array = ndarray.empty(
+                            get_const_tuple(build_res_arg.shape), build_res_arg.dtype, dev
+                        )
+                        random_fill(empty_array)
+                        args[idx] = empty_array
+                    else:
+                        args[idx] = ndarray.array(args[idx], dev)
             dev.sync()
 
             # First run for check that the kernel is correct
@@ -1134,7 +1161,9 @@ def _rpc_run(
             # clean up remote files
             remote.remove(build_res.filename)
             remote.remove(os.path.splitext(build_res.filename)[0] + ".so")
-            remote.remove("")
+            if not reuse_session:
+                # a reused session keeps its work directory
+                remote.remove("")
             dev.free_raw_stream(stream)
         # pylint: disable=broad-except
         except Exception:
@@ -1142,6 +1171,8 @@ def _rpc_run(
             costs = (MAX_FLOAT,)
             error_no = MeasureErrorNo.RUNTIME_DEVICE
             error_msg = make_traceback_info()
+            if reuse_session:
+                _RPCSessionCache.reset()
 
     shutil.rmtree(os.path.dirname(build_res.filename))
     toc = time.time()
@@ -1156,6 +1187,86 @@ def _rpc_run(
     return costs, error_no, error_msg, toc - tic + build_res.time_cost, toc
 
 
+class _RPCSessionCache:
+    """Remote session and resident input tensors of a RPCRunner worker with `reuse_session`.
+
+    This state lives in the worker process, so each worker holds its own device.
+    """
+
+    remote = None
+    remote_key = None
+    expire_time = 0
+    workload_key = None
+    args = {}
+
+    @classmethod
+    def get_remote(cls, key, host, port, priority, timeout):
+        """Get the session of this worker, request a new one if it cannot fit one more run."""
+        remote_key = (key, host, port, priority, timeout)
+        if (
+            cls.remote is None
+            or cls.remote_key != remote_key
+            or time.time() + timeout >= cls.expire_time
+        ):
+            cls.reset()
+            session_lifetime = 20 * timeout
+            cls.remote = request_remote(key, host, port, priority, session_lifetime)
+            cls.remote_key = remote_key
+            cls.expire_time = time.time() + session_lifetime
+        return cls.remote
+
+    @classmethod
+    def reset(cls):
+        """Drop the session and the tensors on it."""
+        cls.remote = None
+        cls.remote_key = None
+        cls.workload_key = None
+        cls.args = {}
+
+    @classmethod
+    def get_args(cls, remote, dev, workload_key, build_res, args, random_fill):
+        """Get the device arguments of a program, created once per task."""
+        assert cls.remote is remote
+        if cls.workload_key != workload_key:
+            cls.args = {}
+            cls.workload_key = workload_key
+        ret = []
+        for idx, (build_res_arg, arg) in enumerate(zip(build_res.args, args)):
+            shape = get_const_tuple(build_res_arg.shape)
+            arg_key = (idx, shape, build_res_arg.dtype)
+            if arg_key not in cls.args:
+                if arg is None:
+                    arr = ndarray.empty(shape, build_res_arg.dtype, dev)
+                    random_fill(arr)
+                else:
+                    arr = ndarray.array(arg, dev)
+                cls.args[arg_key] = arr
+            ret.append(cls.args[arg_key])
+        return ret
+
+
+# Persistent RPCRunner worker pools, keyed by the session arguments
+_RPC_RUNNER_POOLS = {}
+
+
+def release_rpc_runner_sessions(key=None, host=None, port=None):
+    """Stop the persistent workers of RPCRunners with `reuse_session`,
+    returning their devices to the tracker.
+
+    Parameters
+    ----------
+    key : Optional[str]
+        Only stop the workers of the runners requesting devices with this key.
+    host : Optional[str]
+        Only stop the workers of the runners using the tracker on this host.
+    port : Optional[int]
+        Only stop the workers of the runners using the tracker on this port.
+    """
+    for pool_key in list(_RPC_RUNNER_POOLS):
+        if all(v is None or v == pool_v for v, pool_v in zip((key, host, port), pool_key)):
+            del _RPC_RUNNER_POOLS[pool_key]
+
+
 def _rpc_run_worker(args):
     """Function to be ran in the RPCRunner thread pool.
 
@@ -1169,7 +1280,7 @@ def _rpc_run_worker(args):
     res : MeasureResult
         The measure result of this Runner thread.
     """
-    _, build_res, _, _, _, _, _, timeout, _, _, _, _, _, verbose = args
+    _, build_res, _, _, _, _, _, timeout, _, _, _, _, _, verbose, _ = args
     if build_res.error_no != MeasureErrorNo.NO_ERROR:
         return (
             (MAX_FLOAT,),
@@ -1212,6 +1323,7 @@ def rpc_runner_run(
     cooldown_interval=0.0,
     enable_cpu_cache_flush=False,
     verbose=1,
+    reuse_session=False,
 ):
     """Run function of RPCRunner to test the performance of the input BuildResults.
 
@@ -1260,6 +1372,10 @@ def rpc_runner_run(
         This is only has effect on CPU task.
     verbose: int = 1
         Verbosity level. 0 for silent, 1 to output information during program measuring.
+    reuse_session: bool = False
+        Whether each worker keeps its remote session and the task inputs across runs.
+        The workers are kept alive between calls and candidates are streamed to
+        whichever worker is free.
 
     Returns
     -------
@@ -1267,15 +1383,35 @@ def rpc_runner_run(
         The measure results of these MeasureInputs.
     """
     assert len(inputs) == len(build_results), "Measure input size should be equal to build results"
-    # This pool is not doing computationally intensive work, so we can use threads
-    executor = PopenPoolExecutor(n_parallel)
+    if reuse_session:
+        pool_key = (key, host, port, priority, n_parallel, timeout)
+        if pool_key not in _RPC_RUNNER_POOLS:
+            # a hang can not be cut by the session timeout anymore, time out the worker instead
+            _RPC_RUNNER_POOLS[pool_key] = PopenPoolExecutor(
+                n_parallel, timeout=timeout * (n_parallel + 1)
+            )
+        executor = _RPC_RUNNER_POOLS[pool_key]
+    else:
+        # This pool is not doing computationally intensive work, so we can use threads
+        executor = PopenPoolExecutor(n_parallel)
+    # the task inputs are converted once per task rather than once per program
+    runner_args = {}
+
+    def _runner_args(inp, build_res):
+        workload_key = inp.task.workload_key
+        if not reuse_session or not inp.task.task_input_names:
+            return prepare_runner_args(inp, build_res)
+        if workload_key not in runner_args:
+            runner_args[workload_key] = prepare_runner_args(inp, build_res)
+        return list(runner_args[workload_key])
+
     tuple_res = executor.map_with_error_catching(
         _rpc_run_worker,
         [
             (
                 inp.serialize(),
                 build_res,
-                prepare_runner_args(inp, build_res),
+                _runner_args(inp, build_res),
                 key,
                 host,
                 port,
@@ -1287,6 +1423,7 @@ def rpc_runner_run(
                 cooldown_interval,
                 enable_cpu_cache_flush,
                 verbose,
+                reuse_session,
             )
             for inp, build_res in zip(inputs, build_results)
         ],
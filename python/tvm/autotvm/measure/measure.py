@@ -36,7 +36,9 @@ class MeasureInput(namedtuple("MeasureInput", ["target", "task", "config"])):
     """
 
 
-class MeasureResult(namedtuple("MeasureResult", ["costs", "error_no", "all_cost", "timestamp"])):
+class MeasureResult(
+    namedtuple("MeasureResult", ["costs", "error_no", "all_cost", "timestamp", "variance"])
+):
     """
     Stores all the results of a measurement
 
@@ -51,8 +53,17 @@ class MeasureResult(namedtuple("MeasureResult", ["costs", "error_no", "all_cost"
         All cost of this measure, including rpc, compilation, test runs
     timestamp: float
         The absolute time stamp when we finish measurement.
+    variance: float, optional
+        The sample variance of `costs`, None if unknown.
+        Cost models can use it to down-weight noisy measurements.
+        It is not stored in the tuning log.
     """
 
+    def __new__(cls, costs, error_no, all_cost, timestamp, variance=None):
+        return super(MeasureResult, cls).__new__(
+            cls, costs, error_no, all_cost, timestamp, variance
+        )
+
     def __repr__(self):
         error_no_str = (
             str(self.error_no)
@@ -61,7 +72,8 @@ class MeasureResult(namedtuple("MeasureResult", ["costs", "error_no", "all_cost"
         )
         return (
             f"{self.__class__.__name__}(costs={self.costs!r}, error_no={error_no_str}, "
-            f"all_cost={self.all_cost}, timestamp={self.timestamp!r})"
+            f"all_cost={self.all_cost}, timestamp={self.timestamp!r}, "
+            f"variance={self.variance!r})"
         )
 
 
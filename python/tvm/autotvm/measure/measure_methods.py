@@ -24,6 +24,7 @@ remote devices, recording the running time costs, and checking the correctness o
 
 import contextlib
 import logging
+import math
 import os
 import shutil
 import tempfile
@@ -222,6 +223,27 @@ class RPCRunner(Runner):
     module_loader : ModuleLoader
         If given, a context manager that loads the module to be timed into the remote runtime.
         If not given, default_module_loader is used.
+    max_repeat: int, optional
+        Enable adaptive measurement. After the first `repeat` repeats, keep running one
+        more repeat at a time until the 95% confidence interval of the mean is within
+        `ci_threshold` of the mean, `time_budget_ms` is used up or `max_repeat` repeats
+        are collected.
+    ci_threshold: float, optional
+        The relative half width of the confidence interval at which adaptive
+        measurement stops.
+    time_budget_ms: float, optional
+        The time budget in milliseconds of the adaptive measurement of one candidate.
+    early_stop_ratio: float, optional
+        In adaptive mode, stop measuring a candidate after its first repeat if it is
+        slower than `early_stop_ratio` times the best cost measured so far for the task.
+    cache_inputs: bool, optional
+        Keep the randomly filled input buffers on the device and reuse them for every
+        config of the task instead of allocating and filling them per measurement.
+        The default module loader then reuses one remote session per measurement worker
+        for up to `20 * timeout` seconds, so the buffers outlive a single measurement.
+    rerandomize_every: int, optional
+        With `cache_inputs`, fill the cached buffers with new random values every
+        `rerandomize_every` configs. By default they are filled once per task.
     """
 
     def __init__(
@@ -238,6 +260,12 @@ class RPCRunner(Runner):
         cooldown_interval=0.1,
         enable_cpu_cache_flush=False,
         module_loader=None,
+        max_repeat=None,
+        ci_threshold=0.05,
+        time_budget_ms=None,
+        early_stop_ratio=None,
+        cache_inputs=False,
+        rerandomize_every=None,
     ):
         super(RPCRunner, self).__init__(timeout, n_parallel)
 
@@ -256,6 +284,16 @@ class RPCRunner(Runner):
         self.cooldown_interval = cooldown_interval
         self.module_loader = module_loader
 
+        self.max_repeat = max_repeat
+        self.ci_threshold = ci_threshold
+        self.time_budget_ms = time_budget_ms
+        self.early_stop_ratio = early_stop_ratio
+        self.best_cost = None
+
+        self.cache_inputs = cache_inputs
+        self.rerandomize_every = rerandomize_every
+        self._num_measured = 0
+
         self.executor = PopenPoolExecutor(
             timeout=timeout * (self.n_parallel + 1),
             initializer=reset_global_scope,
@@ -284,6 +322,8 @@ class RPCRunner(Runner):
 
     def set_task(self, task):
         self.task = task
+        self.best_cost = None
+        self._num_measured = 0
 
         if check_remote(task.target, self.key, self.host, self.port):
             logger.info("Get devices for measurement successfully!")
@@ -331,14 +371,33 @@ class RPCRunner(Runner):
 
         for i in range(0, len(measure_inputs), self.n_parallel):
             futures = []
+            adaptive_kwargs = None
+            if self.max_repeat:
+                adaptive_kwargs = dict(
+                    max_repeat=self.max_repeat,
+                    ci_threshold=self.ci_threshold,
+                    time_budget_ms=self.time_budget_ms,
+                    early_stop_ratio=self.early_stop_ratio,
+                    best_cost=self.best_cost,
+                )
             for measure_inp, build_res in zip(
                 measure_inputs[i : i + self.n_parallel], build_results[i : i + self.n_parallel]
             ):
-                module_loader = (
-                    self.module_loader
-                    if self.module_loader is not None
-                    else default_module_loader()
-                )
+                input_cache_key = None
+                if self.cache_inputs:
+                    epoch = (
+                        self._num_measured // self.rerandomize_every
+                        if self.rerandomize_every
+                        else 0
+                    )
+                    input_cache_key = (measure_inp.task.name, repr(measure_inp.task.args), epoch)
+                self._num_measured += 1
+                if self.module_loader is not None:
+                    module_loader = self.module_loader
+                elif self.cache_inputs:
+                    module_loader = DefaultModuleLoader(session_lifetime=20 * self.timeout)
+                else:
+                    module_loader = default_module_loader()
                 ret = self.executor.submit(
                     run_through_rpc,
                     measure_inp,
@@ -351,6 +410,8 @@ class RPCRunner(Runner):
                     self.ref_input,
                     self.enable_cpu_cache_flush,
                     module_loader,
+                    adaptive_kwargs,
+                    input_cache_key,
                 )
                 futures.append(ret)
 
@@ -358,6 +419,10 @@ class RPCRunner(Runner):
                 try:
                     res = future.result()
                     results.append(res)
+                    if isinstance(res, MeasureResult) and res.error_no == MeasureErrorNo.NO_ERROR:
+                        cost = sum(res.costs) / len(res.costs)
+                        if self.best_cost is None or cost < self.best_cost:
+                            self.best_cost = cost
                 except Exception as ex:  # pylint: disable=broad-except
                     results.append(
                         MeasureResult(
@@ -399,6 +464,18 @@ class LocalRunner(RPCRunner):
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    max_repeat: int, optional
+        Enable adaptive measurement, see :py:class:`RPCRunner`.
+    ci_threshold: float, optional
+        See :py:class:`RPCRunner`.
+    time_budget_ms: float, optional
+        See :py:class:`RPCRunner`.
+    early_stop_ratio: float, optional
+        See :py:class:`RPCRunner`.
+    cache_inputs: bool, optional
+        See :py:class:`RPCRunner`.
+    rerandomize_every: int, optional
+        See :py:class:`RPCRunner`.
     Note
     ----
     This is a "fake" local mode. We start a silent rpc tracker and rpc server
@@ -414,6 +491,12 @@ class LocalRunner(RPCRunner):
         cooldown_interval=0.1,
         enable_cpu_cache_flush=False,
         module_loader=None,
+        max_repeat=None,
+        ci_threshold=0.05,
+        time_budget_ms=None,
+        early_stop_ratio=None,
+        cache_inputs=False,
+        rerandomize_every=None,
     ):
         super(LocalRunner, self).__init__(
             "",
@@ -428,6 +511,12 @@ class LocalRunner(RPCRunner):
             cooldown_interval=cooldown_interval,
             enable_cpu_cache_flush=enable_cpu_cache_flush,
             module_loader=module_loader,
+            max_repeat=max_repeat,
+            ci_threshold=ci_threshold,
+            time_budget_ms=time_budget_ms,
+            early_stop_ratio=early_stop_ratio,
+            cache_inputs=cache_inputs,
+            rerandomize_every=rerandomize_every,
         )
         self.tracker = None
         self.server = None
@@ -561,6 +650,8 @@ def run_through_rpc(
     ref_input,
     enable_cpu_cache_flush=False,
     module_loader=None,
+    adaptive_kwargs=None,
+    input_cache_key=None,
 ):
     """Run a generated library through rpc
 
@@ -600,6 +691,13 @@ def run_through_rpc(
         This is only has effect on CPU task.
     module_loader: ModuleLoader
         A function that returns a ContextManager used to establish and teardown the remote session.
+    adaptive_kwargs: dict, optional
+        If given, measure adaptively with :py:func:`adaptive_measure`, the dict holds its
+        `max_repeat`, `ci_threshold`, `time_budget_ms`, `early_stop_ratio` and `best_cost`.
+    input_cache_key: tuple, optional
+        If given, reuse the random input buffers cached in this worker for the same
+        remote session. A different key drops the buffers of another task or
+        re-randomizes the buffers of the same task.
     """
     if isinstance(build_result, MeasureResult):
         return build_result
@@ -621,7 +719,7 @@ def run_through_rpc(
                 mod.entry_name,
                 dev,
                 number=number,
-                repeat=repeat,
+                repeat=1 if adaptive_kwargs else repeat,
                 min_repeat_ms=min_repeat_ms,
                 f_preproc=f_prepare,
             )
@@ -636,19 +734,45 @@ def run_through_rpc(
                         "Please make sure USE_RANDOM is ON in the config.cmake "
                         "on the remote devices"
                     )
-                args = [nd.empty(x[0], x[1], dev) for x in build_result.arg_info]
-                if "scatter" not in measure_input.task.name:
-                    # the index tensor of scatter op cannot be randomly initialized
-                    for arg in args:
-                        random_fill(arg)
+                # the index tensor of scatter op cannot be randomly initialized
+                fill = "scatter" not in measure_input.task.name
+                if input_cache_key is not None:
+                    args = _RemoteInputCache.get_args(
+                        remote, dev, build_result.arg_info, input_cache_key, random_fill, fill
+                    )
+                else:
+                    args = [nd.empty(x[0], x[1], dev) for x in build_result.arg_info]
+                    if fill:
+                        for arg in args:
+                            random_fill(arg)
                 dev.sync()
 
-            costs = time_f(*args).results
+            if adaptive_kwargs:
+
+                def _make_run(new_number):
+                    # the first evaluator already grew `number` to meet min_repeat_ms,
+                    # the later repeats reuse it instead of searching again every time
+                    new_time_f = mod.time_evaluator(
+                        mod.entry_name, dev, number=new_number, repeat=1, f_preproc=f_prepare
+                    )
+                    return lambda: new_time_f(*args).results
+
+                costs = adaptive_measure(
+                    lambda: time_f(*args).results,
+                    repeat,
+                    number=number,
+                    min_repeat_ms=min_repeat_ms,
+                    make_run=_make_run,
+                    **adaptive_kwargs,
+                )
+            else:
+                costs = time_f(*args).results
 
         if len(costs) > 2:  # remove largest and smallest value to reduce variance
             costs = list(costs)
             costs.sort()
             costs = tuple(costs[1:-1])
+        variance = _sample_variance(costs)
     except TVMError as exc:
         msg = str(exc)
         if "Stack trace returned" in msg:
@@ -657,20 +781,200 @@ def run_through_rpc(
             msg = msg[: msg.index("CUDA Source")]
         costs = (RuntimeError(msg[:1024]),)
         errno = MeasureErrorNo.RUNTIME_DEVICE
+        variance = None
     tstamp = time.time()
     time.sleep(cooldown_interval)
-    return MeasureResult(costs, errno, tstamp - tic + build_result.time_cost, tstamp)
+    return MeasureResult(costs, errno, tstamp - tic + build_result.time_cost, tstamp, variance)
+
+
+# two-sided 95% quantiles of the student t distribution, indexed by degree of freedom
+_T_95 = (
+    12.706,
+    4.303,
+    3.182,
+    2.776,
+    2.571,
+    2.447,
+    2.365,
+    2.306,
+    2.262,
+    2.228,
+    2.201,
+    2.179,
+    2.160,
+    2.145,
+    2.131,
+    2.120,
+    2.110,
+    2.101,
+    2.093,
+    2.086,
+)
+
+
+def _sample_variance(costs):
+    if len(costs) < 2:
+        return None
+    mean = sum(costs) / len(costs)
+    return sum((x - mean) ** 2 for x in costs) / (len(costs) - 1)
+
+
+def _confidence_half_width(costs):
+    """Half width of the 95% confidence interval of the mean of costs."""
+    variance = _sample_variance(costs)
+    if variance is None:
+        return float("inf")
+    dof = len(costs) - 1
+    quantile = _T_95[dof - 1] if dof <= len(_T_95) else 1.96
+    return quantile * (variance / len(costs)) ** 0.5
+
+
+def adaptive_measure(
+    run,
+    repeat,
+    max_repeat,
+    ci_threshold=0.05,
+    time_budget_ms=None,
+    early_stop_ratio=None,
+    best_cost=None,
+    number=1,
+    min_repeat_ms=0,
+    make_run=None,
+):
+    """Measure with a variable number of repeats.
+
+    Parameters
+    ----------
+    run: Callable[[], List[float]]
+        Run one repeat of the measurement and return its cost.
+    repeat: int
+        The minimum number of repeats.
+    max_repeat: int
+        The maximum number of repeats.
+    ci_threshold: float
+        Stop once the 95% confidence interval of the mean is within
+        `ci_threshold` times the mean.
+    time_budget_ms: float, optional
+        Stop once the measurement took longer than this.
+    early_stop_ratio: float, optional
+        Stop after the first repeat if its cost is larger than `early_stop_ratio`
+        times `best_cost`.
+    best_cost: float, optional
+        The best cost measured so far.
+    number: int
+        The `number` used by `run`, only needed with `make_run`.
+    min_repeat_ms: int
+        The `min_repeat_ms` used by `run`, only needed with `make_run`.
+    make_run: Callable[[int], Callable[[], List[float]]], optional
+        Create a `run` for a fixed `number` without `min_repeat_ms` search.
+        It replaces `run` after the first repeat when `min_repeat_ms` is set.
+
+    Returns
+    -------
+    costs: tuple of float
+        The cost of every repeat.
+    """
+    tic = time.time()
+    costs = list(run())
+    if early_stop_ratio and best_cost and costs[0] > early_stop_ratio * best_cost:
+        return tuple(costs)
+    if make_run is not None and min_repeat_ms > 0 and costs[0] > 0:
+        number = max(number, int(math.ceil(min_repeat_ms / 1000.0 / costs[0])))
+        run = make_run(number)
+    while len(costs) < max_repeat:
+        if len(costs) >= repeat:
+            mean = sum(costs) / len(costs)
+            if _confidence_half_width(costs) <= ci_threshold * mean:
+                break
+            if time_budget_ms is not None and (time.time() - tic) * 1000 > time_budget_ms:
+                break
+        costs.extend(run())
+    return tuple(costs)
+
+
+class _RemoteInputCache:
+    """Remote session and random input buffers kept alive in a measurement worker process.
+
+    The buffers are pooled by (shape, dtype), the k-th argument of a given shape and dtype
+    always maps to the k-th buffer of the pool so arguments never alias each other.
+    """
+
+    remote = None
+    remote_key = None
+    expire_time = 0
+    cache_key = None
+    buffers = {}
+
+    @classmethod
+    def get_remote(cls, remote_kwargs, session_lifetime):
+        """Get the cached remote session, or request a new one if it cannot fit one more run."""
+        remote_key = tuple(sorted(remote_kwargs.items()))
+        timeout = remote_kwargs.get("timeout", 60)
+        if (
+            cls.remote is None
+            or cls.remote_key != remote_key
+            or time.time() + timeout >= cls.expire_time
+        ):
+            cls.reset()
+            kwargs = dict(remote_kwargs)
+            kwargs["timeout"] = session_lifetime
+            cls.remote = request_remote(**kwargs)
+            cls.remote_key = remote_key
+            cls.expire_time = time.time() + session_lifetime
+        return cls.remote
+
+    @classmethod
+    def reset(cls):
+        """Drop the cached session and buffers."""
+        cls.remote = None
+        cls.remote_key = None
+        cls.cache_key = None
+        cls.buffers = {}
+
+    @classmethod
+    def get_args(cls, remote, dev, arg_info, cache_key, random_fill, fill=True):
+        """Get the input buffers of arg_info, allocated and filled only when needed."""
+        if cls.remote is not remote:
+            # not a reused session, e.g. from a custom module loader
+            cls.reset()
+            cls.remote = remote
+        refill = cls.cache_key != cache_key
+        if refill and (cls.cache_key is None or cls.cache_key[:-1] != cache_key[:-1]):
+            # another task, free the device memory of the old one
+            cls.buffers = {}
+        cls.cache_key = cache_key
+
+        args = []
+        counts = {}
+        for shape, dtype in arg_info:
+            key = (tuple(shape), dtype)
+            idx = counts.get(key, 0)
+            counts[key] = idx + 1
+            pool = cls.buffers.setdefault(key, [])
+            if idx == len(pool):
+                # [buffer, the cache key its content was filled for]
+                pool.append([nd.empty(shape, dtype, dev), None])
+            entry = pool[idx]
+            if fill and entry[1] != cache_key:
+                random_fill(entry[0])
+                entry[1] = cache_key
+            args.append(entry[0])
+        return args
 
 
 class DefaultModuleLoader:
     """See default_module_loader(). A pickleable emulation of the original function closure."""
 
-    def __init__(self, pre_load_function=None) -> None:
+    def __init__(self, pre_load_function=None, session_lifetime=None) -> None:
         self.pre_load_function = pre_load_function
+        self.session_lifetime = session_lifetime
 
     @contextlib.contextmanager
     def __call__(self, remote_kwargs, build_result):
-        remote = request_remote(**remote_kwargs)
+        if self.session_lifetime:
+            remote = _RemoteInputCache.get_remote(remote_kwargs, self.session_lifetime)
+        else:
+            remote = request_remote(**remote_kwargs)
         if self.pre_load_function is not None:
             self.pre_load_function(remote, build_result)
 
@@ -678,11 +982,19 @@ class DefaultModuleLoader:
         try:
             yield remote, remote.load_module(os.path.split(build_result.filename)[1])
 
+        except BaseException:
+            # the session may be broken, do not reuse it
+            if self.session_lifetime:
+                _RemoteInputCache.reset()
+            raise
+
         finally:
             # clean up remote files
             remote.remove(build_result.filename)
             remote.remove(os.path.splitext(build_result.filename)[0] + ".so")
-            remote.remove("")
+            if not self.session_lifetime:
+                # removes the now empty work directory, keep it for reused sessions
+                remote.remove("")
 
 
 def default_module_loader(pre_load_function=None):
@@ -113,7 +113,7 @@ def encode(inp, result, protocol="json"):
                 ).decode()
             ),
             str(base64.b64encode(pickle.dumps(inp.config)).decode()),
-            str(base64.b64encode(pickle.dumps(tuple(result))).decode()),
+            str(base64.b64encode(pickle.dumps(tuple(result)[:4])).decode()),
             str(AUTOTVM_LOG_VERSION),
             str(__version__),
         )
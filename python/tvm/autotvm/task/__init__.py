@@ -39,6 +39,7 @@ from .dispatcher import (
     ApplyHistoryBest,
     FallbackContext,
     clear_fallback_cache,
+    memoization_version,
     ApplyGraphBest,
 )
 
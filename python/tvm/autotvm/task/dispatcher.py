@@ -51,9 +51,14 @@ class DispatchContext(object):
     current = None
     # a set to prevent print duplicated message
     warning_messages = set()
+    # whether the config of a workload only changes through load() and update(),
+    # so that the decisions made from the queries can be memoized
+    memoizable = False
 
     def __init__(self):
         self._old_ctx = DispatchContext.current
+        # incremented when a config given by a memoizable context changes
+        self.version = 0
 
     def query(self, target, workload):
         """
@@ -190,6 +195,8 @@ class ApplyHistoryBest(DispatchContext):
         Each row of this file is an encoded record pair. Otherwise, it is an iterator.
     """
 
+    memoizable = True
+
     def __init__(self, records):
         super(ApplyHistoryBest, self).__init__()
 
@@ -226,6 +233,7 @@ class ApplyHistoryBest(DispatchContext):
         best_by_model = self.best_by_model
 
         counter = 0
+        changed = False
         for inp, res in records:
             counter += 1
             if res.error_no != 0:
@@ -236,21 +244,27 @@ class ApplyHistoryBest(DispatchContext):
                 key = (k, inp.task.workload)
                 if key not in best_by_targetkey:
                     best_by_targetkey[key] = (inp, res)
+                    changed = True
                 else:
                     _, other_res = best_by_targetkey[key]
                     if np.mean(other_res.costs) > np.mean(res.costs):
                         best_by_targetkey[key] = (inp, res)
+                        changed = True
 
             # use model as key to build best map
             key = (inp.target.model, inp.task.workload)
             if key not in best_by_model:
                 if inp.target.model != "unknown":
                     best_by_model[key] = (inp, res)
+                    changed = True
             else:
                 _, other_res = best_by_model[key]
                 if np.mean(other_res.costs) > np.mean(res.costs):
                     best_by_model[key] = (inp, res)
+                    changed = True
 
+        if changed:
+            self.version += 1
         logger.debug("Finish loading %d records", counter)
 
     def _query_inside(self, target, workload):
@@ -285,11 +299,14 @@ class ApplyHistoryBest(DispatchContext):
         key = (model, workload)
         # assume user provided config is the best
         cfg.cost = 0
-        self._best_user_defined[key] = cfg
-
-        for k in target.keys:
-            key = (k, workload)
-            self._best_user_defined[key] = cfg
+        changed = False
+        for key in [key] + [(k, workload) for k in target.keys]:
+            # alter_op_layout stores the same configs again on every build
+            if self._best_user_defined.get(key) is not cfg:
+                self._best_user_defined[key] = cfg
+                changed = True
+        if changed:
+            self.version += 1
 
 
 class FallbackContext(DispatchContext):
@@ -300,6 +317,8 @@ class FallbackContext(DispatchContext):
     This is the root context.
     """
 
+    memoizable = True
+
     def __init__(self):
         super(FallbackContext, self).__init__()
         self.memory = {}
@@ -337,10 +356,13 @@ class FallbackContext(DispatchContext):
         key = (str(target), workload)
         if key in self.memory:
             del self.memory[key]
+            self.version += 1
 
     def update(self, target, workload, cfg):
         key = (str(target), workload)
-        self.memory[key] = cfg
+        if self.memory.get(key) is not cfg:
+            self.memory[key] = cfg
+            self.version += 1
 
 
 DispatchContext.current = FallbackContext()
@@ -367,6 +389,29 @@ def clear_fallback_cache(target, workload):
     context.clear_cache(target, workload)
 
 
+def memoization_version():
+    """Get the version of the configs given by the current dispatch context.
+
+    The decisions made from the queries of the current context, e.g. the
+    implementation selected for an operator, can be reused as long as the
+    context and its version are the same.
+
+    Returns
+    -------
+    version : Optional[tuple]
+        The versions of the current context and of its parents, or None when the
+        queries of one of them cannot be memoized.
+    """
+    versions = []
+    context = DispatchContext.current
+    while context is not None:
+        if not context.memoizable:
+            return None
+        versions.append((id(context), context.version))
+        context = context._old_ctx
+    return tuple(versions)
+
+
 class ApplyGraphBest(DispatchContext):
     """Load the graph level tuning optimal schedules.
 
@@ -193,19 +193,18 @@ class GraphModuleDebug(graph_executor.GraphModule):
 
     def _run_per_layer(self):
         """Execute up to each node and each debug output will be
-        copied to the buffer.
+        streamed to the dump file as soon as it is produced.
 
         """
-        output_tensors = []
-        for i, node in enumerate(self.debug_datum.get_graph_nodes()):
-            self._execute_node(i)
-            num_outputs = self.debug_datum.get_graph_node_output_num(node)
-            for j in range(num_outputs):
-                logging.info(
-                    "running node=%d, output_ind=%d, with node_name: %s", i, j, node["name"]
-                )
-                output_tensors.append(self._get_node_output(i, j))
-        self.debug_datum.update_output_tensors(output_tensors)
+        with self.debug_datum.open_output_tensor_writer() as writer:
+            for i, node in enumerate(self.debug_datum.get_graph_nodes()):
+                self._execute_node(i)
+                num_outputs = self.debug_datum.get_graph_node_output_num(node)
+                for j in range(num_outputs):
+                    logging.info(
+                        "running node=%d, output_ind=%d, with node_name: %s", i, j, node["name"]
+                    )
+                    writer.write(self._get_node_output(i, j))
 
     def _run_debug(self):
         """Execute the node specified with index will be executed.
@@ -256,13 +255,12 @@ class GraphModuleDebug(graph_executor.GraphModule):
         if input_dict:
             self.set_input(**input_dict)
 
-        # Step 1. Execute the graph
+        # Step 1. Execute the graph, dumping the output tensors to the dump folder
         self._run_debug()
-        # Step 2. Dump the output tensors to the dump folder
-        self.debug_datum.dump_output_tensor()
-        # Step 3. Dump the Chrome trace to the dump folder
+        self._copy_outputs()
+        # Step 2. Dump the Chrome trace to the dump folder
         self.debug_datum.dump_chrome_trace()
-        # Step 4. Display the collected information
+        # Step 3. Display the collected information
         self.debug_datum.display_debug_result()
 
     def run_individual(self, number, repeat=1, min_repeat_ms=0):
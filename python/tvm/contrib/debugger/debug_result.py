@@ -18,14 +18,28 @@
 import collections
 import json
 import os
+import struct
 import numpy as np
 import tvm
+from tvm._ffi.runtime_ctypes import DataType, DataTypeCode
 
 GRAPH_DUMP_FILE_NAME = "_tvmdbg_graph_dump.json"
 CHROME_TRACE_FILE_NAME = "_tvmdbg_execution_trace.json"
+OUTPUT_TENSORS_FILE_NAME = "output_tensors.params"
+
+# The layout of the files written by tvm.runtime.save_param_dict_to_file,
+# see SaveParamsToFile in src/runtime/file_utils.cc.
+_PARAM_FILE_MAGIC = 0xF7E58D4F05049CB8
+_PARAM_FILE_ALIGNMENT = 4096
 
 ChromeTraceEvent = collections.namedtuple("ChromeTraceEvent", ["ts", "tid", "pid", "name", "ph"])
 
+TensorDiff = collections.namedtuple(
+    "TensorDiff", ["name", "shape", "max_abs_diff", "max_rel_diff", "num_mismatched"]
+)
+# the smallest reference magnitude the relative differences are taken to
+_REL_DIFF_EPS = float(np.finfo("float32").eps)
+
 
 class DebugResult(object):
     """Graph debug data module.
@@ -47,7 +61,6 @@ class DebugResult(object):
 
     def __init__(self, graph_json, dump_path):
         self._dump_path = dump_path
-        self._output_tensor_list = []
         self._time_list = []
         json_obj = self._parse_graph(graph_json)
         # dump the json information
@@ -110,48 +123,53 @@ class DebugResult(object):
         """Return the nodes dtype list"""
         return self._dtype_list
 
-    def get_output_tensors(self):
-        """Dump the outputs to a temporary folder, the tensors are in numpy format"""
+    def get_output_tensor_entries(self):
+        """Return the name, dtype and shape of every node output, in execution order.
+
+        The shapes and types are the ones planned in the graph, which are the
+        ones of the tensors produced by the executor.
+        """
         eid = 0
-        order = 0
-        output_tensors = {}
-        for node, time in zip(self._nodes_list, self._time_list):
+        entries = []
+        for node in self._nodes_list:
             num_outputs = self.get_graph_node_output_num(node)
             for j in range(num_outputs):
-                order += time[0]
-                key = node["name"] + "_" + str(j)
-                output_tensors[key] = self._output_tensor_list[eid]
+                key = node["name"] + "____" + str(j)
+                entries.append((key, self._dtype_list[1][eid], self._shapes_list[1][eid]))
                 eid += 1
-        return output_tensors
+        return entries
 
-    def update_output_tensors(self, tensors):
-        """Update output tensors list
+    def get_output_tensors(self):
+        """Return the dumped outputs, mapped from the dump file.
 
-        Parameters
-        ----------
-        tensors : list[NDArray]
+        Returns
+        -------
+        output_tensors : dict of str to NDArray
+            The output of each node, keyed by the node name and output index.
+            The arrays view the file, their data is read when it is accessed.
         """
-        if not isinstance(tensors, list):
-            AttributeError("tensors with incorrect type.")
+        path = os.path.join(self._dump_path, OUTPUT_TENSORS_FILE_NAME)
+        dumped = tvm.runtime.load_param_dict_from_file(path)
+        output_tensors = {}
+        for key, _, _ in self.get_output_tensor_entries():
+            name, index = key.rsplit("____", 1)
+            output_tensors[name + "_" + index] = dumped[key]
+        return output_tensors
 
-        for output_array in tensors:
-            self._output_tensor_list.append(output_array)
+    def open_output_tensor_writer(self):
+        """Open the dump file of the output tensors for streaming.
 
-    def dump_output_tensor(self):
-        """Dump the outputs to a temporary folder, the tensors are in numpy format"""
+        Returns
+        -------
+        writer : OutputTensorWriter
+            The writer expecting the output of every node in execution order.
+        """
         # cleanup existing tensors before dumping
         self._cleanup_tensors()
-        eid = 0
-        output_tensors = {}
-        for node in self._nodes_list:
-            num_outputs = self.get_graph_node_output_num(node)
-            for j in range(num_outputs):
-                key = node["name"] + "____" + str(j)
-                output_tensors[key] = self._output_tensor_list[eid]
-                eid += 1
-
-        with open(os.path.join(self._dump_path, "output_tensors.params"), "wb") as param_f:
-            param_f.write(save_tensors(output_tensors))
+        return OutputTensorWriter(
+            os.path.join(self._dump_path, OUTPUT_TENSORS_FILE_NAME),
+            self.get_output_tensor_entries(),
+        )
 
     def dump_chrome_trace(self):
         """Dump the trace to the Chrome trace.json format."""
@@ -221,7 +239,7 @@ class DebugResult(object):
                     eid += 1
                     continue
                 name = node["name"]
-                shape = str(self._output_tensor_list[eid].shape)
+                shape = str(tuple(self._shapes_list[1][eid]))
                 time_us = round(time[0] * 1e6, 3)
                 time_percent = round(((time[0] / total_time) * 100), 3)
                 inputs = str(node["attrs"]["num_inputs"])
@@ -275,3 +293,265 @@ def save_tensors(params):
     _save_tensors = tvm.get_global_func("tvm.relay._save_param_dict")
 
     return _save_tensors(params)
+
+
+def _align(offset):
+    return (offset + _PARAM_FILE_ALIGNMENT - 1) // _PARAM_FILE_ALIGNMENT * _PARAM_FILE_ALIGNMENT
+
+
+def _tensor_nbytes(dtype, shape):
+    dtype = DataType(dtype)
+    return int(np.prod(shape, dtype="int64")) * ((dtype.bits * dtype.lanes + 7) // 8)
+
+
+class OutputTensorWriter(object):
+    """Stream tensors to a parameter file as they are produced.
+
+    The file has the layout of :py:func:`tvm.runtime.save_param_dict_to_file`:
+    as the types and shapes of the tensors are known ahead, the header is
+    written first and each tensor is appended at its page aligned offset,
+    so only one tensor is held in memory at a time. The file can be loaded
+    with :py:func:`tvm.runtime.load_param_dict_from_file` or read record by
+    record with :py:class:`OutputTensorDump`.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+
+    entries : list of tuple of (str, str, list of int)
+        The name, dtype and shape of the tensors, in the order they are written.
+    """
+
+    def __init__(self, path, entries):
+        self._entries = []
+        offsets = []
+        # the header size does not depend on the offsets, measure it first
+        offset = len(self._pack_header(entries, [0] * len(entries)))
+        for _, dtype, shape in entries:
+            nbytes = _tensor_nbytes(dtype, shape)
+            offsets.append(_align(offset))
+            offset = offsets[-1] + nbytes
+            self._entries.append((offsets[-1], nbytes))
+        # the loader maps each tensor at its offset, even an empty one at the end
+        self._file_size = offset
+        self._file = open(path, "wb")
+        self._file.write(self._pack_header(entries, offsets))
+        self._num_written = 0
+
+    @staticmethod
+    def _pack_header(entries, offsets):
+        header = [struct.pack("<QQQ", _PARAM_FILE_MAGIC, _PARAM_FILE_ALIGNMENT, len(entries))]
+        for name, _, _ in entries:
+            name = name.encode("utf-8")
+            header.append(struct.pack("<Q", len(name)) + name)
+        header.append(struct.pack("<Q", len(entries)))
+        for (_, dtype, shape), offset in zip(entries, offsets):
+            nbytes = _tensor_nbytes(dtype, shape)
+            dtype = DataType(dtype)
+            header.append(struct.pack("<BBH", dtype.type_code, dtype.bits, dtype.lanes))
+            header.append(struct.pack("<Q%dq" % len(shape), len(shape), *shape))
+            header.append(struct.pack("<QQ", offset, nbytes))
+        return b"".join(header)
+
+    def write(self, tensor):
+        """Append the next tensor.
+
+        Parameters
+        ----------
+        tensor : NDArray or numpy.ndarray
+            The tensor, with the dtype and shape given for it.
+        """
+        if self._num_written >= len(self._entries):
+            raise ValueError("All the %d tensors have been written" % len(self._entries))
+        offset, nbytes = self._entries[self._num_written]
+        if isinstance(tensor, tvm.nd.NDArray):
+            tensor = tensor.numpy()
+        tensor = np.ascontiguousarray(tensor)
+        if tensor.nbytes != nbytes:
+            raise ValueError(
+                "Expect %d bytes for tensor %d, but got %d"
+                % (nbytes, self._num_written, tensor.nbytes)
+            )
+        # the padding is left as a hole in the file
+        self._file.seek(offset)
+        tensor.astype(tensor.dtype.newbyteorder("<"), copy=False).tofile(self._file)
+        self._num_written += 1
+
+    def close(self):
+        """Close the file, all the tensors must have been written."""
+        if self._file is None:
+            return
+        self._file.truncate(self._file_size)
+        self._file.close()
+        self._file = None
+        if self._num_written != len(self._entries):
+            raise ValueError(
+                "Only %d of the %d tensors have been written"
+                % (self._num_written, len(self._entries))
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        elif self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class OutputTensorDump(object):
+    """Read the tensors of a parameter file one at a time, by mapping them.
+
+    Reads the files written by :py:class:`OutputTensorWriter` and
+    :py:func:`tvm.runtime.save_param_dict_to_file` without the TVM runtime.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._records = collections.OrderedDict()
+        with open(path, "rb") as dump_f:
+
+            def read(fmt):
+                size = struct.calcsize(fmt)
+                data = dump_f.read(size)
+                if len(data) != size:
+                    raise ValueError("Truncated parameters file %s" % path)
+                return struct.unpack(fmt, data)
+
+            magic, _ = read("<QQ")
+            if magic != _PARAM_FILE_MAGIC:
+                raise ValueError("%s is not a memory-mappable parameters file" % path)
+            (num_names,) = read("<Q")
+            names = []
+            for _ in range(num_names):
+                (length,) = read("<Q")
+                names.append(dump_f.read(length).decode("utf-8"))
+            (num_records,) = read("<Q")
+            if num_records != num_names:
+                raise ValueError("Invalid parameters file %s" % path)
+            for name in names:
+                code, bits, lanes = read("<BBH")
+                (ndim,) = read("<Q")
+                shape = read("<%dq" % ndim)
+                offset, nbytes = read("<QQ")
+                self._records[name] = (self._numpy_dtype(code, bits, lanes), shape, offset, nbytes)
+
+    @staticmethod
+    def _numpy_dtype(code, bits, lanes):
+        if code == DataTypeCode.BFLOAT:
+            # numpy has no bfloat, compare the raw bits
+            dtype = "uint%d" % bits
+        elif bits == 1:
+            dtype = "bool"
+        else:
+            dtype = str(DataType("%s%d" % (DataType.CODE2STR[code], bits)))
+        dtype = np.dtype(dtype).newbyteorder("<")
+        return np.dtype((dtype, (lanes,))) if lanes != 1 else dtype
+
+    @property
+    def names(self):
+        """The names of the tensors, in the order of the file."""
+        return list(self._records.keys())
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, name):
+        return name in self._records
+
+    def __getitem__(self, name):
+        """Map a tensor of the file.
+
+        Parameters
+        ----------
+        name : str
+            The name of the tensor.
+
+        Returns
+        -------
+        tensor : numpy.memmap
+            A read-only view of the tensor, its data is read when it is accessed.
+        """
+        dtype, shape, offset, _ = self._records[name]
+        if int(np.prod(shape, dtype="int64")) == 0:
+            return np.empty(shape, dtype)
+        return np.memmap(self.path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+
+def compare_output_tensor_dumps(path_a, path_b, rtol=1e-5, atol=1e-5, chunk_size=1 << 20):
+    """Compare two dumps of the node outputs, node by node.
+
+    The nodes are matched by name, so the dumps can come from different targets
+    of the same graph. Each tensor is mapped and compared in chunks of
+    ``chunk_size`` elements, so the memory used does not depend on the model.
+
+    Parameters
+    ----------
+    path_a : str
+        The dump used as the reference.
+
+    path_b : str
+        The dump compared against it.
+
+    rtol : float
+        The relative tolerance, as in :py:func:`numpy.allclose`.
+
+    atol : float
+        The absolute tolerance, as in :py:func:`numpy.allclose`.
+
+    chunk_size : int
+        The number of elements compared at once.
+
+    Yields
+    ------
+    diff : TensorDiff
+        For each tensor of ``path_a`` also in ``path_b``, in execution order,
+        the largest absolute and relative differences and the number of
+        elements out of tolerance. The relative difference of an element is
+        ``|b - a| / max(|a|, eps)``, with the eps of float32.
+    """
+    dump_a = OutputTensorDump(path_a)
+    dump_b = OutputTensorDump(path_b)
+    for name in dump_a.names:
+        if name not in dump_b:
+            continue
+        tensor_a = dump_a[name]
+        tensor_b = dump_b[name]
+        shape = tuple(tensor_a.shape)
+        if tensor_a.shape != tensor_b.shape:
+            raise ValueError(
+                "Tensor %s has shape %s in %s but %s in %s"
+                % (name, tensor_a.shape, path_a, tensor_b.shape, path_b)
+            )
+        flat_a = tensor_a.reshape(-1)
+        flat_b = tensor_b.reshape(-1)
+        max_abs_diff = 0.0
+        max_rel_diff = 0.0
+        num_mismatched = 0
+        for begin in range(0, flat_a.size, chunk_size):
+            chunk_a = np.asarray(flat_a[begin : begin + chunk_size], dtype="float64")
+            chunk_b = np.asarray(flat_b[begin : begin + chunk_size], dtype="float64")
+            abs_diff = np.abs(chunk_a - chunk_b)
+            with np.errstate(invalid="ignore"):
+                # a difference to a zero in the reference is relative to eps
+                rel_diff = abs_diff / np.maximum(np.abs(chunk_a), _REL_DIFF_EPS)
+            # nan in one tensor only counts as a mismatch, nan in both does not
+            nan_a = np.isnan(chunk_a)
+            nan_b = np.isnan(chunk_b)
+            mismatched = ~np.isclose(chunk_b, chunk_a, rtol=rtol, atol=atol) & ~(nan_a & nan_b)
+            num_mismatched += int(np.count_nonzero(mismatched))
+            abs_diff = abs_diff[~(nan_a | nan_b)]
+            rel_diff = rel_diff[~(nan_a | nan_b)]
+            if abs_diff.size:
+                max_abs_diff = max(max_abs_diff, float(np.max(abs_diff)))
+                max_rel_diff = max(max_rel_diff, float(np.max(rel_diff)))
+        del tensor_a, tensor_b, flat_a, flat_b
+        yield TensorDiff(name, shape, max_abs_diff, max_rel_diff, num_mismatched)
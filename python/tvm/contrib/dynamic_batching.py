@@ -0,0 +1,238 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Dynamic batching front end for graph executors.
+
+Concurrent requests are queued and grouped into batches that are run by a set
+of GraphModule instances, one worker thread per instance. A request is never
+delayed by more than a latency deadline waiting for others to join its batch.
+
+.. code-block:: python
+
+    lib = relay.build(mod_with_batch_8, target="llvm")
+    modules = [graph_executor.GraphModule(lib["default"](tvm.cpu())) for _ in range(2)]
+    with DynamicBatcher(modules, input_names=["data"], max_latency_ms=2) as batcher:
+        # from many threads
+        outputs = batcher.infer(data=frame[np.newaxis])
+"""
+import collections
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from ..runtime import ndarray as nd
+from . import graph_executor
+
+
+class _Request(object):
+    """A request waiting in the queue of a DynamicBatcher."""
+
+    def __init__(self, inputs, rows):
+        self.inputs = inputs
+        self.rows = rows
+        self.arrival = time.perf_counter()
+        self.future = Future()
+
+
+class DynamicBatcher(object):
+    """Run concurrent inference requests in batches on a set of graph executors.
+
+    Each module runs batches of up to ``B`` rows, where ``B`` is the leading
+    (batch) dimension of its inputs: a module compiled with a batch dimension
+    runs several requests at once, and several modules compiled for a single
+    row serve requests in parallel as a pool. Requests can carry several rows.
+    The rows of a batch that no request fills are left over from previous
+    batches and their outputs are discarded.
+
+    The requests are packed in arrival order, and the ones too large for the
+    rows left in a batch wait for the next one, or for a larger module, without
+    holding back the requests behind them.
+
+    Parameters
+    ----------
+    modules : GraphModule or list of GraphModule
+        The executors running the batches. They must not be used elsewhere while
+        the batcher is open.
+
+    input_names : list of str
+        The inputs given by the requests, all batched along their first axis.
+
+    max_latency_ms : float
+        The longest time the first request of a batch waits for more requests
+        before the batch is run.
+    """
+
+    def __init__(self, modules, input_names, max_latency_ms=5.0):
+        if isinstance(modules, graph_executor.GraphModule):
+            modules = [modules]
+        if not modules:
+            raise ValueError("DynamicBatcher needs at least one module")
+        self.input_names = list(input_names)
+        self.max_latency = max_latency_ms / 1000.0
+        self.batch_sizes = []
+        self._requests = collections.deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._workers = []
+        for module in modules:
+            batch_size = module.get_input(self.input_names[0]).shape[0]
+            self.batch_sizes.append(batch_size)
+            worker = threading.Thread(
+                target=self._serve, args=(module, batch_size), name="DynamicBatcher", daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, **inputs):
+        """Queue a request.
+
+        Parameters
+        ----------
+        inputs : dict of str to numpy.ndarray
+            The inputs of the request, with the same number of rows along the
+            first axis.
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            Resolves to the list of outputs of the request, as numpy arrays
+            holding its rows.
+        """
+        if set(inputs.keys()) != set(self.input_names):
+            raise ValueError(
+                "Expect inputs %s, but got %s" % (self.input_names, sorted(inputs.keys()))
+            )
+        inputs = {k: np.asarray(v) for k, v in inputs.items()}
+        rows = inputs[self.input_names[0]].shape[0]
+        if any(v.shape[0] != rows for v in inputs.values()):
+            raise ValueError("All inputs of a request must have the same number of rows")
+        if rows > max(self.batch_sizes):
+            raise ValueError(
+                "A request of %d rows does not fit in a batch of %d" % (rows, max(self.batch_sizes))
+            )
+        request = _Request(inputs, rows)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("DynamicBatcher is closed")
+            self._requests.append(request)
+            self._cond.notify_all()
+        return request.future
+
+    def infer(self, **inputs):
+        """Run a request and wait for its outputs.
+
+        Parameters
+        ----------
+        inputs : dict of str to numpy.ndarray
+            The inputs of the request, see :py:func:`submit`.
+
+        Returns
+        -------
+        outputs : list of numpy.ndarray
+            The outputs of the request.
+        """
+        return self.submit(**inputs).result()
+
+    def close(self):
+        """Run the queued requests and stop the workers."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for worker in self._workers:
+            worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _take_batch(self, batch_size):
+        """Wait for a batch of requests to fill, or for its deadline."""
+        with self._cond:
+            while True:
+                while not self._requests and not self._closed:
+                    self._cond.wait()
+                if not self._requests:
+                    return None
+                # pack the requests in arrival order, skipping the ones that do not
+                # fit in the rows left, so a large request at the head of the queue
+                # does not hold back the smaller ones behind it
+                rows = 0
+                picked = []
+                full = False
+                for index, request in enumerate(self._requests):
+                    if rows + request.rows <= batch_size:
+                        rows += request.rows
+                        picked.append(index)
+                    elif request.rows <= batch_size:
+                        full = True
+                    if rows == batch_size:
+                        full = True
+                        break
+                if not picked:
+                    # the requests only fit in larger modules
+                    self._cond.wait()
+                    continue
+                deadline = self._requests[picked[0]].arrival + self.max_latency
+                remaining = deadline - time.perf_counter()
+                if full or remaining <= 0 or self._closed:
+                    batch = [self._requests[index] for index in picked]
+                    for index in reversed(picked):
+                        del self._requests[index]
+                    # let the other workers look at the requests left
+                    self._cond.notify_all()
+                    return batch
+                self._cond.wait(remaining)
+
+    def _serve(self, module, batch_size):
+        buffers = {}
+        for name in self.input_names:
+            arr = module.get_input(name)
+            buffers[name] = nd.aligned_numpy_empty(arr.shape, arr.dtype)
+            buffers[name].fill(0)
+        while True:
+            batch = self._take_batch(batch_size)
+            if batch is None:
+                return
+            try:
+                offset = 0
+                for request in batch:
+                    for name, value in request.inputs.items():
+                        buffers[name][offset : offset + request.rows] = value
+                    offset += request.rows
+                # binds the buffers in place when the module is local, copies them otherwise
+                module.set_input_zero_copy(**buffers)
+                module.run()
+                outputs = [module.get_output(i).numpy() for i in range(module.get_num_outputs())]
+            # pylint: disable=broad-except
+            except Exception as err:
+                for request in batch:
+                    request.future.set_exception(err)
+                continue
+            offset = 0
+            for request in batch:
+                request.future.set_result(
+                    [
+                        out[offset : offset + request.rows]
+                        if out.ndim > 0 and out.shape[0] == batch_size
+                        else out
+                        for out in outputs
+                    ]
+                )
+                offset += request.rows
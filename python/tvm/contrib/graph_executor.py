@@ -15,6 +15,11 @@
 # specific language governing permissions and limitations
 # under the License.
 """Minimum graph executor that executes graph containing TVM PackedFunc."""
+import contextlib
+import os
+import threading
+import time
+
 import numpy as np
 import tvm._ffi
 
@@ -22,6 +27,8 @@ from tvm.rpc import _ffi_api as _rpc_ffi_api
 from tvm.rpc import base as rpc_base
 from tvm._ffi.base import string_types
 from tvm._ffi.runtime_ctypes import Device
+from tvm.runtime.pipeline import ExecutionPipeline
+from tvm.runtime.profiling import Report
 
 
 def create(graph_json_str, libmod, device):
@@ -161,6 +168,31 @@ class GraphModule(object):
         self._get_num_inputs = module["get_num_inputs"]
         self._load_params = module["load_params"]
         self._share_params = module["share_params"]
+        # input index -> array aliased by the module
+        self._bound_inputs = {}
+        # output index -> array aliased by the module
+        self._bound_outputs = {}
+        # output index -> destination the output is copied to after each run
+        self._copied_outputs = {}
+        self._pipeline = None
+        self._pipeline_lock = threading.Lock()
+
+    def _input_index(self, key):
+        if isinstance(key, str):
+            index = self._get_input_index(key)
+            if index < 0:
+                raise RuntimeError("Could not find '%s' in graph's inputs" % key)
+            return index
+        return key
+
+    def _unbind_input(self, index):
+        if self._bound_inputs.pop(index, None) is not None:
+            self.module["set_input_zero_copy"](index, self._get_input(index))
+
+    def _unbind_output(self, index):
+        self._copied_outputs.pop(index, None)
+        if self._bound_outputs.pop(index, None) is not None:
+            self.module["set_output_zero_copy"](index, self._get_output(index))
 
     def set_input(self, key=None, value=None, **params):
         """Set inputs to the module via kwargs
@@ -180,6 +212,8 @@ class GraphModule(object):
             v = self._get_input(key)
             if v is None:
                 raise RuntimeError("Could not find '%s' in graph's inputs" % key)
+            if self._bound_inputs:
+                self._unbind_input(self._input_index(key))
             v.copyfrom(value)
 
         if params:
@@ -192,7 +226,95 @@ class GraphModule(object):
                 # params from set_input
                 val = self._get_input(k)
                 if val:
-                    self._get_input(k).copyfrom(params[k])
+                    if self._bound_inputs:
+                        self._unbind_input(self._input_index(k))
+                    val.copyfrom(params[k])
+
+    def set_input_zero_copy(self, key=None, value=None, **params):
+        """Bind inputs to the module without copying their data when possible.
+
+        The module reads the given arrays in place in every following run, until
+        the input is bound again or set with :py:func:`set_input`. NumPy arrays,
+        NDArrays and DLPack producers can be bound when they are C-contiguous,
+        aligned like a TVM allocation (see :py:func:`tvm.nd.aligned_numpy_empty`),
+        and have the device, dtype and shape of the input. Other values are copied
+        like with :py:func:`set_input`.
+
+        Parameters
+        ----------
+        key : int or str
+           The input key
+
+        value : the input value.
+           The input value
+
+        params : dict of str to array
+           Additional arguments
+        """
+        if key is not None:
+            params = dict(params)
+            params[key] = value
+        for k, val in params.items():
+            index = self._input_index(k)
+            internal = self._get_input(index)
+            view = tvm.nd.zero_copy_view(val, internal.device, internal.dtype, internal.shape)
+            if view is None:
+                self._unbind_input(index)
+                internal.copyfrom(val)
+            else:
+                self.module["set_input_zero_copy"](index, view)
+                self._bound_inputs[index] = view
+
+    def set_output_zero_copy(self, index, value):
+        """Bind an output of the module to a destination array.
+
+        Every following run writes the output directly into ``value`` when it can
+        be aliased (see :py:func:`set_input_zero_copy`), or copies the output into
+        it at the end of the run otherwise.
+
+        Parameters
+        ----------
+        index : int
+            The output index
+
+        value : numpy.ndarray, NDArray or DLPack producer
+            The destination array
+        """
+        internal = self._get_output(index)
+        self._unbind_output(index)
+        view = tvm.nd.zero_copy_view(value, internal.device, internal.dtype, internal.shape)
+        if view is not None:
+            self.module["set_output_zero_copy"](index, view)
+            self._bound_outputs[index] = view
+            return
+        if not isinstance(value, (np.ndarray, tvm.nd.NDArray)):
+            value = tvm.nd.from_dlpack(value)
+        if tuple(value.shape) != tuple(internal.shape):
+            raise ValueError(
+                "output shape do not match the destination {0} vs {1}".format(
+                    internal.shape, value.shape
+                )
+            )
+        self._copied_outputs[index] = value
+
+    def set_output_buffers(self, *buffers):
+        """Register persistent destination arrays for the outputs of the module.
+
+        Every following run leaves the i-th output in ``buffers[i]``, written in
+        place or with a single copy (see :py:func:`set_output_zero_copy`), so a
+        serving loop can read its results without allocating arrays. An output
+        whose buffer is None is left to the module.
+
+        Parameters
+        ----------
+        buffers : list of numpy.ndarray, NDArray or DLPack producer
+            The destination arrays
+        """
+        for index, buf in enumerate(buffers):
+            if buf is None:
+                self._unbind_output(index)
+            else:
+                self.set_output_zero_copy(index, buf)
 
     def run(self, **input_dict):
         """Run forward execution of the graph
@@ -205,6 +327,113 @@ class GraphModule(object):
         if input_dict:
             self.set_input(**input_dict)
         self._run()
+        self._copy_outputs()
+
+    def _copy_outputs(self):
+        """Copy the outputs to the bound destinations that cannot be aliased."""
+        for index, dest in self._copied_outputs.items():
+            self._get_output(index).copyto(dest)
+
+    def run_async(self, **input_dict):
+        """Run forward execution of the graph without waiting for it.
+
+        The requests are pipelined: the inputs of a request are copied to the
+        device while the previous request runs, and its outputs are copied back
+        while the next one runs. Each step is done by its own thread, on its own
+        stream on devices that support them. The requests run in the order they
+        are submitted, and the module must not be used synchronously until they
+        are done. :py:func:`close_async` stops the threads.
+
+        Parameters
+        ----------
+        input_dict: dict of str to NDArray or numpy.ndarray
+            The input values of the request
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            Resolves to the list of outputs, as numpy arrays. In asyncio, await
+            ``asyncio.wrap_future(future)``.
+        """
+        with self._pipeline_lock:
+            if self._pipeline is None:
+                self._pipeline = ExecutionPipeline(
+                    self._get_output(0).device,
+                    self._upload_inputs,
+                    self._run_uploaded,
+                    self._download_outputs,
+                )
+            return self._pipeline.submit(**input_dict)
+
+    def close_async(self):
+        """Finish the requests submitted with :py:func:`run_async` and stop the
+        threads running them. A later request starts them again."""
+        with self._pipeline_lock:
+            if self._pipeline is not None:
+                self._pipeline.close()
+                self._pipeline = None
+
+    def _upload_inputs(self, **input_dict):
+        device = self._pipeline.device
+        return {
+            k: v
+            if isinstance(v, tvm.nd.NDArray) and v.device == device
+            else tvm.nd.array(v, device)
+            for k, v in input_dict.items()
+        }
+
+    def _run_uploaded(self, input_dict):
+        self.run(**input_dict)
+        outputs = []
+        for i in range(self._get_num_outputs()):
+            out = self._get_output(i)
+            # the next run overwrites the output, keep a copy
+            if out.device.device_type == tvm.cpu().device_type:
+                outputs.append(out.numpy())
+            else:
+                outputs.append(out.copyto(out.device))
+        return outputs
+
+    @staticmethod
+    def _download_outputs(outputs):
+        return [out if isinstance(out, np.ndarray) else out.numpy() for out in outputs]
+
+    def enable_sampling_profiler(self, interval=100, capacity=100):
+        """Record the per-operator timings of one run out of ``interval``.
+
+        Sampled runs time every operator, other runs only increment a counter, so
+        the profiler can stay enabled while serving. The durations of the last
+        ``capacity`` sampled runs are kept, see :py:func:`sampling_report`.
+        Enabling the profiler again clears them. It must not be enabled or
+        disabled while a run is in progress.
+
+        Parameters
+        ----------
+        interval : int
+            Record one run out of ``interval``.
+
+        capacity : int
+            The number of sampled runs kept.
+        """
+        self.module["set_sampling_profiler"](interval, capacity)
+
+    def disable_sampling_profiler(self):
+        """Stop recording the per-operator timings of the runs."""
+        self.module["set_sampling_profiler"](0, 0)
+
+    def sampling_report(self):
+        """Summarize the runs recorded by the sampling profiler.
+
+        Returns
+        -------
+        report : tvm.runtime.profiling.Report
+            The total duration and number of calls of each operator on each device
+            over the sampled runs, and in its device metrics the total duration
+            and number of the sampled runs.
+        """
+        if self.module.type_key == "rpc":
+            return Report.from_json(self.module["get_sampling_report_rpc"]())
+        return self.module["get_sampling_report"]()
 
     def get_num_outputs(self):
         """Get the number of outputs from the graph
@@ -234,10 +463,10 @@ class GraphModule(object):
         index : int
             The input index
 
-        out : NDArray
+        out : NDArray or numpy.ndarray
             The output array container
         """
-        if out:
+        if out is not None:
             self._get_input(index).copyto(out)
             return out
 
@@ -266,10 +495,18 @@ class GraphModule(object):
         index : int
             The output index
 
-        out : NDArray
-            The output array container
+        out : NDArray or numpy.ndarray
+            The output array container, written in place
         """
-        if out:
+        if index in self._bound_outputs:
+            bound = self._bound_outputs[index]
+            if out is not None:
+                bound.copyto(out)
+                return out
+            return bound
+        if isinstance(out, np.ndarray):
+            return self._get_output(index).copyto(out)
+        if out is not None:
             self._get_output(index, out)
             return out
 
@@ -293,10 +530,17 @@ class GraphModule(object):
 
         Parameters
         ----------
-        params_bytes : bytearray
-            The serialized parameter dict.
+        params_bytes : bytearray or str
+            The serialized parameter dict, or the path of a file written by
+            :py:func:`tvm.runtime.save_param_dict_to_file`. A file is mapped
+            into memory and each parameter is copied from it in parallel.
         """
-        self._load_params(bytearray(params_bytes))
+        if isinstance(params_bytes, (str, os.PathLike)):
+            self.module["load_params_from_file"](os.fspath(params_bytes))
+            return
+        if not isinstance(params_bytes, (bytes, bytearray)):
+            params_bytes = bytearray(params_bytes)
+        self._load_params(params_bytes)
 
     def share_params(self, other, params_bytes):
         """Share parameters from pre-existing GraphExecutor instance.
@@ -309,7 +553,9 @@ class GraphModule(object):
         params_bytes : bytearray
             The serialized parameter dict (used only for the parameter names).
         """
-        self._share_params(other.module, bytearray(params_bytes))
+        if not isinstance(params_bytes, (bytes, bytearray)):
+            params_bytes = bytearray(params_bytes)
+        self._share_params(other.module, params_bytes)
 
     def __getitem__(self, key):
         """Get internal module function
@@ -407,3 +653,148 @@ class GraphModule(object):
         return self.module.time_evaluator(
             func_name, device, repeat=repeat, number=number, min_repeat_ms=min_repeat_ms
         )()
+
+
+class GraphModulePool(object):
+    """A thread-safe pool of GraphModule instances sharing one copy of the parameters.
+
+    The first instance is created with the parameters of the factory module, the
+    others are created without parameters and share the ones of the first instance
+    (see :py:func:`GraphModule.share_params`). Instances are handed out to one
+    thread at a time, and the GIL is released while they run, so threads using
+    different instances run in parallel.
+
+    Parameters
+    ----------
+    lib : tvm.relay.backend.executor_factory.GraphExecutorFactoryModule or Module
+        The factory module created by relay.build, or loaded from its export.
+
+    device : Device
+        The device to deploy the instances on.
+
+    num_instances : int
+        The number of instances.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        pool = GraphModulePool(lib, tvm.cpu(), num_instances=8)
+        # from many threads
+        with pool.instance() as module:
+            module.run(data=data)
+            out = module.get_output(0).numpy()
+    """
+
+    def __init__(self, lib, device, num_instances):
+        if num_instances < 1:
+            raise ValueError("GraphModulePool needs at least one instance")
+        first = GraphModule(lib["default"](device))
+        param_names = list(lib["get_param_names"]())
+        # share_params only reads the names of the parameters
+        names_blob = tvm.runtime.save_param_dict(
+            {name: np.zeros((0,), "int8") for name in param_names}
+        )
+        self.modules = [first]
+        if num_instances > 1:
+            lib_without_params = lib["remove_params"]()
+            for _ in range(num_instances - 1):
+                module = GraphModule(lib_without_params["default"](device))
+                module.share_params(first, names_blob)
+                self.modules.append(module)
+        self._free = list(range(num_instances))
+        self._cond = threading.Condition()
+        self._index = {id(module): i for i, module in enumerate(self.modules)}
+        self.reset_stats()
+
+    def acquire(self, timeout=None):
+        """Take an instance out of the pool, waiting for one to be free.
+
+        Parameters
+        ----------
+        timeout : Optional[float]
+            The longest time to wait in seconds, wait forever when None.
+
+        Returns
+        -------
+        module : GraphModule
+            The instance, to be given back with :py:func:`release`.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._free, timeout):
+                raise TimeoutError("No free instance in GraphModulePool")
+            index = self._free.pop()
+            self._acquire_time[index] = time.perf_counter()
+            return self.modules[index]
+
+    def release(self, module):
+        """Give an instance back to the pool.
+
+        Parameters
+        ----------
+        module : GraphModule
+            An instance returned by :py:func:`acquire`.
+        """
+        index = self._index[id(module)]
+        with self._cond:
+            self._busy_time[index] += time.perf_counter() - self._acquire_time[index]
+            self._num_uses[index] += 1
+            self._free.append(index)
+            self._cond.notify()
+
+    @contextlib.contextmanager
+    def instance(self, timeout=None):
+        """Context manager holding an instance of the pool, see :py:func:`acquire`."""
+        module = self.acquire(timeout)
+        try:
+            yield module
+        finally:
+            self.release(module)
+
+    def run(self, **input_dict):
+        """Run the inputs on a free instance.
+
+        Parameters
+        ----------
+        input_dict: dict of str to NDArray or numpy.ndarray
+            The inputs of the graph
+
+        Returns
+        -------
+        outputs : list of numpy.ndarray
+            The outputs of the graph.
+        """
+        with self.instance() as module:
+            module.run(**input_dict)
+            return [module.get_output(i).numpy() for i in range(module.get_num_outputs())]
+
+    def reset_stats(self):
+        """Restart the utilization statistics."""
+        with self._cond:
+            num_instances = len(self.modules)
+            self._start_time = time.perf_counter()
+            self._acquire_time = [self._start_time] * num_instances
+            self._busy_time = [0.0] * num_instances
+            self._num_uses = [0] * num_instances
+
+    def stats(self):
+        """Get the utilization of each instance since the pool was created or its
+        statistics were reset.
+
+        Returns
+        -------
+        stats : list of dict
+            For each instance, the number of times it was used in "uses", the time
+            it was held in seconds in "busy_s", and the fraction of the time it was
+            held in "utilization".
+        """
+        with self._cond:
+            elapsed = max(time.perf_counter() - self._start_time, 1e-9)
+            return [
+                {
+                    "uses": uses,
+                    "busy_s": busy,
+                    "utilization": busy / elapsed,
+                }
+                for uses, busy in zip(self._num_uses, self._busy_time)
+            ]
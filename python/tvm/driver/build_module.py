@@ -28,6 +28,7 @@ from tvm.runtime import Module
 from tvm.runtime import ndarray
 from tvm.ir import container
 from tvm.ir import CallingConv
+from tvm.ir.instrument import profile_build_step
 from tvm.tir import PrimFunc
 from tvm.ir.module import IRModule
 from tvm.ir.transform import PassContext
@@ -354,12 +355,14 @@ def build(
 
     device_modules = []
     for tar, input_mod in target_input_mod.items():
-        mod_host, mdev = _build_for_device(input_mod, tar, target_host)
+        with profile_build_step("codegen", str(tar)):
+            mod_host, mdev = _build_for_device(input_mod, tar, target_host)
         mod_host_all.update(mod_host)
         device_modules.append(mdev)
 
     # Generate a unified host module.
-    rt_mod_host = codegen.build_module(mod_host_all, target_host)
+    with profile_build_step("codegen", str(target_host)):
+        rt_mod_host = codegen.build_module(mod_host_all, target_host)
 
     # Import all modules.
     for mdev in device_modules:
@@ -70,6 +70,13 @@ def add_tune_parser(subparsers):
         choices=frontends.get_frontend_names(),
         help="specify input model format",
     )
+    parser.add_argument(
+        "--import-cache",
+        metavar="DIR",
+        default=None,
+        help="directory caching the imported models, so that the model is only converted "
+        "again when it, its shapes or TVM change",
+    )
     parser.add_argument(
         "--number",
         default=10,
@@ -233,7 +240,9 @@ def drive_tune(args):
     args: argparse.Namespace
         Arguments from command line parser.
     """
-    tvmc_model = frontends.load_model(args.FILE, args.model_format, shape_dict=args.input_shapes)
+    tvmc_model = frontends.load_model(
+        args.FILE, args.model_format, shape_dict=args.input_shapes, cache_dir=args.import_cache
+    )
 
     # Specify hardware parameters, although they'll only be used if autoscheduling.
     hardware_params = auto_scheduler.HardwareParams(
@@ -25,6 +25,7 @@ from pathlib import Path
 import tvm
 from tvm import autotvm, auto_scheduler
 from tvm import relay
+from tvm.ir.instrument import BuildProfilingInstrument, profile_build_step
 from tvm.target import Target
 
 from . import common, composite_target, frontends
@@ -52,6 +53,13 @@ def add_compile_parser(subparsers):
         default="",
         help="the cross compiler options to generate target libraries, e.g. '-mfpu=neon-vfpv4'.",
     )
+    parser.add_argument(
+        "--build-profile",
+        metavar="PATH",
+        default=None,
+        help="profile the import and the build of the model, save the timeline to PATH "
+        "as a Chrome trace and print the costliest steps.",
+    )
     parser.add_argument(
         "--desired-layout",
         choices=["NCHW", "NHWC"],
@@ -69,6 +77,13 @@ def add_compile_parser(subparsers):
         choices=frontends.get_frontend_names(),
         help="specify input model format.",
     )
+    parser.add_argument(
+        "--import-cache",
+        metavar="DIR",
+        default=None,
+        help="directory caching the imported models, so that the model is only converted "
+        "again when it, its shapes or TVM change.",
+    )
     parser.add_argument(
         "-o",
         "--output",
@@ -137,24 +152,33 @@ def drive_compile(args):
         Zero if successfully completed
 
     """
-    tvmc_model = frontends.load_model(args.FILE, args.model_format, args.input_shapes)
-
-    dump_code = [x.strip() for x in args.dump_code.split(",")] if args.dump_code else None
-
-    compile_model(
-        tvmc_model,
-        args.target,
-        tuning_records=args.tuning_records,
-        package_path=args.output,
-        cross=args.cross_compiler,
-        cross_options=args.cross_compiler_options,
-        output_format=args.output_format,
-        dump_code=dump_code,
-        target_host=None,
-        desired_layout=args.desired_layout,
-        disabled_pass=args.disabled_pass,
-        pass_context_configs=args.pass_config,
-    )
+    profiler = BuildProfilingInstrument() if args.build_profile else None
+    with profiler.collect() if profiler else autotvm.utils.EmptyContext():
+        tvmc_model = frontends.load_model(
+            args.FILE, args.model_format, args.input_shapes, cache_dir=args.import_cache
+        )
+
+        dump_code = [x.strip() for x in args.dump_code.split(",")] if args.dump_code else None
+
+        compile_model(
+            tvmc_model,
+            args.target,
+            tuning_records=args.tuning_records,
+            package_path=args.output,
+            cross=args.cross_compiler,
+            cross_options=args.cross_compiler_options,
+            output_format=args.output_format,
+            dump_code=dump_code,
+            target_host=None,
+            desired_layout=args.desired_layout,
+            disabled_pass=args.disabled_pass,
+            pass_context_configs=args.pass_config,
+            instruments=[profiler] if profiler else None,
+        )
+
+    if profiler:
+        profiler.save(args.build_profile)
+        print(profiler.render())
 
     return 0
 
@@ -172,6 +196,7 @@ def compile_model(
     desired_layout: Optional[str] = None,
     disabled_pass: Optional[str] = None,
     pass_context_configs: Optional[List[str]] = None,
+    instruments: Optional[List[tvm.ir.instrument.PassInstrument]] = None,
 ):
     """Compile a model from a supported framework into a TVM module.
 
@@ -215,6 +240,8 @@ def compile_model(
     pass_context_configs: list[str], optional
         List of strings containing a set of configurations to be passed to the
         PassContext.
+    instruments: list[PassInstrument], optional
+        The instruments of the PassContext, e.g. a BuildProfilingInstrument.
 
 
     Returns
@@ -253,19 +280,27 @@ def compile_model(
             with auto_scheduler.ApplyHistoryBest(tuning_records):
                 config["relay.backend.use_auto_scheduler"] = True
                 with tvm.transform.PassContext(
-                    opt_level=3, config=config, disabled_pass=disabled_pass
+                    opt_level=3,
+                    config=config,
+                    disabled_pass=disabled_pass,
+                    instruments=instruments,
                 ):
                     logger.debug("building relay graph with autoscheduler")
                     graph_module = relay.build(mod, target=tvm_target, params=params)
         else:
             with autotvm.apply_history_best(tuning_records):
                 with tvm.transform.PassContext(
-                    opt_level=3, config=config, disabled_pass=disabled_pass
+                    opt_level=3,
+                    config=config,
+                    disabled_pass=disabled_pass,
+                    instruments=instruments,
                 ):
                     logger.debug("building relay graph with tuning records")
                     graph_module = relay.build(mod, target=tvm_target, params=params)
     else:
-        with tvm.transform.PassContext(opt_level=3, config=config, disabled_pass=disabled_pass):
+        with tvm.transform.PassContext(
+            opt_level=3, config=config, disabled_pass=disabled_pass, instruments=instruments
+        ):
             logger.debug("building relay graph (no tuning records provided)")
             graph_module = relay.build(mod, target=tvm_target, params=params)
 
@@ -283,13 +318,14 @@ def compile_model(
         dumps[source_type] = source
 
     # Create a new tvmc model package object from the graph definition.
-    package_path = tvmc_model.export_package(
-        graph_module,
-        package_path,
-        cross,
-        cross_options,
-        output_format,
-    )
+    with profile_build_step("link", output_format):
+        package_path = tvmc_model.export_package(
+            graph_module,
+            package_path,
+            cross,
+            cross_options,
+            output_format,
+        )
 
     # Write dumps to file.
     if dumps:
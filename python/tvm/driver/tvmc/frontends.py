@@ -20,6 +20,8 @@ Provides support to parse models from different frameworks into Relay networks.
 Frontend classes do lazy-loading of modules on purpose, to reduce time spent on
 loading the tool.
 """
+import hashlib
+import json
 import logging
 import os
 import sys
@@ -30,7 +32,9 @@ from pathlib import Path
 
 import numpy as np
 
+import tvm
 from tvm import relay
+from tvm.ir.instrument import profile_build_step
 from tvm.driver.tvmc.common import TVMCException
 from tvm.driver.tvmc.model import TVMCModel
 
@@ -75,6 +79,22 @@ class Frontend(ABC):
 
         """
 
+    def dependencies(self, path):
+        """The files, besides the model file, that the model is loaded from.
+
+        Parameters
+        ----------
+        path: str
+            Path to the model file
+
+        Returns
+        -------
+        paths : list of str
+            The paths of the files, which are part of the key of the import cache.
+        """
+        # pylint: disable=unused-argument
+        return []
+
 
 def import_keras():
     """Lazy import function for Keras"""
@@ -170,6 +190,19 @@ class OnnxFrontend(Frontend):
 
         return relay.frontend.from_onnx(model, shape=shape_dict, **kwargs)
 
+    def dependencies(self, path):
+        # pylint: disable=C0415
+        import onnx
+
+        # pylint: disable=E1101
+        model = onnx.load(path, load_external_data=False)
+        locations = set()
+        for tensor in model.graph.initializer:
+            for entry in tensor.external_data:
+                if entry.key == "location":
+                    locations.add(os.path.join(os.path.dirname(path), entry.value))
+        return sorted(locations)
+
 
 class TensorflowFrontend(Frontend):
     """TensorFlow frontend for TVMC"""
@@ -211,16 +244,10 @@ class TFLiteFrontend(Frontend):
 
     def load(self, path, shape_dict=None, **kwargs):
         # pylint: disable=C0415
-        import tflite.Model as model
-
-        with open(path, "rb") as tf_graph:
-            content = tf_graph.read()
+        from tvm.relay.frontend.tflite import load_tflite_model
 
-        # tflite.Model.Model is tflite.Model in 1.14 and 2.1.0
-        try:
-            tflite_model = model.Model.GetRootAsModel(content, 0)
-        except AttributeError:
-            tflite_model = model.GetRootAsModel(content, 0)
+        # the model is mapped from the file, and its weights are not read in memory twice
+        tflite_model = load_tflite_model(path)
 
         try:
             version = tflite_model.Version()
@@ -342,10 +369,56 @@ def guess_frontend(path: str):
     raise TVMCException("failed to infer the model format. Please specify --model-format")
 
 
+def _hash_file(path, hasher):
+    """Feed the content of a file, or of the files under a directory, to hasher."""
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                hasher.update(os.path.relpath(file_path, path).encode("utf-8"))
+                _hash_file(file_path, hasher)
+        return
+    with open(path, "rb") as model_file:
+        for chunk in iter(lambda: model_file.read(1 << 20), b""):
+            hasher.update(chunk)
+
+
+def import_cache_key(path, frontend, shape_dict=None, **kwargs):
+    """Get the key of an imported model in the import cache.
+
+    The key covers the content of the model file and of the files it depends
+    on, the frontend, the shapes of the inputs, the arguments of the frontend
+    and the version of TVM.
+
+    Parameters
+    ----------
+    path : str
+        The path to the model file.
+    frontend : Frontend
+        The frontend importing the model.
+    shape_dict : dict, optional
+        Mapping from input names to their shapes.
+
+    Returns
+    -------
+    key : str
+        The hexadecimal digest identifying the imported model.
+    """
+    hasher = hashlib.sha256()
+    for file_path in [path] + frontend.dependencies(path):
+        _hash_file(file_path, hasher)
+    shapes = {name: list(shape) for name, shape in (shape_dict or {}).items()}
+    description = [frontend.name(), shapes, kwargs, tvm.__version__]
+    hasher.update(json.dumps(description, sort_keys=True, default=str).encode("utf-8"))
+    return hasher.hexdigest()
+
+
 def load_model(
     path: str,
     model_format: Optional[str] = None,
     shape_dict: Optional[Dict[str, List[int]]] = None,
+    cache_dir: Optional[str] = None,
     **kwargs,
 ):
     """Load a model from a supported framework and convert it
@@ -360,6 +433,11 @@ def load_model(
         If not specified, this will be inferred from the file type.
     shape_dict : dict, optional
         Mapping from input names to their shapes.
+    cache_dir : str, optional
+        A directory caching the imported models. When the model was imported
+        before with the same frontend, shapes and arguments, it is read from the
+        cache instead of being converted by the frontend again. The cached
+        models are saved with :py:meth:`TVMCModel.save`.
 
     Returns
     -------
@@ -373,6 +451,24 @@ def load_model(
     else:
         frontend = guess_frontend(path)
 
-    mod, params = frontend.load(path, shape_dict, **kwargs)
-
-    return TVMCModel(mod, params)
+    cache_path = None
+    if cache_dir:
+        key = import_cache_key(path, frontend, shape_dict, **kwargs)
+        cache_path = os.path.join(cache_dir, "%s.tar" % key)
+        if os.path.exists(cache_path):
+            logger.debug("loading the imported model from the cache: %s", cache_path)
+            return TVMCModel(model_path=cache_path)
+
+    with profile_build_step("frontend", frontend.name(), path=str(path)):
+        mod, params = frontend.load(path, shape_dict, **kwargs)
+    tvmc_model = TVMCModel(mod, params)
+
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        # write aside and rename, so that concurrent runs never read a partial file
+        temp_path = "%s.%d.tmp" % (cache_path, os.getpid())
+        tvmc_model.save(temp_path)
+        os.replace(temp_path, cache_path)
+        logger.debug("saved the imported model to the cache: %s", cache_path)
+
+    return tvmc_model
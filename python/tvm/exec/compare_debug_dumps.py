@@ -0,0 +1,76 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Tool to compare the node outputs dumped by two runs of the debug executor,
+e.g. of the same graph built for two targets.
+
+.. code-block:: bash
+
+    python -m tvm.exec.compare_debug_dumps llvm/output_tensors.params cuda/output_tensors.params
+"""
+import argparse
+import sys
+
+from ..contrib.debugger.debug_result import OutputTensorDump, compare_output_tensor_dumps
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("reference", type=str, help="the dump used as the reference")
+    parser.add_argument("dump", type=str, help="the dump compared against the reference")
+    parser.add_argument("--rtol", type=float, default=1e-5, help="the relative tolerance")
+    parser.add_argument("--atol", type=float, default=1e-5, help="the absolute tolerance")
+    parser.add_argument(
+        "--all", action="store_true", help="print every node, not only the mismatched ones"
+    )
+    parser.add_argument(
+        "--stop-at-first", action="store_true", help="stop at the first mismatched node"
+    )
+    args = parser.parse_args()
+
+    reference = OutputTensorDump(args.reference)
+    dump = OutputTensorDump(args.dump)
+    missing = [name for name in reference.names if name not in dump]
+    first = None
+    print("%-48s %-20s %12s %12s %10s" % ("Node", "Shape", "Max abs", "Max rel", "Mismatch"))
+    for diff in compare_output_tensor_dumps(args.reference, args.dump, args.rtol, args.atol):
+        if diff.num_mismatched and first is None:
+            first = diff.name
+        if diff.num_mismatched or args.all:
+            print(
+                "%-48s %-20s %12.6g %12.6g %10d"
+                % (
+                    diff.name,
+                    diff.shape,
+                    diff.max_abs_diff,
+                    diff.max_rel_diff,
+                    diff.num_mismatched,
+                )
+            )
+        if first is not None and args.stop_at_first:
+            break
+    if missing:
+        print("%d nodes of the reference are not in the dump" % len(missing))
+    if first is None:
+        print("All the common nodes match")
+        return 0
+    print("First mismatched node: %s" % first)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
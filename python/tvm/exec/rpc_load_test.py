@@ -0,0 +1,274 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name
+"""Load test of a RPC tracker with simulated servers and clients.
+
+All servers and clients are simulated on one local asyncio event loop,
+they speak the tracker and RPC handshake protocol but do not open a real
+RPC session, so the numbers only reflect the tracker (and proxy) cost.
+
+e.g.
+python3 -m tvm.exec.rpc_load_test --num-servers 200 --num-clients 400 --impl asyncio
+python3 -m tvm.exec.rpc_load_test --tracker 10.77.1.234:9190 --num-servers 100
+"""
+import argparse
+import asyncio
+import logging
+import struct
+import time
+
+from ..rpc import base
+from ..rpc.asyncio_util import open_tracker_connection, pack_json, read_json, read_magic
+from ..rpc.base import TrackerCode
+from .._ffi.base import py_str
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(q / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+class _FakeServer(object):
+    """A simulated RPC server that registers to the tracker and accepts handshakes."""
+
+    def __init__(self, tracker_addr, key, host="127.0.0.1"):
+        self._tracker_addr = tracker_addr
+        self._key = key
+        self._host = host
+        self._tracker = None
+        self._lock = asyncio.Lock()
+        self._server = None
+        self.matchkey = None
+        self.port = None
+        self.num_sessions = 0
+
+    async def _put(self):
+        self.matchkey = base.random_key(self._key + ":")
+        reader, writer = self._tracker
+        writer.write(
+            pack_json([TrackerCode.PUT, self._key, (self.port, self.matchkey), self._host])
+        )
+        assert await read_json(reader) == TrackerCode.SUCCESS
+
+    async def _on_connection(self, reader, writer):
+        try:
+            if await read_magic(reader) != base.RPC_MAGIC:
+                return
+            keylen = struct.unpack("<i", await reader.readexactly(4))[0]
+            key = py_str(await reader.readexactly(keylen))
+            if key.split()[0] != "client:" + self.matchkey:
+                writer.write(struct.pack("<i", base.RPC_CODE_MISMATCH))
+                return
+            server_key = "server:" + self._key
+            writer.write(struct.pack("<ii", base.RPC_CODE_SUCCESS, len(server_key)))
+            writer.write(server_key.encode("utf-8"))
+            self.num_sessions += 1
+            # the client closes the session right after the handshake
+            await reader.read()
+            async with self._lock:
+                await self._put()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        """Bind to a free port and register to the tracker."""
+        self._server = await asyncio.start_server(self._on_connection, self._host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._tracker = await open_tracker_connection(self._tracker_addr)
+        reader, writer = self._tracker
+        writer.write(
+            pack_json(
+                [TrackerCode.UPDATE_INFO, {"key": "server:" + self._key, "addr": [None, self.port]}]
+            )
+        )
+        assert await read_json(reader) == TrackerCode.SUCCESS
+        async with self._lock:
+            await self._put()
+
+    def close(self):
+        self._server.close()
+        self._tracker[1].close()
+
+
+async def _fake_client(tracker_addr, key, num_requests, priority, stats):
+    """A simulated client that repeatedly requests a server and opens a session."""
+    tstart = time.time()
+    reader, writer = await open_tracker_connection(tracker_addr)
+    stats["connect_latency"].append(time.time() - tstart)
+    try:
+        for _ in range(num_requests):
+            tstart = time.time()
+            writer.write(pack_json([TrackerCode.REQUEST, key, "load_test", priority]))
+            value = await read_json(reader)
+            assert value[0] == TrackerCode.SUCCESS
+            url, port, matchkey = value[1]
+            tscheduled = time.time()
+            stats["request_latency"].append(tscheduled - tstart)
+
+            sreader, swriter = await asyncio.open_connection(url, port)
+            client_key = ("client:" + matchkey).encode("utf-8")
+            swriter.write(struct.pack("<ii", base.RPC_MAGIC, len(client_key)) + client_key)
+            code = await read_magic(sreader)
+            if code == base.RPC_CODE_SUCCESS:
+                keylen = struct.unpack("<i", await sreader.readexactly(4))[0]
+                await sreader.readexactly(keylen)
+                stats["session_latency"].append(time.time() - tstart)
+            else:
+                stats["num_mismatch"] += 1
+            swriter.close()
+    finally:
+        writer.close()
+
+
+async def _run_load_test(tracker_addr, num_servers, num_clients, num_requests, key):
+    stats = {"connect_latency": [], "request_latency": [], "session_latency": [], "num_mismatch": 0}
+    servers = [_FakeServer(tracker_addr, key) for _ in range(num_servers)]
+    await asyncio.gather(*[s.start() for s in servers])
+    tstart = time.time()
+    await asyncio.gather(
+        *[_fake_client(tracker_addr, key, num_requests, i % 3, stats) for i in range(num_clients)]
+    )
+    elapsed = time.time() - tstart
+    for s in servers:
+        s.close()
+
+    result = {
+        "num_servers": num_servers,
+        "num_clients": num_clients,
+        "num_sessions": len(stats["session_latency"]),
+        "num_mismatch": stats["num_mismatch"],
+        "elapsed": elapsed,
+        "connections_per_sec": (len(stats["connect_latency"]) + len(stats["session_latency"]))
+        / max(elapsed, 1e-9),
+        "sessions_per_sec": len(stats["session_latency"]) / max(elapsed, 1e-9),
+    }
+    for name in ["connect_latency", "request_latency", "session_latency"]:
+        values = sorted(stats[name])
+        result[name] = {
+            "p50": _percentile(values, 50),
+            "p99": _percentile(values, 99),
+            "max": values[-1] if values else 0.0,
+        }
+    return result
+
+
+def run_load_test(tracker_addr, num_servers=16, num_clients=32, num_requests=10, key="load_test"):
+    """Simulate servers and clients against a running tracker.
+
+    Parameters
+    ----------
+    tracker_addr : tuple of (str, int)
+        The address of the tracker.
+
+    num_servers : int
+        Number of simulated servers registered under ``key``.
+
+    num_clients : int
+        Number of concurrent simulated clients.
+
+    num_requests : int
+        Number of sessions each client opens.
+
+    key : str
+        The device key used by the simulated servers.
+
+    Returns
+    -------
+    result : dict
+        Throughput in connections/sessions per second and the p50/p99/max of
+        the tracker connect, scheduling (REQUEST to reply) and full session
+        handshake latencies in seconds.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(
+            _run_load_test(tracker_addr, num_servers, num_clients, num_requests, key)
+        )
+    finally:
+        loop.close()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--tracker",
+        type=str,
+        default="",
+        help="The address of an existing RPC tracker in host:port format, "
+        "a local tracker is started if not set.",
+    )
+    parser.add_argument(
+        "--impl",
+        type=str,
+        default="asyncio",
+        choices=["asyncio", "tornado"],
+        help="The tracker implementation to start when --tracker is not set.",
+    )
+    parser.add_argument("--num-servers", type=int, default=16, help="Number of fake servers")
+    parser.add_argument("--num-clients", type=int, default=32, help="Number of fake clients")
+    parser.add_argument("--num-requests", type=int, default=10, help="Sessions per client")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    tracker = None
+    if args.tracker:
+        url, port = args.tracker.rsplit(":", 1)
+        tracker_addr = (url, int(port))
+    else:
+        # pylint: disable=import-outside-toplevel
+        if args.impl == "asyncio":
+            from ..rpc.asyncio_tracker import Tracker
+        else:
+            from ..rpc.tracker import Tracker
+        tracker = Tracker("127.0.0.1", port=9190, port_end=10000, silent=True)
+        tracker_addr = ("127.0.0.1", tracker.port)
+
+    try:
+        res = run_load_test(tracker_addr, args.num_servers, args.num_clients, args.num_requests)
+    finally:
+        if tracker:
+            tracker.terminate()
+
+    print(
+        "servers=%d clients=%d sessions=%d mismatch=%d elapsed=%.3fs"
+        % (
+            res["num_servers"],
+            res["num_clients"],
+            res["num_sessions"],
+            res["num_mismatch"],
+            res["elapsed"],
+        )
+    )
+    print(
+        "connections/sec: %.1f  sessions/sec: %.1f"
+        % (res["connections_per_sec"], res["sessions_per_sec"])
+    )
+    for name in ["connect_latency", "request_latency", "session_latency"]:
+        lat = res[name]
+        print(
+            "%-16s p50=%.3fms p99=%.3fms max=%.3fms"
+            % (name, lat["p50"] * 1e3, lat["p99"] * 1e3, lat["max"] * 1e3)
+        )
+
+
+if __name__ == "__main__":
+    main()
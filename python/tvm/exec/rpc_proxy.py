@@ -52,7 +52,14 @@ def main(args):
     else:
         tracker_addr = None
 
-    if args.example_rpc:
+    if args.use_asyncio:
+        # pylint: disable=import-outside-toplevel
+        from tvm.rpc import asyncio_proxy
+
+        if args.example_rpc:
+            raise RuntimeError("The asyncio proxy does not serve websocket connections")
+        prox = asyncio_proxy.Proxy(args.host, port=args.port, tracker_addr=tracker_addr)
+    elif args.example_rpc:
         index, js_files = find_example_resource()
         prox = Proxy(
             args.host,
@@ -78,6 +85,11 @@ if __name__ == "__main__":
         "--example-rpc", type=bool, default=False, help="Whether to switch on example rpc mode"
     )
     parser.add_argument("--tracker", type=str, default="", help="Report to RPC tracker")
+    parser.add_argument(
+        "--use-asyncio",
+        action="store_true",
+        help="Use the asyncio based proxy implementation, only TCP servers are supported.",
+    )
     args = parser.parse_args()
     logging.basicConfig(level=logging.INFO)
     main(args)
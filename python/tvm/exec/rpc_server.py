@@ -48,6 +48,7 @@ def main(args):
         custom_addr=args.custom_addr,
         silent=args.silent,
         no_fork=not args.fork,
+        slots=args.slots,
     )
     server.proc.join()
 
@@ -80,6 +81,13 @@ if __name__ == "__main__":
     parser.add_argument(
         "--custom-addr", type=str, help="Custom IP Address to Report to RPC Tracker"
     )
+    parser.add_argument(
+        "--slots",
+        type=str,
+        default=None,
+        help="Serve one concurrent session per local device or CPU socket, "
+        "each pinned to its own cores. e.g. numa, cpu:4, cuda:0,1,2,3",
+    )
 
     parser.set_defaults(fork=True)
     args = parser.parse_args()
@@ -18,11 +18,15 @@
 """Tool to start RPC tracker"""
 import logging
 import argparse
-from ..rpc.tracker import Tracker
 
 
 def main(args):
     """Main function"""
+    # pylint: disable=import-outside-toplevel
+    if args.use_asyncio:
+        from ..rpc.asyncio_tracker import Tracker
+    else:
+        from ..rpc.tracker import Tracker
     tracker = Tracker(args.host, port=args.port, port_end=args.port_end, silent=args.silent)
     tracker.proc.join()
 
@@ -35,6 +39,9 @@ if __name__ == "__main__":
     parser.add_argument("--port", type=int, default=9190, help="The port of the RPC")
     parser.add_argument("--port-end", type=int, default=9199, help="The end search port of the RPC")
     parser.add_argument("--silent", action="store_true", help="Whether run in silent mode.")
+    parser.add_argument(
+        "--use-asyncio", action="store_true", help="Use the asyncio based tracker implementation."
+    )
     args = parser.parse_args()
     logging.basicConfig(level=logging.INFO)
     main(args)
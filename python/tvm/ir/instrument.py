@@ -16,8 +16,19 @@
 # under the License.
 # pylint: disable=invalid-name,unused-argument
 """Common pass instrumentation across IR variants."""
+import contextlib
 import inspect
 import functools
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
 
 import tvm._ffi
 import tvm.runtime
@@ -167,3 +178,251 @@ class PassTimingInstrument(tvm.runtime.Object):
                 profiles = timing_inst.render()
         """
         return _ffi_instrument_api.RenderTimePassProfiles()
+
+
+# the build profilers collecting the steps, see profile_build_step
+_active_build_profilers = []
+
+
+def _peak_rss_kb():
+    if resource is None:
+        return 0
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # in bytes on macOS
+    return peak_rss // 1024 if sys.platform == "darwin" else peak_rss
+
+
+@contextlib.contextmanager
+def profile_build_step(category, name, **args):
+    """Record a step of a build in the active :py:class:`BuildProfilingInstrument`.
+
+    Parameters
+    ----------
+    category : str
+        The kind of the step, e.g. "frontend", "strategy", "codegen" or "link".
+
+    name : str
+        The name of the step, e.g. the operator or the function it works on.
+
+    args : dict
+        The details of the step shown in the trace. A ``function`` argument
+        attributes the time of the step to a primitive function.
+    """
+    if not _active_build_profilers:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        for profiler in list(_active_build_profilers):
+            profiler.record(category, name, start, duration, args)
+
+
+@pass_instrument
+class BuildProfilingInstrument:
+    """Profile where the time and memory of a build go.
+
+    The instrument records every pass of the PassContext it is given to, with
+    the growth of the peak resident memory of the process during the pass.
+    While the PassContext or :py:meth:`collect` is active, it also records the
+    steps reported with :py:func:`profile_build_step`: the import of the model
+    by tvmc, the selection of the strategy of each operator, the code
+    generation and the export of the library. Passes working on a module of a
+    single function, e.g. the TIR passes lowering a primitive function, are
+    attributed to that function.
+
+    The profile is available as a Chrome trace, see :py:meth:`save`, and as
+    tables of the costliest steps, see :py:meth:`render`.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        profiler = BuildProfilingInstrument()
+        with tvm.transform.PassContext(opt_level=3, instruments=[profiler]):
+            lib = relay.build(mod, target="llvm", params=params)
+        profiler.save("build_trace.json")
+        print(profiler.render())
+    """
+
+    def __init__(self):
+        self.events = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._depth = 0
+        self._passes = []
+
+    @contextlib.contextmanager
+    def collect(self):
+        """Record the steps reported outside of the PassContext, e.g. the model import."""
+        self.enter_pass_ctx()
+        try:
+            yield self
+        finally:
+            self.exit_pass_ctx()
+
+    def enter_pass_ctx(self):
+        # the same profiler can be given to nested contexts
+        with self._lock:
+            self._depth += 1
+            if self._depth == 1:
+                _active_build_profilers.append(self)
+
+    def exit_pass_ctx(self):
+        with self._lock:
+            self._depth -= 1
+            if self._depth == 0:
+                _active_build_profilers.remove(self)
+
+    def run_before_pass(self, mod, info):
+        self._passes.append((time.perf_counter(), _peak_rss_kb()))
+
+    def run_after_pass(self, mod, info):
+        start, peak_rss = self._passes.pop()
+        duration = time.perf_counter() - start
+        args = {"peak_rss_growth_kb": _peak_rss_kb() - peak_rss}
+        gvars = mod.get_global_vars()
+        if len(gvars) == 1:
+            args["function"] = gvars[0].name_hint
+        self.record("pass", info.name, start, duration, args)
+
+    def record(self, category, name, start, duration, args=None):
+        """Record a step.
+
+        Parameters
+        ----------
+        category : str
+            The kind of the step.
+
+        name : str
+            The name of the step.
+
+        start : float
+            The start of the step, as given by :py:func:`time.perf_counter`.
+
+        duration : float
+            The duration of the step, in seconds.
+
+        args : Optional[dict]
+            The details of the step.
+        """
+        event = {
+            "category": category,
+            "name": name,
+            "start": start - self._origin,
+            "duration": duration,
+            "thread": threading.get_ident(),
+            "args": dict(args or {}),
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def trace(self):
+        """Get the profile as a Chrome trace, which chrome://tracing or Perfetto can open.
+
+        Returns
+        -------
+        trace : dict
+            The trace in the JSON object format of the Trace Event Format.
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": event["name"],
+                "cat": event["category"],
+                "ph": "X",
+                "ts": event["start"] * 1e6,
+                "dur": event["duration"] * 1e6,
+                "pid": pid,
+                "tid": event["thread"],
+                "args": event["args"],
+            }
+            for event in self.events
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save(self, path):
+        """Save the profile as a Chrome trace.
+
+        Parameters
+        ----------
+        path : str
+            The path of the JSON file.
+        """
+        with open(path, "w") as trace_file:
+            json.dump(self.trace(), trace_file)
+
+    def category_totals(self):
+        """Get the time spent in each category of steps.
+
+        The steps nested in a step of the same category on the same thread,
+        e.g. the passes of a Sequential pass, are only counted once.
+
+        Returns
+        -------
+        totals : Dict[str, float]
+            The time per category, in seconds.
+        """
+        totals = {}
+        covered = {}
+        for event in sorted(self.events, key=lambda e: (e["start"], -e["duration"])):
+            key = (event["thread"], event["category"])
+            end = event["start"] + event["duration"]
+            if event["start"] >= covered.get(key, float("-inf")):
+                totals[event["category"]] = totals.get(event["category"], 0.0) + event["duration"]
+                covered[key] = end
+            else:
+                covered[key] = max(covered[key], end)
+        return totals
+
+    def render(self, top=20):
+        """Render the time per category, the costliest steps and primitive functions.
+
+        Parameters
+        ----------
+        top : int
+            The number of rows of the tables of steps and functions.
+
+        Returns
+        -------
+        report : str
+            The tables of the profile.
+        """
+        steps = {}
+        functions = {}
+        for event in self.events:
+            step = steps.setdefault((event["category"], event["name"]), [0, 0.0, 0.0, 0])
+            step[0] += 1
+            step[1] += event["duration"]
+            step[2] = max(step[2], event["duration"])
+            step[3] = max(step[3], event["args"].get("peak_rss_growth_kb", 0))
+            if "function" in event["args"]:
+                name = event["args"]["function"]
+                functions[name] = functions.get(name, 0.0) + event["duration"]
+
+        lines = ["%-12s %12s" % ("Category", "Total (ms)")]
+        totals = self.category_totals()
+        for category, total in sorted(totals.items(), key=lambda item: -item[1]):
+            lines.append("%-12s %12.2f" % (category, total * 1000))
+
+        lines += [
+            "",
+            "%-12s %-40s %6s %12s %10s %10s"
+            % ("Category", "Step", "Calls", "Total (ms)", "Max (ms)", "RSS+ (MB)"),
+        ]
+        for (category, name), (calls, total, longest, rss) in sorted(
+            steps.items(), key=lambda item: -item[1][1]
+        )[:top]:
+            lines.append(
+                "%-12s %-40s %6d %12.2f %10.2f %10.1f"
+                % (category, name[:40], calls, total * 1000, longest * 1000, rss / 1024)
+            )
+
+        if functions:
+            lines += ["", "%-53s %12s" % ("Function", "Total (ms)")]
+            for name, total in sorted(functions.items(), key=lambda item: -item[1])[:top]:
+                lines.append("%-53s %12.2f" % (name[:53], total * 1000))
+        return "\n".join(lines)
@@ -16,4 +16,5 @@
 # under the License.
 """Backend codegen modules for relay."""
 from . import compile_engine
+from . import kernel_cache
 from .contrib import cmsisnn
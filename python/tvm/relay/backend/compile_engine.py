@@ -19,9 +19,12 @@
 from __future__ import absolute_import
 
 import logging
+import weakref
+
 import numpy as np
 import tvm
 from tvm import te, autotvm
+from tvm.ir.instrument import profile_build_step
 from tvm.ir.transform import PassContext
 from tvm.runtime import Object
 from tvm.support import libinfo
@@ -36,6 +39,9 @@ autotvm_logger = logging.getLogger("autotvm")
 
 _first_warning = True
 
+# the implementations selected under each dispatch context, see select_implementation
+_selected_implementations = weakref.WeakKeyDictionary()
+
 
 @tvm._ffi.register_object("relay.LoweredOutput")
 class LoweredOutput(Object):
@@ -152,6 +158,74 @@ def get_valid_implementations(op, attrs, inputs, out_type, target):
     return ret
 
 
+def _is_static(shape):
+    return all(isinstance(dim, tvm.tir.IntImm) for dim in shape)
+
+
+class _ImplementationKey(object):
+    """The arguments that the selection of an implementation depends on.
+
+    The attributes and the output type are compared structurally, the strategy
+    by identity, which is kept alive by the key.
+    """
+
+    def __init__(self, op, attrs, inputs, out_type, target, use_autotvm):
+        self.strategy = op.get_attr("FTVMStrategy")
+        self.attrs = attrs
+        self.out_type = out_type
+        self.fields = (
+            op.name,
+            tuple((tuple(int(dim) for dim in t.shape), t.dtype) for t in inputs),
+            str(target),
+            str(target.host),
+            use_autotvm,
+        )
+        self._hash = hash(
+            (
+                self.fields,
+                self.strategy.handle.value,
+                tvm.ir.structural_hash(attrs) if attrs is not None else 0,
+                tvm.ir.structural_hash(out_type),
+            )
+        )
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if self.fields != other.fields or not self.strategy.same_as(other.strategy):
+            return False
+        if self.attrs is None or other.attrs is None:
+            if self.attrs is not other.attrs:
+                return False
+        elif not tvm.ir.structural_equal(self.attrs, other.attrs):
+            return False
+        return tvm.ir.structural_equal(self.out_type, other.out_type)
+
+
+def _get_selection_memo(op, attrs, inputs, out_type, target, use_autotvm):
+    """Get the memo of the implementations selected under the current dispatch context,
+    and the key of the selection in it, or None when the selection cannot be memoized."""
+    version = autotvm.task.memoization_version()
+    env = autotvm.task.TaskExtractEnv.current
+    if version is None or (env is not None and env.tracing):
+        # the tasks are extracted while the compute of every implementation runs
+        return None, None
+    if op.get_attr("FTVMStrategy") is None or not all(_is_static(t.shape) for t in inputs):
+        return None, None
+    out_types = out_type.fields if isinstance(out_type, _ty.TupleType) else [out_type]
+    if not all(isinstance(t, _ty.TensorType) and _is_static(t.shape) for t in out_types):
+        return None, None
+
+    dispatch_ctx = autotvm.task.DispatchContext.current
+    memo_version, memo = _selected_implementations.get(dispatch_ctx, (None, None))
+    if memo_version != version:
+        # the records of the context were updated
+        memo = {}
+        _selected_implementations[dispatch_ctx] = (version, memo)
+    return memo, _ImplementationKey(op, attrs, inputs, out_type, target, use_autotvm)
+
+
 def select_implementation(op, attrs, inputs, out_type, target, use_autotvm=True):
     """Select the best implementation from the op strategy.
 
@@ -162,6 +236,11 @@ def select_implementation(op, attrs, inputs, out_type, target, use_autotvm=True)
     If use_autotvm is False, it'll directly choose the implementation with
     highest plevel.
 
+    The selection for static shapes is memoized per AutoTVM dispatch context,
+    and made again once the records of the context are loaded or updated. Only
+    the compute of the selected implementation runs for the same operator,
+    attributes, types and target.
+
     Note that this function doesn't support op with symbolic input shapes.
 
     Parameters
@@ -189,14 +268,27 @@ def select_implementation(op, attrs, inputs, out_type, target, use_autotvm=True)
     ret : tuple(relay.op.OpImplementation, List[tvm.te.Tensor])
         The best op implementation and the corresponding output tensors.
     """
-    all_impls = get_valid_implementations(op, attrs, inputs, out_type, target)
-    best_plevel_impl = max(all_impls, key=lambda x: x.plevel)
-
     # Disable autotvm if auto_scheduler is enabled.
     # (i.e., always return the implementation with the highest priority for auto-scheduler).
     if PassContext.current().config.get("relay.backend.use_auto_scheduler", False):
         use_autotvm = False
 
+    with profile_build_step("strategy", op.name):
+        memo, key = _get_selection_memo(op, attrs, inputs, out_type, target, use_autotvm)
+        if memo is not None and key in memo:
+            impl = memo[key]
+            logger.info("Using %s for %s based on the previous selection", impl.name, op.name)
+            return impl, impl.compute(attrs, inputs, out_type)
+        impl, outs = _select_implementation(op, attrs, inputs, out_type, target, use_autotvm)
+        if memo is not None:
+            memo[key] = impl
+        return impl, outs
+
+
+def _select_implementation(op, attrs, inputs, out_type, target, use_autotvm):
+    all_impls = get_valid_implementations(op, attrs, inputs, out_type, target)
+    best_plevel_impl = max(all_impls, key=lambda x: x.plevel)
+
     # If not use autotvm, always return the implementation with the highest priority
     if not use_autotvm:
         logger.info(
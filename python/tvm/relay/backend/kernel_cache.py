@@ -0,0 +1,212 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Persistent cache and parallel generation of the kernels of relay.build.
+
+When the ``relay.backend.kernel_cache_dir`` config of the PassContext is set,
+relay.build generates the code of every kernel of an LLVM target in a module of
+its own, and saves it to the cache directory as optimized LLVM IR. Later builds,
+in any process, load the kernels already in the cache instead of generating and
+optimizing their code again, and import them into the module they return.
+
+When the ``relay.backend.num_build_workers`` config is larger than 1, the
+kernels generated separately are generated by as many threads, which run LLVM
+without holding the GIL.
+
+.. code-block:: python
+
+    config = {
+        "relay.backend.kernel_cache_dir": "/path/to/cache",
+        "relay.backend.num_build_workers": os.cpu_count(),
+    }
+    with tvm.transform.PassContext(opt_level=3, config=config):
+        lib = relay.build(mod, target="llvm", params=params)
+
+A kernel is identified by its lowered TIR function, including its name, the
+target, the options of the PassContext and the versions of TVM and LLVM.
+Kernels of other targets, and the builds for the C runtime, a system library or
+linked parameters, are generated as usual. The kernels are imported in the
+order of their names, so the library does not depend on the order in which
+they were generated.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import tvm
+from tvm import ir
+from tvm.ir.instrument import profile_build_step
+from tvm.ir.transform import PassContext
+from tvm.runtime import load_module
+from tvm.support import libinfo
+from tvm.target import Target
+
+logger = logging.getLogger("kernel_cache")
+
+KERNEL_CACHE_DIR = "relay.backend.kernel_cache_dir"
+NUM_BUILD_WORKERS = "relay.backend.num_build_workers"
+
+
+def _is_cacheable_host(target_host):
+    """Whether the kernels built for target_host can live in modules of their own."""
+    attrs = target_host.attrs
+    return (
+        target_host.kind.name == "llvm"
+        and str(attrs.get("runtime", "c++")) != "c"
+        and not attrs.get("system-lib", False)
+        and not attrs.get("link-params", False)
+    )
+
+
+def kernel_cache_key(func, target, target_host):
+    """Get the key of a kernel in the cache.
+
+    Parameters
+    ----------
+    func : tvm.tir.PrimFunc
+        The lowered function of the kernel.
+
+    target : tvm.target.Target
+        The target of the kernel.
+
+    target_host : tvm.target.Target
+        The host target.
+
+    Returns
+    -------
+    key : str
+        The hexadecimal digest identifying the kernel.
+    """
+    pass_ctx = PassContext.current()
+    config = {
+        k: str(v)
+        for k, v in pass_ctx.config.items()
+        if k not in (KERNEL_CACHE_DIR, NUM_BUILD_WORKERS)
+    }
+    description = [
+        str(target),
+        str(target_host),
+        pass_ctx.opt_level,
+        config,
+        tvm.__version__,
+        libinfo().get("LLVM_VERSION", ""),
+    ]
+    hasher = hashlib.sha256(json.dumps(description, sort_keys=True).encode("utf-8"))
+    hasher.update(ir.save_json(func).encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def _build_kernel(target, gvar, func, target_host, pass_ctx, path):
+    """Generate the code of one kernel, and save it to path when it is given."""
+    # the PassContext is per thread, the workers use a copy without the instruments
+    with profile_build_step("codegen", gvar.name_hint, function=gvar.name_hint), PassContext(
+        pass_ctx.opt_level, pass_ctx.required_pass, pass_ctx.disabled_pass, config=pass_ctx.config
+    ):
+        kernel = tvm.build({target: tvm.IRModule({gvar: func})}, target_host=target_host)
+        if path:
+            # write aside and rename, so that concurrent builds never read a partial file
+            temp_path = "%s.%d.%d.tmp" % (path, os.getpid(), threading.get_ident())
+            kernel.save(temp_path, "ll")
+            os.replace(temp_path, path)
+    return kernel
+
+
+@tvm._ffi.register_func("relay.backend.build_kernels")
+def build_kernels(lowered_funcs, target_host, cache_dir="", num_workers=1):
+    """Build the lowered functions of relay.build, one module per kernel.
+
+    Parameters
+    ----------
+    lowered_funcs : Map[tvm.target.Target, tvm.IRModule]
+        The lowered functions per target.
+
+    target_host : Optional[tvm.target.Target]
+        The host target.
+
+    cache_dir : str
+        The directory of the cache, or an empty string to build without it.
+
+    num_workers : int
+        The number of threads generating the kernels.
+
+    Returns
+    -------
+    mod : tvm.runtime.Module
+        The module of the kernels, which imports the kernels built separately.
+    """
+    inputs = {target: mod for target, mod in lowered_funcs.items() if mod is not None}
+    if target_host is None:
+        for target in inputs:
+            if target.host is not None:
+                target_host = target.host
+                break
+            if tvm.runtime.device(target.kind.name, 0).device_type == tvm.cpu(0).device_type:
+                target_host = target
+                break
+    target_host = Target(target_host if target_host is not None else "llvm")
+    if not _is_cacheable_host(target_host):
+        return tvm.build(inputs, target_host=target_host)
+
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    kernels = {}
+    misses = []
+    remaining = {}
+    for target, mod in inputs.items():
+        if target.kind.name != "llvm":
+            remaining[target] = mod
+            continue
+        for gvar, func in mod.functions.items():
+            path = ""
+            if cache_dir:
+                key = kernel_cache_key(func, target, target_host)
+                path = os.path.join(cache_dir, key + ".ll")
+                if os.path.exists(path):
+                    kernels[gvar.name_hint] = load_module(path)
+                    continue
+            misses.append((target, gvar, func, path))
+    if cache_dir:
+        logger.info("Kernel cache: %d hits, %d misses", len(kernels), len(misses))
+
+    pass_ctx = PassContext.current()
+    if misses:
+        # the first kernel also initializes LLVM before the workers start
+        target, gvar, func, path = misses[0]
+        kernels[gvar.name_hint] = _build_kernel(target, gvar, func, target_host, pass_ctx, path)
+    with ThreadPoolExecutor(max_workers=max(1, int(num_workers))) as pool:
+        futures = [
+            (
+                gvar.name_hint,
+                pool.submit(_build_kernel, target, gvar, func, target_host, pass_ctx, path),
+            )
+            for target, gvar, func, path in misses[1:]
+        ]
+        for name, future in futures:
+            kernels[name] = future.result()
+
+    kernels = [kernels[name] for name in sorted(kernels)]
+    if remaining:
+        mod = tvm.build(remaining, target_host=target_host)
+    elif kernels:
+        mod = kernels.pop(0)
+    else:
+        return tvm.build(inputs, target_host=target_host)
+    for kernel in kernels:
+        mod.import_module(kernel)
+    return mod
@@ -22,6 +22,7 @@ import warnings
 import numpy as np
 
 from tvm.ir import IRModule
+from tvm.ir.instrument import profile_build_step
 
 from tvm.ir.transform import PassContext
 from tvm.tir import expr as tvm_expr
@@ -352,7 +353,7 @@ def build(ir_mod, target=None, target_host=None, params=None, mod_name="default"
     else:
         tophub_context = autotvm.utils.EmptyContext()
 
-    with tophub_context:
+    with tophub_context, profile_build_step("build", "relay.build"):
         bld_mod = BuildModule()
         executor_config, runtime_mod, params = bld_mod.build(
             mod=ir_mod, target=target, params=params, executor=executor, mod_name=mod_name
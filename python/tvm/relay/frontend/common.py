@@ -17,7 +17,10 @@
 # pylint: disable=broad-except
 """Common utilities"""
 from __future__ import absolute_import as _abs
+import collections
+import hashlib
 import logging
+import threading
 import numpy as np
 
 import tvm
@@ -29,6 +32,7 @@ from .. import function as _function
 from .. import transform as _transform
 from .. import op as _op
 from .. import analysis
+from ..expr_functor import ExprMutator
 
 # pylint: disable=invalid-name
 logger = logging.getLogger("Common")
@@ -472,8 +476,161 @@ def get_name(node):
     return name
 
 
+# This returns a "subgraph" which puts variables whenever
+# the type is known. It also records things to map the input
+# nodes to the extracted graph's nodes.
+# As Python objects are not round-trippable through C++, and
+# our type annotations only live in Python, we need to map
+# the nodes we get in visiting to the nodes
+# we used to construct the graph (they are the same in C++,
+# match each other in dictionary lookups, but are not the same
+# in Python) by using the hint dictionary filled as
+# {node: node for node in nodes} to get the type annotations.
+# https://discuss.tvm.apache.org/t/round-tripping-objects-through-the-ffi/8440
+class _TypeFinder(ExprMutator):
+    def __init__(self, types):
+        super().__init__()
+        self.counter = 0
+        self.vars = {}
+        self.types = types
+        self.leave = set()  # some variables are not inputs
+
+    def visit_let(self, let):
+        self.leave.add(let.var)
+        return super().visit_let(let)
+
+    def visit_function(self, fn):
+        self.leave.update(fn.params)
+        return super().visit_function(fn)
+
+    def visit(self, expr):
+        if expr in self.leave:
+            return super().visit(expr)
+        if expr in self.vars:
+            return self.vars[expr]
+        if isinstance(expr, tvm.relay.Var):
+            self.vars[expr] = expr
+            return expr
+        if expr in self.types:
+            ty = self.types[expr]
+            v = tvm.relay.var(f"_{self.counter}", type_annotation=ty)
+            self.counter += 1
+            self.vars[expr] = v
+            return v
+        v = super().visit(expr)
+        return v
+
+
+class IncrementalTypeInference(object):
+    """Infer the types of the nodes built by a frontend incrementally.
+
+    Running InferType on a new node checks the whole graph upstream of it
+    again, so converters inferring the shapes of their inputs make imports
+    quadratic in the size of the model. This context remembers the types it
+    infers, and replaces the nodes of known type by variables of that type:
+    only the nodes built since are checked. It falls back to the full pass
+    when the partial one fails.
+
+    While the context is entered, :py:func:`infer_type`, :py:func:`infer_shape`
+    and :py:func:`infer_channels` use it when they are not given a module.
+
+    .. code-block:: python
+
+        with IncrementalTypeInference():
+            # convert the nodes of the model
+            ...
+    """
+
+    current = None
+
+    def __init__(self):
+        # map from nodes to their types
+        self.types = {}
+        # map from nodes to the type checked copies of their subgraphs
+        self._checked = {}
+        self.num_partial = 0
+        self.num_full = 0
+
+    def __enter__(self):
+        self._old_context = IncrementalTypeInference.current
+        IncrementalTypeInference.current = self
+        return self
+
+    def __exit__(self, ptype, value, trace):
+        IncrementalTypeInference.current = self._old_context
+
+    def infer_checked_expr(self, node, mod=None):
+        """Type check the part of the graph of a node whose types are not known.
+
+        Parameters
+        ----------
+        node : relay.Expr
+            The node to check.
+
+        mod : Optional[IRModule]
+            The module holding the global definitions used by the node.
+
+        Returns
+        -------
+        checked : relay.Expr
+            A type checked copy of the node, where the nodes of known type are
+            replaced by variables. Only its ``checked_type`` is meaningful.
+        """
+        if node in self._checked:
+            return self._checked[node]
+        tf = _TypeFinder(types=self.types)
+        new_node = tf.visit(node)
+        fn = _function.Function(list(tf.vars.values()), new_node)
+        new_mod = IRModule({"main": fn})
+        if mod is not None:
+            new_mod.update(mod)
+            new_mod = _transform.RemoveUnusedFunctions()(new_mod)
+        try:
+            checked = _transform.InferType()(new_mod)["main"].body
+            self.num_partial += 1
+        except tvm.error.TVMError:
+            logger.debug("Falling back to the full type inference of %s", node)
+            full_mod = IRModule.from_expr(node)
+            if mod is not None:
+                full_mod.update(mod)
+            checked = _transform.InferType()(full_mod)["main"].body
+            self.num_full += 1
+        self._checked[node] = checked
+        self.types[node] = checked.checked_type
+        return checked
+
+    def infer_type(self, node, mod=None):
+        """Infer the type of a node.
+
+        Parameters
+        ----------
+        node : relay.Expr
+            The node.
+
+        mod : Optional[IRModule]
+            The module holding the global definitions used by the node.
+
+        Returns
+        -------
+        ty : relay.Type
+            The type of the node.
+        """
+        if node in self.types:
+            return self.types[node]
+        if isinstance(node, tvm.relay.Var):
+            return node.type_annotation
+        return self.infer_checked_expr(node, mod).checked_type
+
+
 def infer_type(node, mod=None):
-    """A method to infer the type of an intermediate node in the relay graph."""
+    """A method to infer the type of an intermediate node in the relay graph.
+
+    Within an :py:class:`IncrementalTypeInference` context, the result only
+    has a meaningful ``checked_type`` when no module is given.
+    """
+    context = IncrementalTypeInference.current
+    if context is not None and mod is None and not isinstance(node, _function.Function):
+        return context.infer_checked_expr(node)
     if isinstance(mod, IRModule):
         mod["main"] = _function.Function(tvm.relay.analysis.free_vars(node), node)
         mod = _transform.InferType()(mod)
@@ -518,40 +675,282 @@ def infer_shape(inputs, mod=None):
     return checked_type
 
 
+def _numpy_strided_slice(data, attrs):
+    if attrs.slice_mode != "end" or attrs.begin is None or attrs.end is None:
+        return None
+    begin = [int(x) for x in attrs.begin]
+    end = [int(x) for x in attrs.end]
+    strides = [int(x) for x in attrs.strides] if attrs.strides else [1]
+    axes = [int(x) for x in attrs.axes] if attrs.axes else list(range(len(begin)))
+    if len(strides) == 1:
+        strides = strides * len(axes)
+    if any(stride <= 0 for stride in strides):
+        return None
+    slices = [slice(None)] * data.ndim
+    for axis, b, e, stride in zip(axes, begin, end, strides):
+        slices[axis] = slice(b, e, stride)
+    return data[tuple(slices)]
+
+
+def _numpy_reshape(data, attrs):
+    newshape = [int(x) for x in attrs.newshape]
+    if any(x < -1 for x in newshape):
+        return None
+    newshape = [data.shape[i] if x == 0 else x for i, x in enumerate(newshape)]
+    return data.reshape(newshape)
+
+
+def _numpy_take(data, indices, attrs):
+    if int(attrs.batch_dims) != 0:
+        return None
+    axis = None if attrs.axis is None else int(attrs.axis)
+    size = data.size if axis is None else data.shape[axis]
+    # like topi.take, "clip" clamps the negative indices to 0 and "wrap" wraps them
+    if attrs.mode == "wrap":
+        return np.take(data, indices, axis=axis, mode="wrap")
+    if attrs.mode == "fast" and np.any((indices < 0) | (indices >= size)):
+        return None
+    return np.take(data, indices, axis=axis, mode="clip")
+
+
+def _numpy_expand_dims(data, attrs):
+    axis = int(attrs.axis)
+    axis = axis + data.ndim + 1 if axis < 0 else axis
+    return data.reshape(data.shape[:axis] + (1,) * int(attrs.num_newaxis) + data.shape[axis:])
+
+
+def _numpy_reduce(func):
+    def _impl(data, attrs):
+        axis = None if attrs.axis is None else tuple(int(x) for x in attrs.axis)
+        if attrs.exclude:
+            return None
+        return np.asarray(func(data, axis=axis, keepdims=bool(attrs.keepdims))).astype(data.dtype)
+
+    return _impl
+
+
+# The operators evaluated in NumPy, to compute shapes without compiling them.
+_NUMPY_OPS = {
+    "add": lambda x, y, attrs: np.add(x, y),
+    "subtract": lambda x, y, attrs: np.subtract(x, y),
+    "multiply": lambda x, y, attrs: np.multiply(x, y),
+    "maximum": lambda x, y, attrs: np.maximum(x, y),
+    "minimum": lambda x, y, attrs: np.minimum(x, y),
+    "floor_divide": lambda x, y, attrs: np.floor_divide(x, y) if np.all(y != 0) else None,
+    "floor_mod": lambda x, y, attrs: np.mod(x, y) if np.all(y != 0) else None,
+    "equal": lambda x, y, attrs: np.equal(x, y),
+    "negative": lambda x, attrs: np.negative(x),
+    "cast": lambda x, attrs: x.astype(str(attrs.dtype)),
+    "expand_dims": _numpy_expand_dims,
+    "squeeze": lambda x, attrs: np.squeeze(
+        x, axis=None if attrs.axis is None else tuple(int(a) for a in attrs.axis)
+    ),
+    "reshape": _numpy_reshape,
+    "concatenate": lambda xs, attrs: np.concatenate(xs, axis=int(attrs.axis)),
+    "take": _numpy_take,
+    "strided_slice": _numpy_strided_slice,
+    "prod": _numpy_reduce(np.prod),
+    "sum": _numpy_reduce(np.sum),
+}
+
+
+class _NumpyEvaluator(object):
+    """Evaluate small shape computations in NumPy, or return None when it cannot."""
+
+    max_elements = 4096
+
+    def __init__(self, params):
+        self.params = params
+        self.memo = {}
+
+    def evaluate(self, expr):
+        if expr in self.memo:
+            return self.memo[expr]
+        value = self._evaluate(expr)
+        if value is not None and value.size > self.max_elements:
+            value = None
+        self.memo[expr] = value
+        return value
+
+    def _evaluate(self, expr):
+        if isinstance(expr, _expr.Constant):
+            if np.prod(expr.data.shape, dtype="int64") > self.max_elements:
+                return None
+            return expr.data.numpy()
+        if isinstance(expr, _expr.Var):
+            value = self.params.get(expr.name_hint)
+            if value is None or np.prod(value.shape, dtype="int64") > self.max_elements:
+                return None
+            return value.numpy() if isinstance(value, tvm.nd.NDArray) else np.asarray(value)
+        if not isinstance(expr, _expr.Call) or not isinstance(expr.op, tvm.ir.Op):
+            return None
+        name = expr.op.name
+        if name == "shape_of":
+            checked_type = infer_type(expr.args[0]).checked_type
+            if not isinstance(checked_type, tvm.ir.TensorType):
+                return None
+            if not all(isinstance(dim, tvm.tir.IntImm) for dim in checked_type.shape):
+                return None
+            return np.array([int(dim) for dim in checked_type.shape], dtype=expr.attrs.dtype)
+        if name not in _NUMPY_OPS:
+            return None
+        args = []
+        for arg in expr.args:
+            if isinstance(arg, _expr.Tuple):
+                fields = [self.evaluate(field) for field in arg.fields]
+                if any(field is None for field in fields):
+                    return None
+                args.append(fields)
+            else:
+                value = self.evaluate(arg)
+                if value is None:
+                    return None
+                args.append(value)
+        value = _NUMPY_OPS[name](*args, expr.attrs)
+        return None if value is None else np.asarray(value)
+
+
+class _ConstantEvaluator(object):
+    """Evaluate the expressions of frontends whose inputs are all known.
+
+    The results are memoized by the structure of the expression and the
+    values of its inputs. Small shape computations are evaluated in NumPy;
+    the others are compiled with their inputs left as inputs of the graph,
+    so that the modules can be reused for the expressions of the same
+    structure with other values.
+    """
+
+    def __init__(self, max_cached_bytes=1 << 26, max_modules=64):
+        self.max_cached_bytes = max_cached_bytes
+        self.max_modules = max_modules
+        self._values = collections.OrderedDict()
+        self._cached_bytes = 0
+        self._modules = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(value):
+        if isinstance(value, tvm.nd.NDArray):
+            value = value.numpy()
+        value = np.ascontiguousarray(value)
+        digest = hashlib.sha1(value.reshape(-1).view("uint8").data)
+        return (str(value.dtype), value.shape, digest.hexdigest())
+
+    @staticmethod
+    def _lookup(cache, key, expr):
+        for cached_expr, value in cache.get(key, []):
+            if tvm.ir.structural_equal(expr, cached_expr, map_free_vars=True):
+                cache.move_to_end(key)
+                return value
+        return None
+
+    def _insert_value(self, key, expr, value):
+        nbytes = value.numpy().nbytes
+        if nbytes > self.max_cached_bytes:
+            return
+        self._values.setdefault(key, []).append((expr, value))
+        self._values.move_to_end(key)
+        self._cached_bytes += nbytes
+        while self._cached_bytes > self.max_cached_bytes:
+            _, entries = self._values.popitem(last=False)
+            for _, evicted in entries:
+                self._cached_bytes -= evicted.numpy().nbytes
+
+    def _run_module(self, func, free_vars, params):
+        # pylint: disable=import-outside-toplevel
+        from tvm.contrib import graph_executor
+
+        key = tvm.ir.structural_hash(func, map_free_vars=True)
+        with self._lock:
+            m = self._lookup(self._modules, key, func)
+        if m is None:
+            if tvm.relay.ty.is_dynamic(infer_type(func).checked_type.ret_type):
+                raise ValueError("The graph executor cannot run dynamic shapes")
+            with tvm.transform.PassContext(opt_level=0):
+                lib = tvm.relay.build(func, target="llvm")
+            m = graph_executor.GraphModule(lib["default"](tvm.cpu(0)))
+            with self._lock:
+                self._modules.setdefault(key, []).append((func, m))
+                if len(self._modules) > self.max_modules:
+                    self._modules.popitem(last=False)
+        with self._lock:
+            # the inputs are the free variables, in order
+            for i, var in enumerate(free_vars):
+                m.set_input(i, params[var.name_hint])
+            m.run()
+            return m.get_output(0).copyto(tvm.cpu(0))
+
+    def evaluate(self, input_val, params, mod=None):
+        """Evaluate an expression, see :py:func:`infer_value`."""
+        free_vars = analysis.free_vars(input_val)
+        key = (
+            tvm.ir.structural_hash(input_val, map_free_vars=True),
+            tuple(self._digest(params[var.name_hint]) for var in free_vars),
+        )
+        with self._lock:
+            value = self._lookup(self._values, key, input_val)
+        if value is not None:
+            return value
+
+        value = _NumpyEvaluator(params).evaluate(input_val)
+        if value is not None:
+            value = tvm.nd.array(value)
+        else:
+            value = self._compile_and_run(input_val, free_vars, params, mod)
+        if isinstance(value, tvm.nd.NDArray):
+            with self._lock:
+                self._insert_value(key, input_val, value)
+        return value
+
+    def _compile_and_run(self, input_val, free_vars, params, mod):
+        func = _function.Function(free_vars, input_val)
+        try:
+            return self._run_module(func, free_vars, params)
+        except Exception:
+            pass
+        try:
+            # pylint: disable=import-outside-toplevel
+            from tvm.contrib import graph_executor
+
+            # binding the values makes the shapes depending on them static
+            with tvm.transform.PassContext(opt_level=0):
+                lib = tvm.relay.build(func, target="llvm", params=params)
+            m = graph_executor.GraphModule(lib["default"](tvm.cpu(0)))
+            m.run()
+            return m.get_output(0)
+        except Exception:
+            if isinstance(mod, IRModule):
+                mod["main"] = _function.Function(analysis.free_vars(input_val), input_val)
+            else:
+                mod = IRModule.from_expr(input_val)
+            inputs = []
+            for param in mod["main"].params:
+                inputs.append(params[param.name_hint])
+            result = tvm.relay.create_executor(
+                "debug", mod=mod, device=tvm.cpu(), target="llvm"
+            ).evaluate()(*inputs)
+            return result
+
+
+_CONSTANT_EVALUATOR = _ConstantEvaluator()
+
+
 def infer_value(input_val, params, mod=None):
     """A hack for getting the value of an expression by evaluating a
     portion of the relay graph. This is often needed for functions that
     whose output shape depends on the value of a tensor.
+
+    The values are memoized by the structure of the expression and the values
+    of its inputs. Small shape computations are evaluated in NumPy without
+    compiling them, and the compiled modules are reused for the expressions of
+    the same structure.
     """
     # Check that all free variables have associated parameters.
     assert all(
         var.name_hint in params.keys() for var in analysis.free_vars(input_val)
     ), "All inputs to infer must be available in params."
     assert tvm.runtime.enabled("llvm"), "LLVM must be enabled to infer value."
-    try:
-        # TODO(kevinthesun): Use VM for all cases.
-        # pylint: disable=import-outside-toplevel
-        from tvm.contrib import graph_executor
-
-        func = _function.Function(analysis.free_vars(input_val), input_val)
-        with tvm.transform.PassContext(opt_level=0):
-            lib = tvm.relay.build(func, target="llvm", params=params)
-        dev = tvm.cpu(0)
-        m = graph_executor.GraphModule(lib["default"](dev))
-        m.run()
-        return m.get_output(0)
-    except Exception:
-        if isinstance(mod, IRModule):
-            mod["main"] = _function.Function(analysis.free_vars(input_val), input_val)
-        else:
-            mod = IRModule.from_expr(input_val)
-        inputs = []
-        for param in mod["main"].params:
-            inputs.append(params[param.name_hint])
-        result = tvm.relay.create_executor(
-            "debug", mod=mod, device=tvm.cpu(), target="llvm"
-        ).evaluate()(*inputs)
-        return result
+    return _CONSTANT_EVALUATOR.evaluate(input_val, params, mod)
 
 
 def infer_value_simulated(input_val, params):
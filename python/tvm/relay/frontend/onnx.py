@@ -18,6 +18,7 @@
 # pylint: disable=import-outside-toplevel
 """ONNX: Open Neural Network Exchange frontend for Relay."""
 import copy
+import os
 import warnings
 
 import numpy as np
@@ -38,6 +39,7 @@ from .. import ty as _ty
 from .. import vision as _vision
 from .common import (
     AttrCvt,
+    IncrementalTypeInference,
     Renamer,
     fold_constant,
     get_name,
@@ -61,6 +63,9 @@ ONNX_DEFAULT_CONFIGS = {
     # Note that `nn.batch_matmul` with format other than NT is in experimental, it may have some
     # performance issues.
     "use_nt_batch_matmul": True,
+    # By default, TVM converts the repeated blocks of a graph, such as the layers of a transformer,
+    # once and instantiates the other copies by substitution.
+    "deduplicate_repeated_blocks": True,
 }
 
 
@@ -85,6 +90,50 @@ def get_numpy(tensor_proto):
     return to_array(tensor_proto)
 
 
+# TensorProto.EXTERNAL, the data of the tensor is stored in another file.
+_ONNX_EXTERNAL_DATA_LOCATION = 1
+
+
+def load_external_data(tensor_proto, base_dir=""):
+    """Load the data of a TensorProto stored in an external file.
+
+    The data is mapped from the file copy-on-write, and the returned array
+    shares the mapped pages when it can be aligned like a TVM allocation.
+    Otherwise it is copied from the mapping, without reading the file into an
+    intermediate buffer.
+
+    Parameters
+    ----------
+    tensor_proto : onnx.TensorProto
+        The tensor, with data_location set to EXTERNAL.
+
+    base_dir : str
+        The directory the location of the data is relative to.
+
+    Returns
+    -------
+    array : tvm.nd.NDArray
+        The tensor data.
+    """
+    info = {entry.key: entry.value for entry in tensor_proto.external_data}
+    path = os.path.join(base_dir, info["location"])
+    dtype = np.dtype(get_type(tensor_proto.data_type)).newbyteorder("<")
+    shape = tuple(tensor_proto.dims)
+    offset = int(info.get("offset", 0))
+    size = int(np.prod(shape, dtype="int64"))
+    if "length" in info and int(info["length"]) < size * dtype.itemsize:
+        raise ValueError(
+            "External data of %s holds %s bytes, expected %d"
+            % (tensor_proto.name, info["length"], size * dtype.itemsize)
+        )
+    if size == 0 or not shape or not dtype.isnative:
+        array = np.fromfile(path, dtype=dtype, count=size, offset=offset)
+        return _nd.array(array.astype(dtype.newbyteorder("=")).reshape(shape))
+    array = np.memmap(path, dtype=dtype, mode="c", offset=offset, shape=shape)
+    view = _nd.zero_copy_view(array, container=True)
+    return view if view is not None else _nd.array(array)
+
+
 def get_type(elem_type):
     """Converts onnx integer datatype to numpy datatype"""
     try:
@@ -2805,7 +2854,10 @@ class Loop(OnnxOpConverter):
         # Get the current graph proto and create a clone for the subgraph
         graph_scope = GraphProto.current
         subgraph_scope = GraphProto(
-            graph_scope._shape, graph_scope._dtype, graph_scope._freeze_params
+            graph_scope._shape,
+            graph_scope._dtype,
+            graph_scope._freeze_params,
+            graph_scope._external_data_dir,
         )
         # Load nodes from outer graph into inner graph.
         subgraph_scope._nodes = graph_scope._nodes.copy()
@@ -2964,9 +3016,19 @@ class If(OnnxOpConverter):
 
         # Create graph converters for both branches.
         graph_scope = GraphProto.current
-        then_graph = GraphProto(graph_scope._shape, graph_scope._dtype, graph_scope._freeze_params)
+        then_graph = GraphProto(
+            graph_scope._shape,
+            graph_scope._dtype,
+            graph_scope._freeze_params,
+            graph_scope._external_data_dir,
+        )
         then_graph._nodes = graph_scope._nodes.copy()
-        else_graph = GraphProto(graph_scope._shape, graph_scope._dtype, graph_scope._freeze_params)
+        else_graph = GraphProto(
+            graph_scope._shape,
+            graph_scope._dtype,
+            graph_scope._freeze_params,
+            graph_scope._external_data_dir,
+        )
         else_graph._nodes = graph_scope._nodes.copy()
 
         # Convert each branch to a relay expression.
@@ -3769,6 +3831,98 @@ def _get_convert_map(opset):
     }
 
 
+# The smallest and most numerous kinds of repeated blocks looked for in a graph.
+_MIN_REPEATED_BLOCK_NODES = 8
+_MAX_REPEATED_BLOCK_PERIODS = 16
+
+
+def _find_repeated_blocks(graph):
+    """Find the runs of structurally identical blocks of nodes in an ONNX graph.
+
+    Every node gets a signature made of its op, attributes and inputs, where an
+    input produced by another node is identified by its distance to that node.
+    The nodes of consecutive copies of a block, such as the layers of a
+    transformer, then have the same signatures with a period of the size of the
+    block, whatever the names of their tensors.
+
+    Parameters
+    ----------
+    graph : onnx.GraphProto
+        The graph to look into.
+
+    Returns
+    -------
+    repeats : dict of int to tuple of int
+        Maps the index of the first node of a run to the number of nodes of its
+        blocks and the number of blocks. The runs do not overlap.
+    """
+    producers = {}
+    for index, node in enumerate(graph.node):
+        for slot, name in enumerate(node.output):
+            producers[name] = (index, slot)
+    initializers = {t.name: (t.data_type, tuple(t.dims)) for t in graph.initializer}
+
+    ids = {}
+    signatures = []
+    for index, node in enumerate(graph.node):
+        if any(a.HasField("g") or len(a.graphs) for a in node.attribute):
+            # subgraphs capture the tensors of the outer scope by name
+            signature = ("subgraph", index)
+        else:
+            inputs = []
+            for name in node.input:
+                if name in producers:
+                    producer, slot = producers[name]
+                    inputs.append(("node", index - producer, slot))
+                elif name in initializers:
+                    inputs.append(("init",) + initializers[name])
+                else:
+                    inputs.append(("input", name))
+            signature = (
+                node.op_type,
+                node.domain,
+                tuple(a.SerializeToString() for a in node.attribute),
+                tuple(inputs),
+                tuple(name == "" for name in node.output),
+            )
+        signatures.append(ids.setdefault(signature, len(ids)))
+
+    # the periods are among the distances between nodes with the same signature
+    last = {}
+    gaps = {}
+    for index, sig in enumerate(signatures):
+        if sig in last and index - last[sig] >= _MIN_REPEATED_BLOCK_NODES:
+            gap = index - last[sig]
+            gaps[gap] = gaps.get(gap, 0) + 1
+        last[sig] = index
+    periods = sorted(gaps, key=lambda gap: (-gaps[gap], gap))[:_MAX_REPEATED_BLOCK_PERIODS]
+
+    candidates = []
+    num_nodes = len(signatures)
+    for period in periods:
+        start = 0
+        while start < num_nodes - period:
+            if signatures[start] != signatures[start + period]:
+                start += 1
+                continue
+            end = start
+            while end < num_nodes - period and signatures[end] == signatures[end + period]:
+                end += 1
+            count = (end - start + period) // period
+            if count > 1:
+                candidates.append(((count - 1) * period, start, period, count))
+            start = end
+
+    repeats = {}
+    covered = []
+    for _, start, period, count in sorted(candidates, key=lambda c: (-c[0], c[1])):
+        end = start + period * count
+        if all(end <= begin or start >= finish for begin, finish in covered):
+            covered.append((start, end))
+            repeats[start] = (period, count)
+    return repeats
+
+
 class GraphProto:
     """A helper class for handling Relay expression copying from pb2.GraphProto.
     Definition: https://github.com/onnx/onnx/blob/master/onnx/onnx.proto
@@ -3788,11 +3942,13 @@ class GraphProto:
         at compile time and helps in making models static if certain inputs represent
         attributes relay would traditionally consider compile-time constants.
 
+    external_data_dir : str
+        The directory the external data of the initializers is relative to.
     """
 
     current = None
 
-    def __init__(self, shape, dtype, freeze_params=False):
+    def __init__(self, shape, dtype, freeze_params=False, external_data_dir=""):
         self._nodes = {}
         self._params = {}
         self._inputs = {}
@@ -3804,6 +3960,7 @@ class GraphProto:
         self._dtype = dtype
         self.opset = None
         self._freeze_params = freeze_params
+        self._external_data_dir = external_data_dir
 
     def __enter__(self):
         self._old_manager = GraphProto.current
@@ -3922,70 +4079,30 @@ class GraphProto:
             msg += ", ".join(unsupported_ops)
             raise tvm.error.OpNotImplemented(msg)
         # construct nodes, nodes are stored as directed acyclic graph
-        for node in graph.node:
-            op_name = node.op_type
-            attr = self._parse_attr(node.attribute)
-            # Create and populate input list.
-            inputs = onnx_input()
-            for i in node.input:
-                if i != "":
-                    inputs.append(self._nodes[self._renames.get(i, i)])
-                else:
-                    inputs.append(None)
-            i_name = self._parse_value_proto(node)
-            node_output = self._fix_outputs(op_name, node.output)
-            attr["tvm_custom"] = {}
-            attr["tvm_custom"]["name"] = i_name
-            attr["tvm_custom"]["num_outputs"] = len(node_output)
-
-            op = self._convert_operator(op_name, inputs, attr, opset)
-            if not isinstance(op, _expr.TupleWrapper):
-                outputs_num = 1
+        nodes = list(graph.node)
+        repeats = {}
+        if ONNX_DEFAULT_CONFIGS["deduplicate_repeated_blocks"]:
+            repeats = _find_repeated_blocks(graph)
+        used_after = {}
+        for index, node in enumerate(nodes):
+            for name in node.input:
+                used_after[name] = index
+        for output in graph.output:
+            used_after[output.name] = len(nodes)
+        if any(a.HasField("g") or len(a.graphs) for node in nodes for a in node.attribute):
+            # subgraphs use the tensors of the outer scope by name
+            for node in nodes:
+                for name in node.output:
+                    used_after[name] = len(nodes)
+        index = 0
+        while index < len(nodes):
+            if index in repeats:
+                period, count = repeats[index]
+                self._convert_repeated_blocks(nodes, index, period, count, used_after, opset)
+                index += period * count
             else:
-                outputs_num = len(op)
-
-            if outputs_num == 1:
-                op = fold_constant(op)
-            else:
-                op = _expr.TupleWrapper(fold_constant(op.astuple()), len(op))
-
-            if outputs_num > 1:
-                # ONNX supports optional outputs for some nodes.
-                # This block searches for missing outputs in the ONNX graph
-                # and removes any unneeded ops
-                valid_outputs = [False] * outputs_num
-                for i, output in enumerate(node_output):
-                    if output != "":
-                        valid_outputs[i] = True
-                # If we have outputs ONNX isn't expecting, we need to drop them
-                if not all(valid_outputs):
-                    tup = op.astuple()
-                    # TupleWrapper can also wrap ops with TupleType outputs
-                    if isinstance(tup, _expr.Tuple):
-                        # For tuples, we extract the fields instead of using GetTupleItem
-                        outputs = [tup.fields[i] for i, valid in enumerate(valid_outputs) if valid]
-                    else:
-                        # For call nodes, we need to GetTupleItem
-                        outputs = [op[i] for i, valid in enumerate(valid_outputs) if valid]
-                    # Create the new op with valid outputs
-                    if len(outputs) == 1:
-                        op = outputs[0]
-                    elif len(outputs) != outputs_num:
-                        op = _expr.TupleWrapper(_expr.Tuple(outputs), len(outputs))
-                    # Drop invalid outputs for the onnx node
-                    outputs_num = len(outputs)
-                    node_output = [output for output in node_output if output != ""]
-            assert (
-                len(node_output) == outputs_num
-            ), "Number of output mismatch {} vs {} in {}.".format(
-                len(node_output), outputs_num, op_name
-            )
-
-            if outputs_num == 1:
-                self._nodes[node_output[0]] = op
-            else:
-                for k, i in zip(list(node_output), range(len(node_output))):
-                    self._nodes[k] = op[i]
+                self._convert_node(nodes[index], opset)
+                index += 1
 
         # now return the outputs
         outputs = [self._nodes[self._parse_value_proto(i)] for i in graph.output]
@@ -4005,6 +4122,209 @@ class GraphProto:
         func = _function.Function([v for k, v in self._inputs.items()], outputs)
         return IRModule.from_expr(func), self._params
 
+    def _convert_repeated_blocks(self, nodes, start, period, count, used_after, opset):
+        """Convert consecutive copies of a block of nodes.
+
+        The first block is converted with its inputs replaced by placeholder
+        variables, and every copy is instantiated by binding the placeholders to
+        its own inputs. The inputs that converters may read the value of, i.e.
+        the small or integer constants and parameters, are kept as is, and a
+        copy using different values is converted node by node. The copies bound
+        to frozen parameters are folded.
+        """
+        block = nodes[start : start + period]
+        internal = set(name for node in block for name in node.output)
+        external = []
+        for node in block:
+            for name in node.input:
+                name = self._renames.get(name, name)
+                if name and name not in internal:
+                    external.append(name)
+        external = list(dict.fromkeys(external))
+        # the outputs of the block used after any of its copies, e.g. by the next
+        # copy, or a graph output taken from the middle of the last copy
+        outputs = []
+        for offset, node in enumerate(block):
+            for slot in range(len(self._fix_outputs(node.op_type, node.output))):
+                for first in range(start, start + period * count, period):
+                    copy_node = nodes[first + offset]
+                    name = self._fix_outputs(copy_node.op_type, copy_node.output)[slot]
+                    if name and used_after.get(name, -1) >= first + period:
+                        outputs.append((offset, slot))
+                        break
+
+        template = None
+        placeholders = {}
+        saved = {name: self._nodes[name] for name in external}
+        saved_state = (dict(self._params), dict(self._inputs), dict(self._renames))
+        try:
+            for name in external:
+                if not self._is_kept_block_input(saved[name]):
+                    placeholders[name] = new_var(
+                        "block_input_%d" % len(placeholders),
+                        type_annotation=infer_type(saved[name]).checked_type,
+                    )
+            self._nodes.update(placeholders)
+            for node in block:
+                self._convert_node(node, opset)
+            template = _expr.Tuple(
+                [
+                    self._nodes[
+                        self._fix_outputs(block[offset].op_type, block[offset].output)[slot]
+                    ]
+                    for offset, slot in outputs
+                ]
+            )
+        except (tvm.error.TVMError, ValueError, AssertionError, NotImplementedError):
+            # the block cannot be converted apart from its inputs, e.g. a converter
+            # needs the value of a placeholder
+            template = None
+            for state, backup in zip((self._params, self._inputs, self._renames), saved_state):
+                state.clear()
+                state.update(backup)
+        finally:
+            for name in internal:
+                self._nodes.pop(name, None)
+            self._nodes.update(saved)
+
+        for copy_index in range(count):
+            first = start + copy_index * period
+            copy_nodes = nodes[first : first + period]
+            binds = self._bind_block_inputs(block, copy_nodes, external, placeholders)
+            if template is None or binds is None:
+                for node in copy_nodes:
+                    self._convert_node(node, opset)
+                continue
+            instance = _expr.bind(template, binds) if binds else template
+            if any(isinstance(value, _expr.Constant) for value in binds.values()):
+                # fold the frozen parameters into the copy, like fold_constant does on
+                # each node of the node by node conversion
+                instance = fold_constant(instance)
+            for field, (offset, slot) in zip(instance.fields, outputs):
+                node = copy_nodes[offset]
+                self._nodes[self._fix_outputs(node.op_type, node.output)[slot]] = field
+
+    def _is_kept_block_input(self, value):
+        """Whether an input of a repeated block is shared by its copies instead of bound."""
+        if not isinstance(value, _expr.RelayExpr):
+            return False
+        if isinstance(value, _expr.Var) and value.name_hint not in self._params:
+            return value.name_hint in self._inputs
+        if isinstance(value, _expr.Constant):
+            array = value.data
+        elif isinstance(value, _expr.Var):
+            array = self._params[value.name_hint]
+        else:
+            return False
+        dtype = np.dtype(array.dtype)
+        return dtype.kind in "biu" or int(np.prod(array.shape)) <= 16
+
+    def _bind_block_inputs(self, block, copy_nodes, external, placeholders):
+        """Map the placeholders of a block to the inputs of one of its copies.
+
+        Returns None when the copy cannot be instantiated from the block.
+        """
+        names = {}
+        external_names = set(external)
+        for node, copy_node in zip(block, copy_nodes):
+            for name, copy_name in zip(node.input, copy_node.input):
+                name = self._renames.get(name, name)
+                if name in external_names:
+                    copy_name = self._renames.get(copy_name, copy_name)
+                    if names.setdefault(name, copy_name) != copy_name:
+                        return None
+        binds = {}
+        for name in external:
+            value = self._nodes[names[name]]
+            if name in placeholders:
+                if not isinstance(value, _expr.RelayExpr):
+                    return None
+                binds[placeholders[name]] = value
+            elif not self._same_block_input(self._nodes[name], value):
+                return None
+        return binds
+
+    def _same_block_input(self, lhs, rhs):
+        """Whether two kept inputs of copies of a block have the same value."""
+        if lhs.same_as(rhs):
+            return True
+        if isinstance(lhs, _expr.Constant) and isinstance(rhs, _expr.Constant):
+            return tvm.ir.structural_equal(lhs, rhs)
+        if (
+            isinstance(lhs, _expr.Var)
+            and isinstance(rhs, _expr.Var)
+            and lhs.name_hint in self._params
+            and rhs.name_hint in self._params
+        ):
+            lhs = self._params[lhs.name_hint].numpy()
+            rhs = self._params[rhs.name_hint].numpy()
+            return lhs.dtype == rhs.dtype and np.array_equal(lhs, rhs)
+        return False
+
+    def _convert_node(self, node, opset):
+        """Convert an ONNX node and record the expressions of its outputs."""
+        op_name = node.op_type
+        attr = self._parse_attr(node.attribute)
+        # Create and populate input list.
+        inputs = onnx_input()
+        for i in node.input:
+            if i != "":
+                inputs.append(self._nodes[self._renames.get(i, i)])
+            else:
+                inputs.append(None)
+        i_name = self._parse_value_proto(node)
+        node_output = self._fix_outputs(op_name, node.output)
+        attr["tvm_custom"] = {}
+        attr["tvm_custom"]["name"] = i_name
+        attr["tvm_custom"]["num_outputs"] = len(node_output)
+
+        op = self._convert_operator(op_name, inputs, attr, opset)
+        if not isinstance(op, _expr.TupleWrapper):
+            outputs_num = 1
+        else:
+            outputs_num = len(op)
+
+        if outputs_num == 1:
+            op = fold_constant(op)
+        else:
+            op = _expr.TupleWrapper(fold_constant(op.astuple()), len(op))
+
+        if outputs_num > 1:
+            # ONNX supports optional outputs for some nodes.
+            # This block searches for missing outputs in the ONNX graph
+            # and removes any unneeded ops
+            valid_outputs = [False] * outputs_num
+            for i, output in enumerate(node_output):
+                if output != "":
+                    valid_outputs[i] = True
+            # If we have outputs ONNX isn't expecting, we need to drop them
+            if not all(valid_outputs):
+                tup = op.astuple()
+                # TupleWrapper can also wrap ops with TupleType outputs
+                if isinstance(tup, _expr.Tuple):
+                    # For tuples, we extract the fields instead of using GetTupleItem
+                    outputs = [tup.fields[i] for i, valid in enumerate(valid_outputs) if valid]
+                else:
+                    # For call nodes, we need to GetTupleItem
+                    outputs = [op[i] for i, valid in enumerate(valid_outputs) if valid]
+                # Create the new op with valid outputs
+                if len(outputs) == 1:
+                    op = outputs[0]
+                elif len(outputs) != outputs_num:
+                    op = _expr.TupleWrapper(_expr.Tuple(outputs), len(outputs))
+                # Drop invalid outputs for the onnx node
+                outputs_num = len(outputs)
+                node_output = [output for output in node_output if output != ""]
+        assert len(node_output) == outputs_num, "Number of output mismatch {} vs {} in {}.".format(
+            len(node_output), outputs_num, op_name
+        )
+
+        if outputs_num == 1:
+            self._nodes[node_output[0]] = op
+        else:
+            for k, i in zip(list(node_output), range(len(node_output))):
+                self._nodes[k] = op[i]
+
     def _parse_value_proto(self, value_proto):
         """Parse ValueProto or raw str."""
         try:
@@ -4014,6 +4334,8 @@ class GraphProto:
         return name
 
     def _parse_array(self, tensor_proto):
+        if getattr(tensor_proto, "data_location", 0) == _ONNX_EXTERNAL_DATA_LOCATION:
+            return load_external_data(tensor_proto, self._external_data_dir)
         np_array = get_numpy(tensor_proto).reshape(tuple(tensor_proto.dims))
         return _nd.array(np_array)
 
@@ -4085,7 +4407,13 @@ class GraphProto:
 
 
 def from_onnx(
-    model, shape=None, dtype="float32", opset=None, freeze_params=False, convert_config=None
+    model,
+    shape=None,
+    dtype="float32",
+    opset=None,
+    freeze_params=False,
+    convert_config=None,
+    external_data_dir=None,
 ):
     """Convert a ONNX model into an equivalent Relay Function.
 
@@ -4103,10 +4431,15 @@ def from_onnx(
     dynamic shapes, please file an issue on discuss.tvm.apache.org
     if you hit an error with dynamic kernels.
 
+    The weights stored as external data are mapped from their files instead of
+    being read into memory: load the model with ``load_external_data=False``,
+    or pass its path, so that the peak memory of the import stays close to the
+    size of the model.
+
     Parameters
     ----------
-    model : protobuf object
-        ONNX ModelProto after ONNX v1.1.0
+    model : protobuf object or str
+        ONNX ModelProto after ONNX v1.1.0, or the path of the model file.
 
     shape : dict of str to tuple, optional
         The input shape to the graph
@@ -4130,6 +4463,14 @@ def from_onnx(
             use_nt_batch_matmul : bool = True
                 True to convert qualified onnx `matmul` to `nn.batch_matmul` strict to NT format
                 (transpose_a=False, transpose_b=True).
+            deduplicate_repeated_blocks : bool = True
+                True to convert the structurally identical blocks of consecutive nodes once,
+                and to instantiate their other copies by substitution.
+
+    external_data_dir : Optional[str]
+        The directory the external data of the model is relative to. Defaults
+        to the directory of the model when its path is given, and to the
+        current directory otherwise.
 
     Returns
     -------
@@ -4143,6 +4484,14 @@ def from_onnx(
     if convert_config is not None:
         ONNX_DEFAULT_CONFIGS.update(convert_config)
 
+    if isinstance(model, (str, os.PathLike)):
+        import onnx
+
+        if external_data_dir is None:
+            external_data_dir = os.path.dirname(os.path.abspath(model))
+        # the external data is mapped while converting the initializers
+        model = onnx.load(model, load_external_data=False)
+
     try:
         import onnx
 
@@ -4155,7 +4504,7 @@ def from_onnx(
                 warnings.warn(str(e))
     except ImportError:
         pass
-    g = GraphProto(shape, dtype, freeze_params)
+    g = GraphProto(shape, dtype, freeze_params, external_data_dir or "")
     graph = model.graph
 
     try:
@@ -4173,6 +4522,6 @@ def from_onnx(
         )
 
     # Use the graph proto as a scope so that ops can access other nodes if needed.
-    with g:
+    with g, IncrementalTypeInference():
         mod, params = g.from_onnx(graph, opset)
     return mod, params
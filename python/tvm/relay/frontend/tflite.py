@@ -18,6 +18,9 @@
 """Tensorflow lite frontend."""
 import math
 import itertools
+import mmap
+import os
+
 import numpy as np
 import tvm
 from tvm.ir import IRModule
@@ -3690,13 +3693,45 @@ def _input_type(model):
     return shape_dict, dtype_dict
 
 
+def load_tflite_model(path):
+    """Load a tflite model from a file, without reading the file into memory.
+
+    The file is mapped copy-on-write, and the model reads its tensors from the
+    mapping. :py:func:`from_tflite` shares the mapped buffers of such a model
+    with its params when they are aligned like a TVM allocation.
+
+    Parameters
+    ----------
+    path : str
+        The path of the .tflite file.
+
+    Returns
+    -------
+    model : tflite.Model or tflite.Model.Model
+        The model, depending on the tflite version.
+    """
+    try:
+        import tflite.Model as tflite_model
+    except ImportError:
+        raise ImportError("The tflite package must be installed")
+
+    with open(path, "rb") as model_file:
+        buf = mmap.mmap(model_file.fileno(), 0, access=mmap.ACCESS_COPY)
+    # tflite.Model.Model is tflite.Model in 1.14 and 2.1.0
+    try:
+        return tflite_model.Model.GetRootAsModel(buf, 0)
+    except AttributeError:
+        return tflite_model.GetRootAsModel(buf, 0)
+
+
 def from_tflite(model, shape_dict=None, dtype_dict=None):
     """Convert from tflite model into compatible relay Function.
 
     Parameters
     ----------
     model:
-        tflite.Model or tflite.Model.Model (depending on tflite version)
+        tflite.Model or tflite.Model.Model (depending on tflite version), or the
+        path of a .tflite file, which is loaded with :py:func:`load_tflite_model`.
 
     shape_dict : dict of str to int list/tuple
         Input shapes of the model.
@@ -3718,6 +3753,9 @@ def from_tflite(model, shape_dict=None, dtype_dict=None):
     except ImportError:
         raise ImportError("The tflite package must be installed")
 
+    if isinstance(model, (str, os.PathLike)):
+        model = load_tflite_model(model)
+
     # TFLite.Model.Model has changed to TFLite.Model from 1.14 to 2.1
     try:
         import tflite
@@ -3755,7 +3793,13 @@ def from_tflite(model, shape_dict=None, dtype_dict=None):
     op_converter.convert_op_to_relay()
 
     # params and outputs
-    params = {k: _nd.array(np.array(v)) for k, v in exp_tab.params.items()}
+    # the tensors of a mapped model can be shared, the mapping is private to it
+    mapped = isinstance(model._tab.Bytes, mmap.mmap)  # pylint: disable=protected-access
+    params = {}
+    for name, value in exp_tab.params.items():
+        value = np.asarray(value)
+        view = _nd.zero_copy_view(value, container=True) if mapped else None
+        params[name] = view if view is not None else _nd.array(value)
     outputs = [exp_tab.get_expr(get_tensor_name(subgraph, i)) for i in model_outputs]
     outputs = outputs[0] if len(outputs) == 1 else _expr.Tuple(outputs)
     func = _function.Function(analysis.free_vars(outputs), outputs)
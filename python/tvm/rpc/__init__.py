@@ -25,7 +25,7 @@ The test program compiles the program on local server,
 upload and run remote RPC server, get the result back to verify correctness.
 """
 
-from .server import Server
+from .server import Server, SessionSlot
 from .client import connect, connect_tracker
 from .client import RPCSession, LocalSession, PopenSession, TrackerSession
 from .minrpc import with_minrpc
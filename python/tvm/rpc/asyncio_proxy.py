@@ -0,0 +1,497 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Asyncio based RPC proxy.
+
+Same protocol as :py:mod:`tvm.rpc.proxy`, both client and server connect to
+the proxy and the proxy forwards the bytes once a matching pair is found.
+This implementation runs on a plain ``asyncio`` event loop and only
+supports TCP peers; use :py:class:`tvm.rpc.proxy.Proxy` for websocket
+(browser) servers.
+"""
+import asyncio
+import errno
+import logging
+import socket
+import struct
+import threading
+import time
+
+from tvm.contrib.popen_pool import PopenWorker
+
+from . import base
+from .asyncio_util import READ_CHUNK_SIZE, open_tracker_connection, pack_json, read_json
+from .base import TrackerCode
+from .._ffi.base import py_str
+
+logger = logging.getLogger("RPCProxy")
+
+
+class ForwardConnection(object):
+    """A TCP peer of the proxy, either a client or a server."""
+
+    def __init__(self, proxy, reader, writer):
+        self._proxy = proxy
+        self._reader = reader
+        self._writer = writer
+        self._paired = asyncio.get_event_loop().create_future()
+        self._closed = False
+        self.addr = writer.get_extra_info("peername") or ("", 0)
+        self.rpc_key = None
+        self.match_key = None
+        self.forward_proxy = None
+        self.alloc_time = None
+
+    def name(self):
+        """Name of this connection."""
+        return "AsyncTCPSocketProxy:%s:%s" % (str(self.addr[0]), self.rpc_key)
+
+    async def _init_step(self):
+        magic = struct.unpack("<i", await self._reader.readexactly(4))[0]
+        if magic != base.RPC_MAGIC:
+            logger.info("Invalid RPC magic from %s", self.name())
+            return False
+        keylen = struct.unpack("<i", await self._reader.readexactly(4))[0]
+        self.rpc_key = py_str(await self._reader.readexactly(keylen))
+        # match key is used to do the matching
+        self.match_key = self.rpc_key[7:].split()[0]
+        return True
+
+    def send_data(self, message):
+        if not self._closed:
+            self._writer.write(message)
+
+    def pair(self, peer):
+        """Pair this connection with the peer and send the handshake."""
+        self.forward_proxy = peer
+        self.send_data(
+            struct.pack("<ii", base.RPC_CODE_SUCCESS, len(peer.rpc_key))
+            + peer.rpc_key.encode("utf-8")
+        )
+        if not self._paired.done():
+            self._paired.set_result(True)
+
+    def reject(self, code):
+        """Reply with an error code and close the connection."""
+        self.send_data(struct.pack("<i", code))
+        if not self._paired.done():
+            self._paired.set_result(False)
+        self.close()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._writer.close()
+        except (ConnectionError, IOError, RuntimeError):
+            pass
+        self._proxy.on_close(self)
+        if not self._paired.done():
+            self._paired.set_result(False)
+
+    async def run(self):
+        """Handshake, wait for the peer, then forward until either side closes."""
+        try:
+            if not await self._init_step():
+                return
+            self._proxy.handler_ready(self)
+            read_task = asyncio.ensure_future(self._reader.read(READ_CHUNK_SIZE))
+            await asyncio.wait([self._paired, read_task], return_when=asyncio.FIRST_COMPLETED)
+            if not (self._paired.done() and self._paired.result()):
+                if read_task.done() and read_task.result():
+                    logger.info("Invalid RPC protocol, too many bytes %s", self.name())
+                read_task.cancel()
+                return
+            data = await read_task
+            while data:
+                self.forward_proxy.send_data(data)
+                await self.forward_proxy.drain()
+                data = await self._reader.read(READ_CHUNK_SIZE)
+        except (ConnectionError, IOError, asyncio.IncompleteReadError) as err:
+            logger.info("%s: Error in RPC %s", self.name(), err)
+        finally:
+            peer = self.forward_proxy
+            self.close()
+            if peer:
+                peer.close()
+
+    async def drain(self):
+        if not self._closed:
+            try:
+                await self._writer.drain()
+            except (ConnectionError, IOError):
+                self.close()
+
+
+class ProxyServer(object):
+    """Internal asyncio proxy server.
+
+    Parameters
+    ----------
+    sock : socket.socket
+        The bound and listening socket.
+
+    listen_port : int
+        The port reported to the tracker.
+
+    timeout_client : float
+        Timeout of client until it sees a matching connection.
+
+    timeout_server : float
+        Timeout of server until it sees a matching connection.
+
+    tracker_addr : tuple of (str, int), optional
+        The address of the tracker to register the servers to.
+    """
+
+    def __init__(self, sock, listen_port, timeout_client, timeout_server, tracker_addr):
+        self.sock = sock
+        self._client_pool = {}
+        self._server_pool = {}
+        self.timeout_alloc = 5
+        self.timeout_client = timeout_client
+        self.timeout_server = timeout_server
+        # tracker information
+        self._listen_port = listen_port
+        self._tracker_addr = tracker_addr
+        self._tracker_conn = None
+        self._tracker_pending_puts = []
+        self._tracker_wakeup = None
+        self._key_set = set()
+        self._loop = None
+        self.update_tracker_period = 2
+        if tracker_addr:
+            logger.info("Tracker address:%s", str(tracker_addr))
+
+    async def _on_connection(self, reader, writer):
+        await ForwardConnection(self, reader, writer).run()
+
+    def on_close(self, conn):
+        if conn.match_key:
+            key = conn.match_key
+            if self._client_pool.get(key, None) is conn:
+                self._client_pool.pop(key)
+            if self._server_pool.get(key, None) is conn:
+                self._server_pool.pop(key)
+
+    def _pair_up(self, lhs, rhs):
+        lhs.pair(rhs)
+        rhs.pair(lhs)
+        logger.info("Pairup connect %s  and %s", lhs.name(), rhs.name())
+
+    def _regenerate_server_keys(self, keys):
+        """Regenerate keys for server pool"""
+        keyset = set(self._server_pool.keys())
+        new_keys = []
+        # re-generate the server match key, so old information is invalidated.
+        for key in list(keys):
+            rpc_key, _ = key.split(":")
+            handle = self._server_pool.pop(key)
+            new_key = base.random_key(rpc_key + ":", keyset)
+            handle.match_key = new_key
+            self._server_pool[new_key] = handle
+            keyset.add(new_key)
+            new_keys.append(new_key)
+        return new_keys
+
+    async def _tracker_call(self, data):
+        reader, writer = self._tracker_conn
+        writer.write(pack_json(data))
+        return await read_json(reader)
+
+    @staticmethod
+    def _check_tracker_success(reply, request):
+        if reply != TrackerCode.SUCCESS:
+            raise RuntimeError("Tracker rejected %s, reply: %s" % (request, str(reply)))
+
+    async def _update_tracker(self, period_update):
+        """Update information on tracker."""
+        if self._tracker_conn is None:
+            self._tracker_conn = await open_tracker_connection(self._tracker_addr)
+            # just connect to tracker, need to update all keys
+            self._tracker_pending_puts = list(self._server_pool.keys())
+
+        if period_update:
+            # periodically update tracker information
+            # regenerate key if the key is not in tracker anymore
+            # and there is no in-coming connection after timeout_alloc
+            pending_keys = await self._tracker_call([TrackerCode.GET_PENDING_MATCHKEYS])
+            if not isinstance(pending_keys, list):
+                raise RuntimeError(
+                    "Invalid pending match keys from tracker: %s" % str(pending_keys)
+                )
+            pending_keys = set(pending_keys)
+            update_keys = []
+            for k, v in self._server_pool.items():
+                if k not in pending_keys:
+                    if v.alloc_time is None:
+                        v.alloc_time = time.time()
+                    elif time.time() - v.alloc_time > self.timeout_alloc:
+                        update_keys.append(k)
+                        v.alloc_time = None
+            if update_keys:
+                logger.info(
+                    "RPCProxy: No incoming conn on %s, regenerate keys...", str(update_keys)
+                )
+                self._tracker_pending_puts += self._regenerate_server_keys(update_keys)
+
+        need_update_info = False
+        # report new connections, all PUTs are sent before reading the replies
+        pending, self._tracker_pending_puts = self._tracker_pending_puts, []
+        reader, writer = self._tracker_conn
+        for key in pending:
+            rpc_key = key.split(":")[0]
+            writer.write(pack_json([TrackerCode.PUT, rpc_key, (self._listen_port, key), None]))
+            if rpc_key not in self._key_set:
+                self._key_set.add(rpc_key)
+                need_update_info = True
+        for key in pending:
+            self._check_tracker_success(await read_json(reader), "PUT of %s" % key)
+
+        if need_update_info:
+            keylist = "[" + ",".join(self._key_set) + "]"
+            cinfo = {"key": "server:proxy" + keylist, "addr": [None, self._listen_port]}
+            reply = await self._tracker_call([TrackerCode.UPDATE_INFO, cinfo])
+            self._check_tracker_success(reply, "UPDATE_INFO")
+
+    async def _tracker_loop(self):
+        """Keep the tracker in sync, wakes up periodically or on new servers."""
+        last_period = time.time()
+        while True:
+            period_update = time.time() - last_period >= self.update_tracker_period
+            if period_update:
+                last_period = time.time()
+            try:
+                await self._update_tracker(period_update)
+            except (
+                ConnectionError,
+                IOError,
+                asyncio.IncompleteReadError,
+                RuntimeError,
+                ValueError,
+            ) as err:
+                # the server keys and the proxy info are put again on reconnection
+                logger.info(
+                    "Tracker update failed: %s, try reconnect in %g sec",
+                    str(err),
+                    self.update_tracker_period,
+                )
+                if self._tracker_conn:
+                    self._tracker_conn[1].close()
+                self._tracker_conn = None
+                self._key_set = set()
+                self._regenerate_server_keys(list(self._server_pool.keys()))
+            self._tracker_wakeup = self._loop.create_future()
+            try:
+                await asyncio.wait_for(self._tracker_wakeup, self.update_tracker_period)
+            except asyncio.TimeoutError:
+                pass
+            self._tracker_wakeup = None
+
+    def _wakeup_tracker(self):
+        if self._tracker_wakeup and not self._tracker_wakeup.done():
+            self._tracker_wakeup.set_result(True)
+
+    def _handler_ready_tracker_mode(self, handler):
+        """tracker mode to handle handler ready."""
+        if handler.rpc_key.startswith("server:"):
+            key = base.random_key(handler.match_key + ":", self._server_pool)
+            handler.match_key = key
+            self._server_pool[key] = handler
+            self._tracker_pending_puts.append(key)
+            self._wakeup_tracker()
+        else:
+            if handler.match_key in self._server_pool:
+                self._pair_up(self._server_pool.pop(handler.match_key), handler)
+            else:
+                handler.reject(base.RPC_CODE_MISMATCH)
+
+    def _handler_ready_proxy_mode(self, handler):
+        """Normal proxy mode when handler is ready."""
+        if handler.rpc_key.startswith("server:"):
+            pool_src, pool_dst = self._client_pool, self._server_pool
+            timeout = self.timeout_server
+        else:
+            pool_src, pool_dst = self._server_pool, self._client_pool
+            timeout = self.timeout_client
+
+        key = handler.match_key
+        if key in pool_src:
+            self._pair_up(pool_src.pop(key), handler)
+            return
+        if key not in pool_dst:
+            pool_dst[key] = handler
+
+            def cleanup():
+                """Cleanup client connection if timeout"""
+                if pool_dst.get(key, None) is handler:
+                    logger.info(
+                        "Timeout client connection %s, cannot find match key=%s",
+                        handler.name(),
+                        key,
+                    )
+                    pool_dst.pop(key)
+                    handler.reject(base.RPC_CODE_MISMATCH)
+
+            self._loop.call_later(timeout, cleanup)
+        else:
+            logger.info("Duplicate connection with same key=%s", key)
+            handler.reject(base.RPC_CODE_DUPLICATE)
+
+    def handler_ready(self, handler):
+        """Report handler to be ready."""
+        logger.info("Handler ready %s", handler.name())
+        if self._tracker_addr:
+            self._handler_ready_tracker_mode(handler)
+        else:
+            self._handler_ready_proxy_mode(handler)
+
+    async def serve(self):
+        """Serve forever."""
+        self._loop = asyncio.get_event_loop()
+        server = await asyncio.start_server(self._on_connection, sock=self.sock)
+        if self._tracker_addr:
+            self._loop.create_task(self._tracker_loop())
+        try:
+            # never set, the proxy runs until its process is terminated
+            await self._loop.create_future()
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    def run(self):
+        """Run the proxy server"""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(self.serve())
+
+
+def _proxy_server(listen_sock, listen_port, timeout_client, timeout_server, tracker_addr):
+    handler = ProxyServer(listen_sock, listen_port, timeout_client, timeout_server, tracker_addr)
+    handler.run()
+
+
+class PopenProxyServerState(object):
+    """Internal PopenProxy State for Popen"""
+
+    current = None
+
+    def __init__(
+        self,
+        host,
+        port=9091,
+        port_end=9199,
+        timeout_client=600,
+        timeout_server=600,
+        tracker_addr=None,
+    ):
+
+        sock = socket.socket(base.get_addr_family((host, port)), socket.SOCK_STREAM)
+        self.port = None
+        for my_port in range(port, port_end):
+            try:
+                sock.bind((host, my_port))
+                self.port = my_port
+                break
+            except socket.error as sock_err:
+                if sock_err.errno in [errno.EADDRINUSE]:
+                    continue
+                raise sock_err
+        if not self.port:
+            raise ValueError("cannot bind to any port in [%d, %d)" % (port, port_end))
+        logger.info("RPCProxy: client port bind to %s:%d", host, self.port)
+        sock.listen(socket.SOMAXCONN)
+        self.thread = threading.Thread(
+            target=_proxy_server,
+            args=(sock, self.port, timeout_client, timeout_server, tracker_addr),
+        )
+        # start the server in a different thread
+        # so we can return the port directly
+        self.thread.start()
+
+
+def _popen_start_proxy_server(
+    host,
+    port=9091,
+    port_end=9199,
+    timeout_client=600,
+    timeout_server=600,
+    tracker_addr=None,
+):
+    # This is a function that will be sent to the
+    # Popen worker to run on a separate process.
+    state = PopenProxyServerState(
+        host, port, port_end, timeout_client, timeout_server, tracker_addr
+    )
+    PopenProxyServerState.current = state
+    # returns the port so that the main can get the port number.
+    return state.port
+
+
+class Proxy(object):
+    """Start the asyncio RPC proxy server on a seperate process.
+
+    Parameters
+    ----------
+    host : str
+        The host url of the server.
+
+    port : int
+        The TCP port to be bind to
+
+    port_end : int, optional
+        The end TCP port to search
+
+    timeout_client : float, optional
+        Timeout of client until it sees a matching connection.
+
+    timeout_server : float, optional
+        Timeout of server until it sees a matching connection.
+
+    tracker_addr: Tuple (str, int) , optional
+        The address of RPC Tracker in tuple (host, ip) format.
+        If is not None, the server will register itself to the tracker.
+    """
+
+    def __init__(
+        self,
+        host,
+        port=9091,
+        port_end=9199,
+        timeout_client=600,
+        timeout_server=600,
+        tracker_addr=None,
+    ):
+        self.proc = PopenWorker()
+        # send the function
+        self.proc.send(
+            _popen_start_proxy_server,
+            [host, port, port_end, timeout_client, timeout_server, tracker_addr],
+        )
+        # receive the port
+        self.port = self.proc.recv()
+        self.host = host
+
+    def terminate(self):
+        """Terminate the server process"""
+        if self.proc:
+            logger.info("Terminating Proxy Server...")
+            self.proc.kill()
+            self.proc = None
+
+    def __del__(self):
+        self.terminate()
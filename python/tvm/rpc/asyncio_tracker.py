@@ -0,0 +1,394 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Asyncio based RPC Tracker.
+
+This is a drop-in replacement of :py:mod:`tvm.rpc.tracker` that speaks the
+same wire protocol but runs on a plain ``asyncio`` event loop, so it does
+not depend on tornado and does not need any locking in the scheduler.
+
+Note
+----
+Messages are processed in batches: every complete message in a read
+chunk is dispatched before the replies are flushed with a single write,
+and resource matching is coalesced into one pass per event loop iteration
+no matter how many PUT/REQUEST messages arrived in between.
+"""
+# pylint: disable=invalid-name
+
+import asyncio
+import collections
+import errno
+import heapq
+import logging
+import socket
+import struct
+import threading
+
+from tvm.contrib.popen_pool import PopenWorker
+
+from . import base
+from .asyncio_util import StreamHandler, read_magic
+from .base import RPC_TRACKER_MAGIC, TrackerCode
+
+logger = logging.getLogger("RPCTracker")
+
+
+class PriorityScheduler(object):
+    """Priority based scheduler, FIFO based on request order.
+
+    Same semantics as :py:class:`tvm.rpc.tracker.PriorityScheduler`, the
+    scheduler is only touched from the event loop thread so it is lock free.
+    """
+
+    def __init__(self, key):
+        self._key = key
+        self._request_cnt = 0
+        self._values = collections.deque()
+        self._requests = []
+
+    def schedule(self):
+        """Match pending requests against the free resources."""
+        while self._requests and self._values:
+            value = self._values.popleft()
+            item = heapq.heappop(self._requests)
+            callback = item[-1]
+            if callback(value[1:]):
+                value[0].pending_matchkeys.discard(value[-1])
+            else:
+                self._values.append(value)
+
+    def put(self, value):
+        self._values.append(value)
+
+    def request(self, user, priority, callback):
+        heapq.heappush(self._requests, (-priority, self._request_cnt, callback))
+        self._request_cnt += 1
+
+    def remove(self, value):
+        try:
+            self._values.remove(value)
+        except ValueError:
+            pass
+
+    def summary(self):
+        """Get summary information of the scheduler."""
+        return {"free": len(self._values), "pending": len(self._requests)}
+
+
+class TrackerConnection(StreamHandler):
+    """A single connection to the tracker."""
+
+    def __init__(self, tracker, reader, writer):
+        super(TrackerConnection, self).__init__(reader, writer)
+        self._tracker = tracker
+        self._info = {}
+        # list of pending match keys that has not been used.
+        self.pending_matchkeys = set()
+        self.put_values = []
+
+    def summary(self):
+        """Summary of this connection"""
+        return self._info
+
+    def on_message(self, message):
+        """Event handler when json request arrives."""
+        args = message
+        code = args[0]
+        if code == TrackerCode.PUT:
+            key = args[1]
+            port, matchkey = args[2]
+            self.pending_matchkeys.add(matchkey)
+            # got custom address (from rpc server)
+            if len(args) >= 4 and args[3] is not None:
+                value = (self, args[3], port, matchkey)
+            else:
+                value = (self, self.addr[0], port, matchkey)
+            self._tracker.put(key, value)
+            self.put_values.append((key, value))
+            self.ret_value(TrackerCode.SUCCESS)
+        elif code == TrackerCode.REQUEST:
+            key = args[1]
+            user = args[2]
+            priority = args[3]
+
+            def _cb(value):
+                # if the connection is already closed
+                if self.closed:
+                    return False
+                try:
+                    self.ret_value([TrackerCode.SUCCESS, value])
+                except (socket.error, IOError):
+                    return False
+                return True
+
+            self._tracker.request(key, user, priority, _cb)
+        elif code == TrackerCode.PING:
+            self.ret_value(TrackerCode.SUCCESS)
+        elif code == TrackerCode.GET_PENDING_MATCHKEYS:
+            self.ret_value(list(self.pending_matchkeys))
+        elif code == TrackerCode.STOP:
+            # safe stop tracker
+            if self._tracker.stop_key == args[1]:
+                self.ret_value(TrackerCode.SUCCESS)
+                self._tracker.stop()
+            else:
+                self.ret_value(TrackerCode.FAIL)
+        elif code == TrackerCode.UPDATE_INFO:
+            info = args[1]
+            assert isinstance(info, dict)
+            if info["addr"][0] is None:
+                info["addr"][0] = self.addr[0]
+            self._info.update(info)
+            self.ret_value(TrackerCode.SUCCESS)
+        elif code == TrackerCode.SUMMARY:
+            status = self._tracker.summary()
+            self.ret_value([TrackerCode.SUCCESS, status])
+        else:
+            logger.warning("Unknown tracker code %d", code)
+            self.close()
+
+    def on_close(self):
+        self._tracker.close(self)
+
+    def on_error(self, err):
+        logger.warning("%s: Error in RPC Tracker: %s", self.name(), err)
+
+
+class TrackerServer(object):
+    """Asyncio tracker that tracks the resources.
+
+    Parameters
+    ----------
+    sock : socket.socket
+        The bound and listening socket.
+
+    stop_key : str
+        The key required by the STOP command.
+    """
+
+    def __init__(self, sock, stop_key):
+        self._scheduler_map = {}
+        self._sock = sock
+        self._connections = set()
+        self._dirty = set()
+        self._schedule_pending = False
+        self._server = None
+        self._stopped = None
+        self._loop = None
+        self.stop_key = stop_key
+
+    async def _on_connection(self, reader, writer):
+        try:
+            magic = await read_magic(reader)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            writer.close()
+            return
+        if magic != RPC_TRACKER_MAGIC:
+            logger.warning("Invalid magic from %s", str(writer.get_extra_info("peername")))
+            writer.close()
+            return
+        writer.write(struct.pack("<i", RPC_TRACKER_MAGIC))
+        conn = TrackerConnection(self, reader, writer)
+        self._connections.add(conn)
+        await conn.serve()
+
+    def create_scheduler(self, key):
+        """Create a new scheduler."""
+        return PriorityScheduler(key)
+
+    def _get_scheduler(self, key):
+        if key not in self._scheduler_map:
+            self._scheduler_map[key] = self.create_scheduler(key)
+        return self._scheduler_map[key]
+
+    def _mark_dirty(self, key):
+        self._dirty.add(key)
+        if not self._schedule_pending:
+            self._schedule_pending = True
+            self._loop.call_soon(self._run_schedule)
+
+    def _run_schedule(self):
+        self._schedule_pending = False
+        dirty, self._dirty = self._dirty, set()
+        for key in dirty:
+            self._scheduler_map[key].schedule()
+
+    def put(self, key, value):
+        """Report a new resource to the tracker."""
+        self._get_scheduler(key).put(value)
+        self._mark_dirty(key)
+
+    def request(self, key, user, priority, callback):
+        """Request a new resource."""
+        self._get_scheduler(key).request(user, priority, callback)
+        self._mark_dirty(key)
+
+    def close(self, conn):
+        self._connections.discard(conn)
+        for key, value in conn.put_values:
+            self._scheduler_map[key].remove(value)
+
+    def stop(self):
+        """Safely stop tracker."""
+        for conn in list(self._connections):
+            conn.close()
+        if self._stopped and not self._stopped.done():
+            self._stopped.set_result(True)
+
+    def summary(self):
+        """Return a dict summarizing current status."""
+        qinfo = {}
+        for k, v in self._scheduler_map.items():
+            qinfo[k] = v.summary()
+        cinfo = []
+        # ignore client connections without key
+        for conn in self._connections:
+            res = conn.summary()
+            if res.get("key", "").startswith("server"):
+                cinfo.append(res)
+        return {"queue_info": qinfo, "server_info": cinfo}
+
+    async def serve(self):
+        """Serve until the tracker is stopped."""
+        self._loop = asyncio.get_event_loop()
+        self._stopped = self._loop.create_future()
+        self._server = await asyncio.start_server(self._on_connection, sock=self._sock)
+        try:
+            await self._stopped
+        finally:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def run(self):
+        """Run the tracker server"""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.serve())
+        finally:
+            loop.close()
+
+
+def _tracker_server(listen_sock, stop_key):
+    handler = TrackerServer(listen_sock, stop_key)
+    handler.run()
+
+
+class PopenTrackerServerState(object):
+    """Internal PopenTrackerServer State"""
+
+    current = None
+
+    def __init__(self, host, port=9190, port_end=9199, silent=False):
+        if silent:
+            logger.setLevel(logging.WARN)
+
+        sock = socket.socket(base.get_addr_family((host, port)), socket.SOCK_STREAM)
+        self.port = None
+        self.stop_key = base.random_key("tracker")
+        for my_port in range(port, port_end):
+            try:
+                sock.bind((host, my_port))
+                self.port = my_port
+                break
+            except socket.error as sock_err:
+                if sock_err.errno in [errno.EADDRINUSE]:
+                    continue
+                raise sock_err
+        if not self.port:
+            raise ValueError("cannot bind to any port in [%d, %d)" % (port, port_end))
+        logger.info("bind to %s:%d", host, self.port)
+        sock.listen(socket.SOMAXCONN)
+        self.thread = threading.Thread(target=_tracker_server, args=(sock, self.stop_key))
+        self.thread.start()
+        self.host = host
+
+
+def _popen_start_tracker_server(host, port=9190, port_end=9199, silent=False):
+    # This is a function that will be sent to the
+    # Popen worker to run on a separate process.
+    # Create and start the server in a different thread
+    state = PopenTrackerServerState(host, port, port_end, silent)
+    PopenTrackerServerState.current = state
+    # returns the port so that the main can get the port number.
+    return (state.port, state.stop_key)
+
+
+class Tracker(object):
+    """Start the asyncio RPC tracker on a separate process.
+
+    Same interface as :py:class:`tvm.rpc.tracker.Tracker`.
+
+    Parameters
+    ----------
+    host : str
+        The host url of the server.
+
+    port : int
+        The TCP port to be bind to
+
+    port_end : int, optional
+        The end TCP port to search
+
+    silent: bool, optional
+        Whether run in silent mode
+    """
+
+    def __init__(self, host="0.0.0.0", port=9190, port_end=9199, silent=False):
+        if silent:
+            logger.setLevel(logging.WARN)
+        self.proc = PopenWorker()
+        # send the function
+        self.proc.send(
+            _popen_start_tracker_server,
+            [
+                host,
+                port,
+                port_end,
+                silent,
+            ],
+        )
+        # receive the port
+        self.port, self.stop_key = self.proc.recv()
+        self.host = host
+
+    def _stop_tracker(self):
+        sock = socket.socket(base.get_addr_family((self.host, self.port)), socket.SOCK_STREAM)
+        sock.connect(("127.0.0.1", self.port))
+        sock.sendall(struct.pack("<i", base.RPC_TRACKER_MAGIC))
+        magic = struct.unpack("<i", base.recvall(sock, 4))[0]
+        assert magic == base.RPC_TRACKER_MAGIC
+        base.sendjson(sock, [TrackerCode.STOP, self.stop_key])
+        assert base.recvjson(sock) == TrackerCode.SUCCESS
+        sock.close()
+
+    def terminate(self):
+        """Terminate the server process"""
+        if self.proc:
+            if self.proc.is_alive():
+                self._stop_tracker()
+            self.proc.join(0.1)
+            if self.proc.is_alive():
+                logger.info("Terminating Tracker Server...")
+                self.proc.kill()
+            self.proc = None
+
+    def __del__(self):
+        try:
+            self.terminate()
+        except TypeError:
+            pass
@@ -0,0 +1,241 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Utilities used by the asyncio based tracker and proxy.
+
+The helpers here implement the same framing as :py:mod:`tvm.rpc.base`
+(``[nbytes(int32)][json-str]`` messages after a 4 byte magic handshake)
+on top of ``asyncio`` streams instead of blocking sockets or tornado.
+"""
+import asyncio
+import json
+import struct
+
+from .._ffi.base import py_str
+
+# Size of the chunk read from a stream in one go.
+# Every complete message inside the chunk is handled in the same batch.
+READ_CHUNK_SIZE = 65536
+
+
+async def read_magic(reader):
+    """Read the 4 byte magic handshake from the stream.
+
+    Parameters
+    ----------
+    reader : asyncio.StreamReader
+        The stream reader.
+
+    Returns
+    -------
+    magic : int
+        The received magic number.
+    """
+    return struct.unpack("<i", await reader.readexactly(4))[0]
+
+
+async def read_json(reader):
+    """Receive a single json message from the stream.
+
+    Parameters
+    ----------
+    reader : asyncio.StreamReader
+        The stream reader.
+
+    Returns
+    -------
+    value : object
+        The value received.
+    """
+    size = struct.unpack("<i", await reader.readexactly(4))[0]
+    return json.loads(py_str(await reader.readexactly(size)))
+
+
+def pack_json(data):
+    """Pack a python value into a framed json message.
+
+    Parameters
+    ----------
+    data : object
+        Python value to be sent.
+
+    Returns
+    -------
+    msg : bytes
+        The framed message.
+    """
+    data = json.dumps(data).encode("utf-8")
+    return struct.pack("<i", len(data)) + data
+
+
+def unpack_messages(buf):
+    """Extract all complete framed json messages from a buffer.
+
+    The consumed bytes are removed from ``buf`` in place, a trailing
+    partial message is left untouched.
+
+    Parameters
+    ----------
+    buf : bytearray
+        The receive buffer.
+
+    Returns
+    -------
+    messages : list of object
+        The decoded messages, in arrival order.
+    """
+    messages = []
+    offset = 0
+    nbuf = len(buf)
+    while nbuf - offset >= 4:
+        size = struct.unpack_from("<i", buf, offset)[0]
+        if nbuf - offset - 4 < size:
+            break
+        messages.append(json.loads(py_str(bytes(buf[offset + 4 : offset + 4 + size]))))
+        offset += 4 + size
+    if offset:
+        del buf[:offset]
+    return messages
+
+
+async def open_tracker_connection(addr):
+    """Connect to a RPC tracker and perform the magic handshake.
+
+    Parameters
+    ----------
+    addr : tuple of (str, int)
+        The address of the tracker.
+
+    Returns
+    -------
+    reader, writer : asyncio.StreamReader, asyncio.StreamWriter
+        The connected streams.
+    """
+    # pylint: disable=import-outside-toplevel
+    from .base import RPC_TRACKER_MAGIC
+
+    reader, writer = await asyncio.open_connection(addr[0], addr[1])
+    writer.write(struct.pack("<i", RPC_TRACKER_MAGIC))
+    if await read_magic(reader) != RPC_TRACKER_MAGIC:
+        writer.close()
+        raise RuntimeError("%s is not RPC Tracker" % str(addr))
+    return reader, writer
+
+
+class StreamHandler(object):
+    """Batched json message handler on top of asyncio streams.
+
+    Reads are done in chunks of :py:data:`READ_CHUNK_SIZE`, every
+    complete message in a chunk is dispatched to :py:meth:`on_message`,
+    and all replies produced by the batch are flushed with one write.
+
+    Parameters
+    ----------
+    reader : asyncio.StreamReader
+        The stream reader.
+
+    writer : asyncio.StreamWriter
+        The stream writer.
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._pending_write = []
+        self._in_batch = False
+        self._closed = False
+        self.addr = writer.get_extra_info("peername") or ("", 0)
+
+    @property
+    def closed(self):
+        """Whether the connection is closed."""
+        return self._closed
+
+    def name(self):
+        """name of connection"""
+        return "AsyncTCPSocket: %s" % str(self.addr)
+
+    def ret_value(self, data):
+        """Queue a json reply, it is sent at the end of the current batch.
+
+        Parameters
+        ----------
+        data : object
+            Python value to be sent.
+        """
+        if self._closed:
+            raise IOError("socket is already closed")
+        self._pending_write.append(pack_json(data))
+        if not self._in_batch:
+            self._flush()
+
+    def _flush(self):
+        if self._pending_write and not self._closed:
+            self._writer.write(b"".join(self._pending_write))
+        self._pending_write = []
+
+    async def serve(self):
+        """Serve messages until the peer closes the connection."""
+        buf = bytearray()
+        try:
+            while not self._closed:
+                chunk = await self._reader.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                buf += chunk
+                self._in_batch = True
+                try:
+                    for msg in unpack_messages(buf):
+                        self.on_message(msg)
+                        if self._closed:
+                            break
+                finally:
+                    self._in_batch = False
+                    self._flush()
+                if not self._closed:
+                    await self._writer.drain()
+        except (ConnectionError, IOError, asyncio.IncompleteReadError) as err:
+            self.on_error(err)
+        finally:
+            self.close()
+
+    def close(self):
+        """Close the connection, triggers :py:meth:`on_close` once."""
+        if self._closed:
+            return
+        self._flush()
+        self._closed = True
+        try:
+            self._writer.close()
+        except (ConnectionError, IOError, RuntimeError):
+            pass
+        self.on_close()
+
+    def on_message(self, message):
+        """Callback when a json message is received.
+
+        Parameters
+        ----------
+        message : object
+            The decoded json message.
+        """
+        raise NotImplementedError()
+
+    def on_error(self, err):
+        """Callback when an IO error happens."""
+
+    def on_close(self):
+        """Callback when the connection is closed."""
@@ -29,6 +29,7 @@ import os
 import ctypes
 import socket
 import select
+import signal
 import struct
 import logging
 import threading
@@ -113,8 +114,139 @@ def _server_env(load_library, work_path=None):
     return temp
 
 
-def _serve_loop(sock, addr, load_library, work_path=None):
+class SessionSlot(object):
+    """A slice of the local machine that serves one RPC session at a time.
+
+    A server with several slots registers one tracker entry per slot, so
+    a client such as ``RPCRunner(n_parallel=...)`` can hold one session
+    per slot concurrently. Each session runs in its own process, pinned
+    to the cores of its slot and with the environment of its slot.
+
+    Parameters
+    ----------
+    name : str
+        Name of the slot, used for logging.
+
+    cores : list of int, optional
+        The CPU cores the session process is pinned to.
+
+    env : dict of str to str, optional
+        Extra environment variables of the session process,
+        e.g. ``{"CUDA_VISIBLE_DEVICES": "1"}``.
+    """
+
+    def __init__(self, name, cores=None, env=None):
+        self.name = name
+        self.cores = list(cores) if cores else []
+        self.env = dict(env) if env else {}
+
+    def apply(self):
+        """Apply the slot settings to the current process."""
+        os.environ.update(self.env)
+        if self.cores:
+            os.environ["TVM_NUM_THREADS"] = str(len(self.cores))
+            if hasattr(os, "sched_setaffinity"):
+                os.sched_setaffinity(0, self.cores)
+
+    def __repr__(self):
+        return "SessionSlot(%s, cores=%s, env=%s)" % (self.name, self.cores, self.env)
+
+
+def _parse_cpulist(text):
+    cores = []
+    for item in text.strip().split(","):
+        if not item:
+            continue
+        if "-" in item:
+            begin, end = item.split("-")
+            cores.extend(range(int(begin), int(end) + 1))
+        else:
+            cores.append(int(item))
+    return cores
+
+
+def _available_cores():
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(multiprocessing.cpu_count()))
+
+
+def make_session_slots(spec):
+    """Create the session slots of the local machine from a spec string.
+
+    Parameters
+    ----------
+    spec : str
+        One of
+
+        - ``"numa"``: one slot per NUMA node (CPU socket) with its cores.
+        - ``"cpu:N"``: split the available cores into N equal slots.
+        - ``"cuda:0,1,..."``, ``"rocm:..."``, ``"opencl:..."``: one slot per
+          listed device, the available cores are split evenly among them and
+          the device is selected with the vendor visibility variable.
+
+    Returns
+    -------
+    slots : list of SessionSlot
+        The slots.
+    """
+    cores = _available_cores()
+    if spec == "numa":
+        node_root = "/sys/devices/system/node"
+        slots = []
+        if os.path.isdir(node_root):
+            for node in sorted(os.listdir(node_root)):
+                if not (node.startswith("node") and node[4:].isdigit()):
+                    continue
+                with open(os.path.join(node_root, node, "cpulist")) as f:
+                    node_cores = [c for c in _parse_cpulist(f.read()) if c in cores]
+                if node_cores:
+                    slots.append(SessionSlot(node, node_cores))
+        return slots if slots else [SessionSlot("node0", cores)]
+
+    kind, _, arg = spec.partition(":")
+    if kind == "cpu":
+        nslot = int(arg) if arg else len(cores)
+        names = ["cpu%d" % i for i in range(nslot)]
+        envs = [{}] * nslot
+    else:
+        env_key = {
+            "cuda": "CUDA_VISIBLE_DEVICES",
+            "gpu": "CUDA_VISIBLE_DEVICES",
+            "rocm": "HIP_VISIBLE_DEVICES",
+            "opencl": "GPU_DEVICE_ORDINAL",
+        }.get(kind)
+        if env_key is None or not arg:
+            raise ValueError("Invalid session slot spec %s" % spec)
+        dev_ids = arg.split(",")
+        nslot = len(dev_ids)
+        names = ["%s%s" % (kind, dev_id) for dev_id in dev_ids]
+        envs = [{env_key: dev_id} for dev_id in dev_ids]
+    if nslot <= 0 or (kind == "cpu" and nslot > len(cores)):
+        raise ValueError("Cannot split %d cores into %d slots" % (len(cores), nslot))
+    if nslot > len(cores):
+        # more devices than cores, all the devices share the cores
+        return [SessionSlot(names[i], cores, envs[i]) for i in range(nslot)]
+    step = len(cores) // nslot
+    return [SessionSlot(names[i], cores[i * step : (i + 1) * step], envs[i]) for i in range(nslot)]
+
+
+def _kill_session_group(pid):
+    """Kill the leftover processes of a finished or crashed session."""
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+
+def _serve_loop(sock, addr, load_library, work_path=None, slot=None):
     """Server loop"""
+    if slot:
+        # own process group so the whole session can be cleaned up at once
+        if hasattr(os, "setpgrp"):
+            os.setpgrp()
+        slot.apply()
     sockfd = sock.fileno()
     temp = _server_env(load_library, work_path)
     _ffi_api.ServerLoop(sockfd)
@@ -132,7 +264,7 @@ def _parse_server_opt(opts):
     return ret
 
 
-def _listen_loop(sock, port, rpc_key, tracker_addr, load_library, custom_addr):
+def _listen_loop(sock, port, rpc_key, tracker_addr, load_library, custom_addr, slot=None):
     """Listening loop of the server."""
 
     def _accept_conn(listen_sock, tracker_conn, ping_period=2):
@@ -233,9 +365,9 @@ def _listen_loop(sock, port, rpc_key, tracker_addr, load_library, custom_addr):
 
         # step 3: serving
         work_path = utils.tempdir()
-        logger.info("connection from %s", addr)
+        logger.info("connection from %s%s", addr, " on %s" % slot.name if slot else "")
         server_proc = multiprocessing.Process(
-            target=_serve_loop, args=(conn, addr, load_library, work_path)
+            target=_serve_loop, args=(conn, addr, load_library, work_path, slot)
         )
 
         server_proc.start()
@@ -255,10 +387,14 @@ def _listen_loop(sock, port, rpc_key, tracker_addr, load_library, custom_addr):
                 child.terminate()
             # terminate the worker
             server_proc.terminate()
+        elif server_proc.exitcode:
+            logger.warning("RPC session exited with code %d", server_proc.exitcode)
+        if slot:
+            _kill_session_group(server_proc.pid)
         work_path.remove()
 
 
-def _connect_proxy_loop(addr, key, load_library):
+def _connect_proxy_loop(addr, key, load_library, slot=None):
     key = "server:" + key
     retry_count = 0
     max_retry = 5
@@ -282,13 +418,17 @@ def _connect_proxy_loop(addr, key, load_library):
             remote_key = py_str(base.recvall(sock, keylen))
             opts = _parse_server_opt(remote_key.split()[1:])
             logger.info("connected to %s", str(addr))
-            process = multiprocessing.Process(target=_serve_loop, args=(sock, addr, load_library))
+            process = multiprocessing.Process(
+                target=_serve_loop, args=(sock, addr, load_library, None, slot)
+            )
             process.start()
             sock.close()
             process.join(opts.get("timeout", None))
             if process.is_alive():
                 logger.info("Timeout in RPC session, kill..")
                 process.terminate()
+            if slot:
+                _kill_session_group(process.pid)
             retry_count = 0
         except (socket.error, IOError) as err:
             retry_count += 1
@@ -314,44 +454,71 @@ class PopenRPCServerState(object):
         load_library=None,
         custom_addr=None,
         silent=False,
+        slots=None,
     ):
 
         # start update
         self.host = host
         self.port = port
+        self.ports = []
         self.libs = []
         self.custom_addr = custom_addr
+        self.threads = []
 
         if silent:
             logger.setLevel(logging.ERROR)
 
+        # one listening loop per slot, a server without slots has a single one
+        slots = slots if slots else [None]
         if not is_proxy:
-            sock = socket.socket(base.get_addr_family((host, port)), socket.SOCK_STREAM)
-            self.port = None
-            for my_port in range(port, port_end):
-                try:
-                    sock.bind((host, my_port))
-                    self.port = my_port
-                    break
-                except socket.error as sock_err:
-                    if sock_err.errno in [errno.EADDRINUSE]:
-                        continue
-                    raise sock_err
-            if not self.port:
-                raise ValueError("cannot bind to any port in [%d, %d)" % (port, port_end))
-            logger.info("bind to %s:%d", host, self.port)
-            sock.listen(1)
-            self.sock = sock
-            self.thread = threading.Thread(
-                target=_listen_loop,
-                args=(self.sock, self.port, key, tracker_addr, load_library, self.custom_addr),
-            )
-            self.thread.start()
+            self.socks = []
+            search_begin = port
+            for slot in slots:
+                sock = socket.socket(base.get_addr_family((host, port)), socket.SOCK_STREAM)
+                bind_port = None
+                for my_port in range(search_begin, port_end):
+                    try:
+                        sock.bind((host, my_port))
+                        bind_port = my_port
+                        break
+                    except socket.error as sock_err:
+                        if sock_err.errno in [errno.EADDRINUSE]:
+                            continue
+                        raise sock_err
+                if not bind_port:
+                    raise ValueError("cannot bind to any port in [%d, %d)" % (port, port_end))
+                logger.info("bind to %s:%d%s", host, bind_port, " for %s" % slot if slot else "")
+                sock.listen(1)
+                search_begin = bind_port + 1
+                self.socks.append(sock)
+                self.ports.append(bind_port)
+                self.threads.append(
+                    threading.Thread(
+                        target=_listen_loop,
+                        args=(
+                            sock,
+                            bind_port,
+                            key,
+                            tracker_addr,
+                            load_library,
+                            self.custom_addr,
+                            slot,
+                        ),
+                    )
+                )
+            self.sock = self.socks[0]
+            self.port = self.ports[0]
         else:
-            self.thread = threading.Thread(
-                target=_connect_proxy_loop, args=((host, port), key, load_library)
-            )
-            self.thread.start()
+            self.ports = [port]
+            for slot in slots:
+                self.threads.append(
+                    threading.Thread(
+                        target=_connect_proxy_loop, args=((host, port), key, load_library, slot)
+                    )
+                )
+        self.thread = self.threads[0]
+        for thread in self.threads:
+            thread.start()
 
 
 def _popen_start_rpc_server(
@@ -366,6 +533,7 @@ def _popen_start_rpc_server(
     silent=False,
     no_fork=False,
     server_init_callback=None,
+    slots=None,
 ):
     if no_fork:
         multiprocessing.set_start_method("spawn")
@@ -377,11 +545,11 @@ def _popen_start_rpc_server(
     # Popen worker to run on a separate process.
     # Create and start the server in a different thread
     state = PopenRPCServerState(
-        host, port, port_end, is_proxy, tracker_addr, key, load_library, custom_addr, silent
+        host, port, port_end, is_proxy, tracker_addr, key, load_library, custom_addr, silent, slots
     )
     PopenRPCServerState.current = state
-    # returns the port so that the main can get the port number.
-    return state.port
+    # returns the ports so that the main can get the port numbers.
+    return state.ports
 
 
 class Server(object):
@@ -429,6 +597,12 @@ class Server(object):
     server_init_callback: Callable, optional
         Additional initialization function when starting the server.
 
+    slots: list of SessionSlot or str, optional
+        Serve one concurrent session per slot, each slot listens on its own port,
+        registers its own entry to the tracker under ``key`` and runs its sessions
+        pinned to its cores. A string is passed to :py:func:`make_session_slots`,
+        e.g. ``"numa"`` or ``"cuda:0,1,2,3"``.
+
     Note
     ----
     The RPC server only sees functions in the tvm namespace.
@@ -459,7 +633,10 @@ class Server(object):
         silent=False,
         no_fork=False,
         server_init_callback=None,
+        slots=None,
     ):
+        if isinstance(slots, str):
+            slots = make_session_slots(slots)
         try:
             if _ffi_api.ServerLoop is None:
                 raise RuntimeError("Please compile with USE_RPC=1")
@@ -481,10 +658,12 @@ class Server(object):
                 silent,
                 no_fork,
                 server_init_callback,
+                slots,
             ],
         )
-        # receive the port
-        self.port = self.proc.recv()
+        # receive the ports
+        self.ports = self.proc.recv()
+        self.port = self.ports[0]
         self.host = host
 
     def terminate(self):
@@ -16,12 +16,15 @@
 # under the License.
 # pylint: disable=invalid-name, unused-import, redefined-outer-name
 """Runtime NDArray API"""
+import collections
 import ctypes
+import threading
 import warnings
+import weakref
 import numpy as np
 import tvm._ffi
 
-from tvm._ffi.base import _LIB, check_call, c_array, string_types, _FFI_MODE
+from tvm._ffi.base import _LIB, check_call, c_array, string_types, _FFI_MODE, TVMError
 from tvm._ffi.runtime_ctypes import DataType, Device, TVMArray, TVMArrayHandle
 from tvm._ffi.runtime_ctypes import DataTypeCode, tvm_shape_index_t
 from . import _ffi_api
@@ -192,14 +195,25 @@ class NDArray(NDArrayBase):
         )
         return self.numpy()
 
-    def numpy(self):
+    def numpy(self, out=None, pool=None):
         """Convert this array to numpy array
 
+        Parameters
+        ----------
+        out : Optional[numpy.ndarray]
+            The array written in place and returned, with the shape and dtype of
+            this array, instead of a new allocation.
+
+        pool : Optional[HostArrayPool]
+            The pool drawing the returned array, when ``out`` is not given.
+
         Returns
         -------
         np_arr : numpy.ndarray
             The corresponding numpy array.
         """
+        if out is not None:
+            return self._copyto_numpy(out)
         t = DataType(self.dtype)
         shape, dtype = self.shape, self.dtype
         old_dtype = dtype
@@ -209,7 +223,10 @@ class NDArray(NDArrayBase):
             dtype = str(t)
         if dtype == "int4":
             dtype = "int8"
-        np_arr = np.empty(shape, dtype=dtype)
+        if pool is not None and old_dtype != "int4":
+            np_arr = pool.empty(shape, dtype)
+        else:
+            np_arr = np.empty(shape, dtype=dtype)
         assert np_arr.flags["C_CONTIGUOUS"]
         data = np_arr.ctypes.data_as(ctypes.c_void_p)
         nbytes = ctypes.c_size_t(np_arr.size * np_arr.dtype.itemsize)
@@ -230,16 +247,41 @@ class NDArray(NDArrayBase):
 
         Parameters
         ----------
-        target : NDArray
+        target : NDArray, numpy.ndarray or Device
             The target array to be copied, must have same shape as this array.
+            A numpy.ndarray is written in place.
         """
         if isinstance(target, NDArrayBase):
             return self._copyto(target)
+        if isinstance(target, np.ndarray):
+            return self._copyto_numpy(target)
         if isinstance(target, Device):
             res = empty(self.shape, self.dtype, target)
             return self._copyto(res)
         raise ValueError("Unsupported target type %s" % str(type(target)))
 
+    def _copyto_numpy(self, target):
+        """Copy array into a numpy array without allocating a new one."""
+        t = DataType(self.dtype)
+        shape, dtype = self.shape, self.dtype
+        if t.lanes > 1:
+            shape = shape + (t.lanes,)
+            t.lanes = 1
+            dtype = str(t)
+        if dtype == "int4" or target.dtype != np.dtype(dtype) or target.shape != shape:
+            raise ValueError(
+                "array shape or dtype do not match the target {0} {1} vs {2} {3}".format(
+                    shape, dtype, target.shape, target.dtype
+                )
+            )
+        if not target.flags["C_CONTIGUOUS"]:
+            np.copyto(target, self.numpy())
+            return target
+        data = target.ctypes.data_as(ctypes.c_void_p)
+        nbytes = ctypes.c_size_t(target.size * target.dtype.itemsize)
+        check_call(_LIB.TVMArrayCopyToBytes(self.handle, data, nbytes))
+        return target
+
 
 def device(dev_type, dev_id=0):
     """Construct a TVM device with given device type and id.
@@ -291,7 +333,7 @@ def numpyasarray(np_data):
     return arr, shape
 
 
-def empty(shape, dtype="float32", device=device(1, 0), mem_scope=None):
+def empty(shape, dtype="float32", device=device(1, 0), mem_scope=None, pool=None):
     """Create an empty array given shape and device
 
     Parameters
@@ -308,6 +350,9 @@ def empty(shape, dtype="float32", device=device(1, 0), mem_scope=None):
     mem_scope : Optional[str]
         The memory scope of the array.
 
+    pool : Optional[HostArrayPool]
+        The pool drawing the memory of the array, which must be on the CPU.
+
     Returns
     -------
     arr : tvm.nd.NDArray
@@ -319,6 +364,10 @@ def empty(shape, dtype="float32", device=device(1, 0), mem_scope=None):
             shape_imm.append(s.value)
         else:
             shape_imm.append(int(s))
+    if pool is not None:
+        if device.device_type != Device.STR2MASK["cpu"] or mem_scope is not None:
+            raise ValueError("A HostArrayPool only serves arrays on the CPU")
+        return pool.empty_ndarray(shape_imm, dtype)
     arr = np.array(shape_imm, "int64")
     ptr = arr.ctypes.data_as(ctypes.POINTER(ctypes.c_int64))
     shape_ptr = ctypes.cast(ptr, ctypes.c_void_p)
@@ -353,6 +402,338 @@ def from_dlpack(dltensor):
     raise AttributeError("Required attribute __dlpack__ not found")
 
 
+# Alignment of the runtime allocations (kAllocAlignment), which compiled kernels assume.
+_ALLOC_ALIGNMENT = 128
+
+
+def aligned_numpy_empty(shape, dtype="float32"):
+    """Allocate a numpy array whose data is aligned like a TVM allocation.
+
+    Such an array can be bound to an executor without copy, see
+    :py:func:`zero_copy_view`.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        The shape of the array.
+
+    dtype : str or numpy.dtype
+        The data type of the array.
+
+    Returns
+    -------
+    arr : numpy.ndarray
+        The uninitialized array.
+    """
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape, dtype="int64")) * dtype.itemsize
+    buf = np.empty(nbytes + _ALLOC_ALIGNMENT, dtype="uint8")
+    offset = -buf.ctypes.data % _ALLOC_ALIGNMENT
+    return buf[offset : offset + nbytes].view(dtype).reshape(shape)
+
+
+class _PooledBlock(object):
+    """The memory of a block of a HostArrayPool, exposed to numpy.
+
+    The arrays drawn from the block keep it as their base, so the block is
+    returned to its pool once all of them are gone.
+    """
+
+    def __init__(self, storage, data, nbytes):
+        self.storage = storage
+        self.__array_interface__ = {
+            "data": (data, False),
+            "shape": (nbytes,),
+            "typestr": "|u1",
+            "version": 3,
+        }
+
+
+class HostArrayPool(object):
+    """A pool of host buffers that numpy and CPU arrays can be drawn from.
+
+    Converting many outputs of the same shapes with :py:func:`NDArray.numpy`
+    allocates and faults in a new buffer every time. Arrays drawn from a pool
+    reuse the buffers of the arrays that are gone: the requests are rounded up
+    to power of two size classes, and a buffer goes back to the free list of
+    its class when the last array viewing it is collected.
+
+    The buffers are aligned like TVM allocations, so they can be bound to
+    executors without copy. Pinned buffers are page-locked by the CUDA driver,
+    which speeds up their copies from and to the GPU.
+
+    Parameters
+    ----------
+    max_cached_bytes : int
+        The largest total size of the free buffers kept for reuse. Buffers
+        released beyond it are freed.
+
+    pinned : bool
+        Whether to allocate page-locked buffers, requires CUDA.
+    """
+
+    _MIN_BLOCK_BYTES = 256
+
+    def __init__(self, max_cached_bytes=1 << 30, pinned=False):
+        self.max_cached_bytes = max_cached_bytes
+        self.pinned = pinned
+        self._free = collections.defaultdict(list)
+        self._lock = threading.Lock()
+        self._cached_bytes = 0
+        self._outstanding_bytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    def _size_class(self, nbytes):
+        size = self._MIN_BLOCK_BYTES
+        while size < nbytes:
+            size *= 2
+        return size
+
+    def _allocate(self, size):
+        if self.pinned:
+            # cudaMallocHost allocations are page aligned
+            storage = empty((size,), "uint8", device(3, 0))
+            return storage, storage.handle.contents.data
+        storage = np.empty(size + _ALLOC_ALIGNMENT, dtype="uint8")
+        return storage, storage.ctypes.data + (-storage.ctypes.data % _ALLOC_ALIGNMENT)
+
+    def _release(self, size, storage):
+        with self._lock:
+            self._outstanding_bytes -= size
+            if self._cached_bytes + size <= self.max_cached_bytes:
+                self._free[size].append(storage)
+                self._cached_bytes += size
+
+    def _take_block(self, nbytes):
+        size = self._size_class(nbytes)
+        with self._lock:
+            self._outstanding_bytes += size
+            if self._free[size]:
+                storage, data = self._free[size].pop()
+                self._cached_bytes -= size
+                self._hits += 1
+            else:
+                storage = None
+                self._misses += 1
+        if storage is None:
+            storage, data = self._allocate(size)
+        block = _PooledBlock(storage, data, size)
+        weakref.finalize(block, self._release, size, (storage, data))
+        return block
+
+    def empty(self, shape, dtype="float32"):
+        """Draw an uninitialized numpy array from the pool.
+
+        Parameters
+        ----------
+        shape : tuple of int
+            The shape of the array.
+
+        dtype : str or numpy.dtype
+            The data type of the array.
+
+        Returns
+        -------
+        arr : numpy.ndarray
+            The array, its buffer returns to the pool when it and all its views
+            are collected.
+        """
+        dtype = np.dtype(dtype)
+        shape = tuple(int(x) for x in shape)
+        nbytes = int(np.prod(shape, dtype="int64")) * dtype.itemsize
+        block = self._take_block(nbytes)
+        return np.asarray(block)[:nbytes].view(dtype).reshape(shape)
+
+    def empty_ndarray(self, shape, dtype="float32"):
+        """Draw an uninitialized CPU NDArray from the pool.
+
+        Parameters
+        ----------
+        shape : tuple of int
+            The shape of the array.
+
+        dtype : str
+            The data type of the array.
+
+        Returns
+        -------
+        arr : NDArray
+            The array, its buffer returns to the pool when it is collected.
+        """
+        return _owning_numpy_view(self.empty(shape, dtype))
+
+    def clear(self):
+        """Free the buffers kept for reuse."""
+        with self._lock:
+            self._free.clear()
+            self._cached_bytes = 0
+
+    def reset_stats(self):
+        """Restart the hit statistics."""
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self):
+        """Get the statistics of the pool since it was created or its statistics
+        were reset.
+
+        Returns
+        -------
+        stats : dict
+            The number of requests served by a free buffer in "hits", the number
+            of new allocations in "misses", the fraction of hits in "hit_rate",
+            and the size in bytes of the buffers kept for reuse in "cached_bytes"
+            and of the ones in use in "outstanding_bytes".
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "cached_bytes": self._cached_bytes,
+                "outstanding_bytes": self._outstanding_bytes,
+            }
+
+
+def _numpy_view(np_data):
+    """Get an NDArray viewing the data of a C-contiguous numpy array.
+
+    The view keeps the numpy array alive, but is passed to packed functions as
+    a DLTensor: only callees that do not keep a reference to it may use it.
+    """
+    arr, shape = numpyasarray(np_data)
+    ret = _make_array(ctypes.cast(ctypes.pointer(arr), TVMArrayHandle), True, False)
+    ret._source = (np_data, arr, shape)
+    return ret
+
+
+class _DLManagedTensor(ctypes.Structure):
+    """DLManagedTensor in dlpack.h"""
+
+
+_DLManagedTensorDeleter = ctypes.CFUNCTYPE(None, ctypes.POINTER(_DLManagedTensor))
+_DLManagedTensor._fields_ = [
+    ("dl_tensor", TVMArray),
+    ("manager_ctx", ctypes.c_void_p),
+    ("deleter", _DLManagedTensorDeleter),
+]
+
+# The numpy arrays owned by the containers made by _owning_numpy_view, with
+# their DLManagedTensor, keyed by the address of the latter.
+_OWNED_NUMPY_SOURCES = {}
+
+
+def _release_numpy_source(managed):
+    _OWNED_NUMPY_SOURCES.pop(ctypes.addressof(managed.contents), None)
+
+
+_c_release_numpy_source = _DLManagedTensorDeleter(_release_numpy_source)
+
+
+def _owning_numpy_view(np_data):
+    """Get an NDArray container viewing the data of a C-contiguous numpy array.
+
+    Unlike :py:func:`_numpy_view`, the container owns a reference to the numpy
+    array, which is dropped when the last reference to the container is gone,
+    in Python or in the runtime. It can thus be kept by the callees.
+    """
+    arr, _ = numpyasarray(np_data)
+    managed = _DLManagedTensor()
+    managed.dl_tensor = arr
+    managed.deleter = _c_release_numpy_source
+    _OWNED_NUMPY_SOURCES[ctypes.addressof(managed)] = (np_data, managed)
+    handle = TVMArrayHandle()
+    try:
+        # the runtime copies the shape, so it does not need to outlive the call
+        check_call(_LIB.TVMArrayFromDLPack(ctypes.byref(managed), ctypes.byref(handle)))
+    except TVMError:
+        del _OWNED_NUMPY_SOURCES[ctypes.addressof(managed)]
+        raise
+    return _make_array(handle, False, False)
+
+
+def _is_compact(handle):
+    tensor = handle.contents
+    if not tensor.strides:
+        return True
+    expected = 1
+    for i in reversed(range(tensor.ndim)):
+        if tensor.shape[i] != 1 and tensor.strides[i] != expected:
+            return False
+        expected *= tensor.shape[i]
+    return True
+
+
+def zero_copy_view(source, device=None, dtype=None, shape=None, container=False):
+    """Get an NDArray sharing the memory of ``source``, or None when it cannot.
+
+    ``source`` can be an NDArray, a numpy.ndarray, an object with ``__dlpack__``
+    or a DLPack capsule. Its memory can be shared when it is compact, aligned
+    like a TVM allocation, and matches ``device``, ``dtype`` and ``shape`` when
+    they are given. Callers fall back to a copy when None is returned.
+
+    Parameters
+    ----------
+    source : object
+        The array to view.
+
+    device : Optional[Device]
+        The device the view must be on.
+
+    dtype : Optional[str]
+        The data type the view must have.
+
+    shape : Optional[tuple of int]
+        The shape the view must have.
+
+    container : bool
+        Whether the view must own a reference to its memory, so it can be kept
+        by the callee. A numpy array can then only be viewed through DLPack.
+
+    Returns
+    -------
+    arr : Optional[NDArray]
+        The view.
+    """
+    if isinstance(source, np.ndarray):
+        if not source.flags["C_CONTIGUOUS"] or source.ctypes.data % _ALLOC_ALIGNMENT != 0:
+            return None
+        if dtype is not None and np.dtype(source.dtype).name != dtype:
+            return None
+        if device is not None and device != cpu(0):
+            return None
+        if shape is not None and tuple(source.shape) != tuple(shape):
+            return None
+        if not container:
+            return _numpy_view(source)
+        if not hasattr(source, "__dlpack__") or not source.flags["WRITEABLE"]:
+            return None
+    if isinstance(source, NDArrayBase):
+        arr = source
+        if container and arr.is_view:
+            return None
+    else:
+        try:
+            arr = from_dlpack(source)
+        except (AttributeError, BufferError, TypeError, TVMError):
+            return None
+    tensor = arr.handle.contents
+    if tensor.byte_offset != 0 or tensor.data is None or tensor.data % _ALLOC_ALIGNMENT != 0:
+        return None
+    if not _is_compact(arr.handle):
+        return None
+    if device is not None and arr.device != device:
+        return None
+    if dtype is not None and arr.dtype != dtype:
+        return None
+    if shape is not None and tuple(arr.shape) != tuple(shape):
+        return None
+    return arr
+
+
 def cpu(dev_id=0):
     """Construct a CPU device
 
@@ -544,7 +925,7 @@ cl = opencl
 mtl = metal
 
 
-def array(arr, device=cpu(0)):
+def array(arr, device=cpu(0), pool=None):
     """Create an array from source arr.
 
     Parameters
@@ -555,6 +936,9 @@ def array(arr, device=cpu(0)):
     device : Device, optional
         The device device to create the array
 
+    pool : Optional[HostArrayPool]
+        The pool drawing the memory of the array, which must be on the CPU.
+
     Returns
     -------
     ret : NDArray
@@ -565,7 +949,7 @@ def array(arr, device=cpu(0)):
 
     if not isinstance(arr, (np.ndarray, NDArray)):
         arr = np.array(arr)
-    return empty(arr.shape, arr.dtype, device).copyfrom(arr)
+    return empty(arr.shape, arr.dtype, device, pool=pool).copyfrom(arr)
 
 
 # Register back to FFI
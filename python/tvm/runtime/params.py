@@ -64,6 +64,43 @@ def load_param_dict(param_bytes):
     params : dict of str to NDArray
         The parameter dictionary.
     """
-    if isinstance(param_bytes, (bytes, str)):
-        param_bytes = bytearray(param_bytes)
     return _ffi_api.LoadParams(param_bytes)
+
+
+def save_param_dict_to_file(params, path):
+    """Save parameter dictionary to a file that can be memory-mapped.
+
+    The tensor data is laid out at page aligned offsets, so the file can be
+    loaded with :py:func:`load_param_dict_from_file` or the "load_params" API
+    of GraphModule without being read as a whole.
+
+    Parameters
+    ----------
+    params : dict of str to NDArray
+        The parameter dictionary.
+
+    path : str
+        The path of the file.
+    """
+    transformed = {k: ndarray.array(v) for (k, v) in params.items()}
+    _ffi_api.SaveParamsToFile(transformed, str(path))
+
+
+def load_param_dict_from_file(path):
+    """Load parameter dictionary from a file by mapping it into memory.
+
+    The returned arrays view the mapping, so their data is only read from the
+    file when it is accessed. Files holding the bytes produced by
+    :py:func:`save_param_dict` are also accepted, but are read eagerly.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+
+    Returns
+    -------
+    params : dict of str to NDArray
+        The parameter dictionary.
+    """
+    return _ffi_api.LoadParamsFromFile(str(path))
@@ -0,0 +1,140 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Pipelined asynchronous execution of requests on an executor.
+
+A request goes through three stages, each served by its own thread: the
+inputs are copied to the device, the executor runs, and the outputs are
+copied back to the host. The stages of consecutive requests overlap, e.g. the
+inputs of a request are copied while the previous one runs. On devices with
+streams, each stage issues its work on its own stream.
+
+The results are :py:class:`concurrent.futures.Future`, which can be awaited
+in asyncio with :py:func:`asyncio.wrap_future`.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .._ffi.runtime_ctypes import Device
+from ..rpc.base import RPC_SESS_MASK
+
+
+class ExecutionPipeline(object):
+    """Run requests through the upload, run and download stages of an executor.
+
+    The requests go through every stage in the order they are submitted, so
+    only one runs on the executor at a time.
+
+    Parameters
+    ----------
+    device : Device
+        The device of the executor, where the streams of the stages are created.
+
+    upload : Callable
+        Called with the arguments of a request in the upload stage, returns the
+        value given to ``run``. Copies the inputs to the device.
+
+    run : Callable
+        Called with the value returned by ``upload`` in the run stage, returns the
+        value given to ``download``. Runs the executor, and must leave the outputs
+        in arrays that the next run does not overwrite.
+
+    download : Callable
+        Called with the value returned by ``run`` in the download stage, returns
+        the result of the request. Copies the outputs to the host.
+    """
+
+    def __init__(self, device, upload, run, download):
+        self.device = device
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._streams = []
+        self._stages = [
+            (ThreadPoolExecutor(max_workers=1), func) for func in [upload, run, download]
+        ]
+
+    def _init_stream(self):
+        # The stream of a device is set per thread, so every stage has its own.
+        # CPU has no streams, and remote devices use the ones of their session.
+        device_type = self.device.device_type
+        if device_type == Device.STR2MASK["cpu"] or device_type >= RPC_SESS_MASK:
+            self._local.stream = None
+            return
+        stream = self.device.create_raw_stream()
+        self.device.set_raw_stream(stream)
+        self._local.stream = stream
+        with self._lock:
+            self._streams.append(stream)
+
+    def _submit_stage(self, index, result, args, kwargs):
+        pool, func = self._stages[index]
+
+        def call():
+            if index == 0 and not result.set_running_or_notify_cancel():
+                return
+            try:
+                if not hasattr(self._local, "stream"):
+                    # on the first request served by the thread of the stage
+                    self._init_stream()
+                value = func(*args, **kwargs)
+                if self._local.stream is not None:
+                    self.device.sync(self._local.stream)
+            # pylint: disable=broad-except
+            except Exception as err:
+                result.set_exception(err)
+                return
+            if index + 1 < len(self._stages):
+                self._submit_stage(index + 1, result, (value,), {})
+            else:
+                result.set_result(value)
+
+        pool.submit(call)
+
+    def submit(self, *args, **kwargs):
+        """Queue a request.
+
+        Parameters
+        ----------
+        args : list
+            The positional arguments of the upload stage.
+
+        kwargs : dict
+            The named arguments of the upload stage.
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            Resolves to the value returned by the download stage.
+        """
+        result = Future()
+        self._submit_stage(0, result, args, kwargs)
+        return result
+
+    def close(self):
+        """Finish the queued requests, stop the stages and join their threads."""
+        # in stage order, so the requests still flow to the next stages
+        for pool, _ in self._stages:
+            pool.shutdown(wait=True)
+        with self._lock:
+            for stream in self._streams:
+                self.device.free_raw_stream(stream)
+            self._streams = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -20,6 +20,9 @@ The Relay Virtual Machine runtime.
 
 Implements a Python interface to executing the compiled VM object.
 """
+import os
+import threading
+
 import numpy as np
 
 import tvm
@@ -27,22 +30,32 @@ from tvm.runtime import Module
 from tvm._ffi.runtime_ctypes import TVMByteArray
 from tvm._ffi import base as _base
 from .object import Object
+from .pipeline import ExecutionPipeline
+from .profiling import Report
 from . import _ffi_api, container
 from ..rpc.base import RPC_SESS_MASK
 
 
-def _convert(arg, cargs):
+def _convert(arg, cargs, zero_copy=False):
     if isinstance(arg, Object):
         cargs.append(arg)
     elif isinstance(arg, np.ndarray):
-        nd_arr = tvm.nd.array(arg, device=tvm.cpu(0))
+        nd_arr = tvm.nd.zero_copy_view(arg, container=True) if zero_copy else None
+        if nd_arr is None:
+            nd_arr = tvm.nd.array(arg, device=tvm.cpu(0))
         cargs.append(nd_arr)
     elif isinstance(arg, tvm.runtime.NDArray):
         cargs.append(arg)
+    elif zero_copy and hasattr(arg, "__dlpack__"):
+        nd_arr = tvm.nd.zero_copy_view(arg, container=True)
+        if nd_arr is None:
+            src = tvm.nd.from_dlpack(arg)
+            nd_arr = tvm.nd.empty(src.shape, src.dtype, src.device).copyfrom(src)
+        cargs.append(nd_arr)
     elif isinstance(arg, (tuple, list)):
         field_args = []
         for field in arg:
-            _convert(field, field_args)
+            _convert(field, field_args, zero_copy)
         cargs.append(container.tuple_object(field_args))
     elif isinstance(arg, (_base.numeric_types, bool)):
         dtype = "int32" if isinstance(arg, (_base.integer_types, bool)) else "float32"
@@ -54,14 +67,22 @@ def _convert(arg, cargs):
         raise TypeError("Unsupported type: %s" % (type(arg)))
 
 
-def convert(args):
+def convert(args, zero_copy=False):
     cargs = []
     for arg in args:
-        _convert(arg, cargs)
+        _convert(arg, cargs, zero_copy)
 
     return cargs
 
 
+def _to_numpy(obj):
+    if isinstance(obj, tvm.runtime.NDArray):
+        return obj.numpy()
+    if isinstance(obj, container.ADT):
+        return [_to_numpy(field) for field in obj]
+    return obj
+
+
 class Executable(object):
     """Relay VM executable"""
 
@@ -69,6 +90,7 @@ class Executable(object):
         self.mod = mod
         self._function_params = {}
         self._save = self.mod["save"]
+        self._save_to_file = self.mod["save_to_file"]
         self._get_lib = self.mod["get_lib"]
         self._get_bytecode = self.mod["get_bytecode"]
         self._get_stats = self.mod["get_stats"]
@@ -141,14 +163,43 @@ class Executable(object):
         """
         return self._save(), self._get_lib()
 
+    def save_to_file(self, path):
+        """Save the Relay VM Executable to a file whose constants can be memory-mapped.
+
+        The file holds the sections of :py:func:`save` without the data of the
+        constants, followed by the constants at page aligned offsets. Loading it
+        with :py:func:`load_exec` maps the file instead of reading it, and the
+        data of a constant is only read from the file when the constant is
+        first used. The library is not saved, export it with ``export_library``.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            executable = relay.vm.compile(mod, target)
+            executable.lib.export_library("lib.so")
+            executable.save_to_file("code.ro")
+            # later, or in another process
+            loaded_lib = tvm.runtime.load_module("lib.so")
+            des_exec = tvm.runtime.vm.Executable.load_exec("code.ro", loaded_lib)
+        """
+        self._save_to_file(str(path))
+
     @staticmethod
     def load_exec(bytecode, lib):
         """Construct an executable from saved artifacts.
 
         Parameters
         ----------
-        bytecode : bytearray
-            The binary blob representing a the Relay VM bytecode.
+        bytecode : bytearray or bytes or str or PathLike
+            The binary blob representing a the Relay VM bytecode, or the path of
+            a file written by :py:func:`save_to_file`.
 
         lib : :py:class:`~tvm.runtime.Module`
             The runtime module that contains the generated code.
@@ -158,20 +209,20 @@ class Executable(object):
         exec: Executable
             An executable constructed using the provided artifacts.
         """
-        if isinstance(bytecode, (bytes, str)):
-            code = bytearray(bytecode)
-        elif not isinstance(bytecode, (bytearray, TVMByteArray)):
-            raise TypeError(
-                "bytecode is expected to be the type of bytearray "
-                + "or TVMByteArray, but received {}".format(type(code))
-            )
-
         if lib is not None and not isinstance(lib, tvm.runtime.Module):
             raise TypeError(
                 "lib is expected to be the type of tvm.runtime.Module"
                 + ", but received {}".format(type(lib))
             )
 
+        if isinstance(bytecode, (str, os.PathLike)):
+            return Executable(_ffi_api.Load_ExecutableFromFile(str(bytecode), lib))
+        if not isinstance(bytecode, (bytes, bytearray, TVMByteArray)):
+            raise TypeError(
+                "bytecode is expected to be the type of bytearray "
+                + "or TVMByteArray, but received {}".format(type(bytecode))
+            )
+
         return Executable(_ffi_api.Load_Executable(bytecode, lib))
 
     @property
@@ -349,6 +400,9 @@ class VirtualMachine(object):
         self._get_num_outputs = self.module["get_num_outputs"]
         self._get_input_index = self.module["get_input_index"]
         self._set_input = self.module["set_input"]
+        self._output_buffers = []
+        self._pipeline = None
+        self._pipeline_lock = threading.Lock()
         self._setup_device(device, memory_cfg)
 
     def _setup_device(self, dev, memory_cfg):
@@ -361,6 +415,7 @@ class VirtualMachine(object):
                                 List[Device]"
                 )
             devs = [dev]
+        self._device = devs[0]
 
         # CPU is required for executing shape functions
         if not any(c.device_type % RPC_SESS_MASK == tvm.cpu().device_type for c in devs):
@@ -401,6 +456,36 @@ class VirtualMachine(object):
         kwargs: dict of str to tvm.runtime.NDArray or np.ndarray
             Named arguments to the function.
         """
+        args = self._map_kwargs(func_name, args, kwargs)
+        cargs = convert(args)
+        self._set_input(func_name, *cargs)
+
+    def set_input_zero_copy(self, func_name, *args, **kwargs):
+        """Set the input to a function, sharing the memory of the arrays when possible.
+
+        NumPy arrays and DLPack producers are passed to the VM without copy when
+        they are C-contiguous and aligned like a TVM allocation (see
+        :py:func:`tvm.nd.aligned_numpy_empty`), and are copied otherwise. NumPy
+        arrays are shared through DLPack, which requires NumPy 1.22 or newer and
+        writeable arrays. The arrays must not be modified while the function runs.
+
+        Parameters
+        ----------
+        func_name : str
+            The name of the function.
+
+        args : list[tvm.runtime.NDArray] or list[np.ndarray]
+            The arguments to the function.
+
+        kwargs: dict of str to tvm.runtime.NDArray or np.ndarray
+            Named arguments to the function.
+        """
+        args = self._map_kwargs(func_name, args, kwargs)
+        cargs = convert(args, zero_copy=True)
+        self._set_input(func_name, *cargs)
+
+    def _map_kwargs(self, func_name, args, kwargs):
+        """Merge the named arguments of a function into its positional arguments."""
         if kwargs:
             # kwargs is a super set of the required function parameters. We
             # only find the ones that are needed.
@@ -419,8 +504,7 @@ class VirtualMachine(object):
                     new_args[i] = args[idx]
                     idx += 1
             args = new_args
-        cargs = convert(args)
-        self._set_input(func_name, *cargs)
+        return args
 
     def invoke(self, func_name, *args, **kwargs):
         """Invoke a function.
@@ -443,7 +527,9 @@ class VirtualMachine(object):
         """
         if args or kwargs:
             self.set_input(func_name, *args, **kwargs)
-        return self._invoke(func_name)
+        result = self._invoke(func_name)
+        self._copy_outputs()
+        return result
 
     def run(self, *args, **kwargs):
         """Run the main function.
@@ -463,6 +549,116 @@ class VirtualMachine(object):
         """
         return self.invoke("main", *args, **kwargs)
 
+    def invoke_async(self, func_name, *args, **kwargs):
+        """Invoke a function without waiting for it.
+
+        The requests are pipelined: the inputs of a request are copied to the
+        device while the previous request runs, and its outputs are copied back
+        while the next one runs. Each step is done by its own thread, on its own
+        stream on devices that support them. The requests run in the order they
+        are submitted, and the VM must not be used synchronously until they are
+        done. :py:func:`close_async` stops the threads.
+
+        Parameters
+        ----------
+        func_name : str
+            The name of the function.
+
+        args : list[tvm.runtime.NDArray] or list[np.ndarray]
+            The arguments to the function.
+
+        kwargs: dict of str to tvm.runtime.NDArray or np.ndarray
+            Named arguments to the function.
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            Resolves to the output, with its tensors as numpy arrays and its tuples
+            as lists. In asyncio, await ``asyncio.wrap_future(future)``.
+        """
+        with self._pipeline_lock:
+            if self._pipeline is None:
+                self._pipeline = ExecutionPipeline(
+                    self._device, self._upload_inputs, self._run_uploaded, _to_numpy
+                )
+            return self._pipeline.submit(func_name, *args, **kwargs)
+
+    def run_async(self, *args, **kwargs):
+        """Run the main function without waiting for it, see :py:func:`invoke_async`.
+
+        Parameters
+        ----------
+        args : list[tvm.runtime.NDArray] or list[np.ndarray]
+            The arguments to the function.
+
+        kwargs: dict of str to tvm.runtime.NDArray or np.ndarray
+            Named arguments to the function.
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            Resolves to the output.
+        """
+        return self.invoke_async("main", *args, **kwargs)
+
+    def close_async(self):
+        """Finish the requests submitted with :py:func:`invoke_async` and stop the
+        threads running them. A later request starts them again."""
+        with self._pipeline_lock:
+            if self._pipeline is not None:
+                self._pipeline.close()
+                self._pipeline = None
+
+    def _upload_inputs(self, func_name, *args, **kwargs):
+        cargs = convert(self._map_kwargs(func_name, args, kwargs))
+        device = self._device
+        for i, arg in enumerate(cargs):
+            if isinstance(arg, tvm.runtime.NDArray) and arg.device != device:
+                cargs[i] = arg.copyto(device)
+        return func_name, cargs
+
+    def _run_uploaded(self, request):
+        # the VM allocates new outputs in every run
+        func_name, cargs = request
+        return self.invoke(func_name, *cargs)
+
+    def enable_sampling_profiler(self, interval=100, capacity=100):
+        """Record the per-operator timings of one invocation out of ``interval``.
+
+        Sampled invocations time every operator, other invocations only increment
+        a counter, so the profiler can stay enabled while serving. The durations of
+        the last ``capacity`` sampled invocations are kept, see
+        :py:func:`sampling_report`. Enabling the profiler again clears them. It
+        must not be enabled or disabled while a function runs.
+
+        Parameters
+        ----------
+        interval : int
+            Record one invocation out of ``interval``.
+
+        capacity : int
+            The number of sampled invocations kept.
+        """
+        self.module["set_sampling_profiler"](interval, capacity)
+
+    def disable_sampling_profiler(self):
+        """Stop recording the per-operator timings of the invocations."""
+        self.module["set_sampling_profiler"](0, 0)
+
+    def sampling_report(self):
+        """Summarize the invocations recorded by the sampling profiler.
+
+        Returns
+        -------
+        report : tvm.runtime.profiling.Report
+            The total duration and number of calls of each operator on each device
+            over the sampled invocations, and in its device metrics the total duration
+            and number of the sampled invocations.
+        """
+        if self.module.type_key == "rpc":
+            return Report.from_json(self.module["get_sampling_report_rpc"]())
+        return self.module["get_sampling_report"]()
+
     def invoke_stateful(self, func_name, *args, **kwargs):
         """Invoke a function and ignore the returned result.
 
@@ -484,6 +680,28 @@ class VirtualMachine(object):
         if args or kwargs:
             self.set_input(func_name, *args, **kwargs)
         self._invoke_stateful(func_name)
+        self._copy_outputs()
+
+    def set_output_buffers(self, *buffers):
+        """Register persistent destination arrays for the outputs of the VM.
+
+        After every following :py:func:`invoke`, :py:func:`run` or
+        :py:func:`invoke_stateful`, the i-th output is copied into ``buffers[i]``
+        with a single copy, so a serving loop can read its results without
+        allocating arrays. :py:func:`get_outputs` then returns the buffers. An
+        output whose buffer is None is left to the VM.
+
+        Parameters
+        ----------
+        buffers : list of numpy.ndarray or NDArray
+            The destination arrays, with the shape and dtype of the outputs.
+        """
+        self._output_buffers = list(buffers)
+
+    def _copy_outputs(self):
+        for i, buf in enumerate(self._output_buffers):
+            if buf is not None:
+                self._get_output(i).copyto(buf)
 
     def get_outputs(self):
         """Get the outputs from a call to :py:func`invoke_stateful`.
@@ -491,8 +709,15 @@ class VirtualMachine(object):
         Returns
         -------
         outputs : List[NDArray]
+            The outputs, or the registered output buffers holding them.
         """
-        return [self._get_output(i) for i in range(self._get_num_outputs())]
+        outputs = []
+        for i in range(self._get_num_outputs()):
+            if i < len(self._output_buffers) and self._output_buffers[i] is not None:
+                outputs.append(self._output_buffers[i])
+            else:
+                outputs.append(self._get_output(i))
+        return outputs
 
     def get_input_index(self, input_name, func_name="main"):
         """Get inputs index via input name.
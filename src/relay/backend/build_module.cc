@@ -46,6 +46,17 @@ namespace backend {
 using TargetsMap = Map<tvm::Integer, tvm::Target>;
 using namespace tvm::relay::transform;
 
+/*!
+ * \brief The directory of the persistent kernel cache, see
+ * python/tvm/relay/backend/kernel_cache.py. The kernels are built without it when it is not set.
+ */
+TVM_REGISTER_PASS_CONFIG_OPTION("relay.backend.kernel_cache_dir", String);
+/*!
+ * \brief The number of threads generating the code of the kernels, see
+ * python/tvm/relay/backend/kernel_cache.py. Defaults to 1.
+ */
+TVM_REGISTER_PASS_CONFIG_OPTION("relay.backend.num_build_workers", Integer);
+
 /*!
  * \brief Output of building module
  */
@@ -530,7 +541,19 @@ class RelayBuildModule : public runtime::ModuleNode {
         ret_.mod = tvm::codegen::CSourceModuleCreate(";", "", Array<String>{});
       }
     } else {
-      ret_.mod = tvm::build(lowered_funcs, target_host_);
+      // Build the kernels separately when they are cached, or generated in parallel.
+      auto pass_ctx = transform::PassContext::Current();
+      Optional<String> cache_dir = pass_ctx->GetConfig<String>("relay.backend.kernel_cache_dir");
+      Integer num_workers =
+          pass_ctx->GetConfig<Integer>("relay.backend.num_build_workers", Integer(1)).value();
+      const runtime::PackedFunc* build_kernels =
+          runtime::Registry::Get("relay.backend.build_kernels");
+      if ((cache_dir.defined() || num_workers->value > 1) && build_kernels != nullptr) {
+        ret_.mod =
+            (*build_kernels)(lowered_funcs, target_host_, cache_dir.value_or(""), num_workers);
+      } else {
+        ret_.mod = tvm::build(lowered_funcs, target_host_);
+      }
     }
 
     auto ext_mods = executor_codegen_->GetExternalModules();
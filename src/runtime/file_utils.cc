@@ -28,6 +28,19 @@
 #include <tvm/runtime/registry.h>
 #include <tvm/runtime/serializer.h>
 
+#ifdef _WIN32
+#ifndef NOMINMAX
+#define NOMINMAX
+#endif
+#include <windows.h>
+#else
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
+#include <algorithm>
 #include <fstream>
 #include <unordered_map>
 #include <vector>
@@ -216,6 +229,266 @@ std::string SaveParams(const Map<String, NDArray>& params) {
   return bytes;
 }
 
+/*! \brief Read-only view of a whole file, mapped copy-on-write. */
+class MappedFile {
+ public:
+  explicit MappedFile(const std::string& path) {
+#ifdef _WIN32
+    HANDLE file = CreateFileA(path.c_str(), GENERIC_READ, FILE_SHARE_READ, nullptr, OPEN_EXISTING,
+                              FILE_ATTRIBUTE_NORMAL, nullptr);
+    ICHECK(file != INVALID_HANDLE_VALUE) << "Cannot open file " << path;
+    LARGE_INTEGER file_size;
+    ICHECK(GetFileSizeEx(file, &file_size)) << "Cannot get the size of " << path;
+    size_ = static_cast<size_t>(file_size.QuadPart);
+    if (size_ != 0) {
+      HANDLE mapping = CreateFileMappingA(file, nullptr, PAGE_WRITECOPY, 0, 0, nullptr);
+      ICHECK(mapping != nullptr) << "Cannot map file " << path;
+      data_ = static_cast<char*>(MapViewOfFile(mapping, FILE_MAP_COPY, 0, 0, 0));
+      CloseHandle(mapping);
+      ICHECK(data_ != nullptr) << "Cannot map file " << path;
+    }
+    CloseHandle(file);
+#else
+    int fd = open(path.c_str(), O_RDONLY);
+    ICHECK_GE(fd, 0) << "Cannot open file " << path;
+    struct stat st;
+    ICHECK_EQ(fstat(fd, &st), 0) << "Cannot get the size of " << path;
+    size_ = static_cast<size_t>(st.st_size);
+    if (size_ != 0) {
+      // private writable mapping: the arrays can be written without touching the file
+      void* data = mmap(nullptr, size_, PROT_READ | PROT_WRITE, MAP_PRIVATE, fd, 0);
+      ICHECK(data != MAP_FAILED) << "Cannot map file " << path;
+      data_ = static_cast<char*>(data);
+    }
+    close(fd);
+#endif
+  }
+
+  ~MappedFile() {
+    if (data_ == nullptr) return;
+#ifdef _WIN32
+    UnmapViewOfFile(data_);
+#else
+    munmap(data_, size_);
+#endif
+  }
+
+  char* data() const { return data_; }
+
+  size_t size() const { return size_; }
+
+  void Release(size_t offset, size_t nbytes) const {
+#ifndef _WIN32
+    size_t page = static_cast<size_t>(sysconf(_SC_PAGESIZE));
+    size_t begin = (offset + page - 1) / page * page;
+    size_t end = std::min(offset + nbytes, size_) / page * page;
+    if (end > begin) {
+      madvise(data_ + begin, end - begin, MADV_DONTNEED);
+    }
+#endif
+  }
+
+ private:
+  char* data_{nullptr};
+  size_t size_{0};
+};
+
+/*! \brief The DLPack manager of an NDArray viewing a mapped file. */
+struct MappedTensor {
+  std::shared_ptr<MappedFile> file;
+  std::vector<int64_t> shape;
+  DLManagedTensor tensor;
+
+  static void Deleter(DLManagedTensor* self) {
+    delete static_cast<MappedTensor*>(self->manager_ctx);
+  }
+};
+
+/*! \brief Write the header of a parameter file, the tensor locations are given in entries. */
+static void WriteParamFileHeader(dmlc::Stream* strm, const std::vector<std::string>& names,
+                                 const std::vector<const DLTensor*>& arrays,
+                                 const std::vector<uint64_t>& offsets) {
+  uint64_t header = kTVMParamFileMagic, alignment = kParamFileAlignment;
+  strm->Write(header);
+  strm->Write(alignment);
+  strm->Write(names);
+  uint64_t sz = static_cast<uint64_t>(arrays.size());
+  strm->Write(sz);
+  for (size_t i = 0; i < arrays.size(); ++i) {
+    const DLTensor* tensor = arrays[i];
+    std::vector<int64_t> shape(tensor->shape, tensor->shape + tensor->ndim);
+    uint64_t nbytes = static_cast<uint64_t>(GetDataSize(*tensor));
+    strm->Write(tensor->dtype);
+    strm->Write(shape);
+    strm->Write(offsets[i]);
+    strm->Write(nbytes);
+  }
+}
+
+void SaveParamsToFile(std::ostream* os, const Map<String, NDArray>& params) {
+  std::vector<std::string> names;
+  std::vector<NDArray> cpu_arrays;
+  std::vector<const DLTensor*> arrays;
+  for (auto& p : params) {
+    names.push_back(p.first);
+    NDArray arr = p.second;
+    if (arr->device.device_type != kDLCPU) {
+      arr = arr.CopyTo(Device{kDLCPU, 0});
+    }
+    cpu_arrays.push_back(arr);
+    arrays.push_back(arr.operator->());
+  }
+  auto align = [](uint64_t offset) {
+    return (offset + kParamFileAlignment - 1) / kParamFileAlignment * kParamFileAlignment;
+  };
+  // The header size does not depend on the offsets, measure it first.
+  std::vector<uint64_t> offsets(arrays.size(), 0);
+  std::string header;
+  {
+    dmlc::MemoryStringStream strm(&header);
+    WriteParamFileHeader(&strm, names, arrays, offsets);
+  }
+  uint64_t offset = header.size();
+  for (size_t i = 0; i < arrays.size(); ++i) {
+    offsets[i] = align(offset);
+    offset = offsets[i] + GetDataSize(*arrays[i]);
+  }
+  header.clear();
+  {
+    dmlc::MemoryStringStream strm(&header);
+    WriteParamFileHeader(&strm, names, arrays, offsets);
+  }
+
+  os->write(header.data(), header.size());
+  offset = header.size();
+  std::string padding(kParamFileAlignment, '\0');
+  std::vector<char> swapped;
+  for (size_t i = 0; i < arrays.size(); ++i) {
+    os->write(padding.data(), offsets[i] - offset);
+    const DLTensor* tensor = arrays[i];
+    size_t nbytes = GetDataSize(*tensor);
+    const char* data = static_cast<const char*>(tensor->data) + tensor->byte_offset;
+    if (!DMLC_IO_NO_ENDIAN_SWAP) {
+      swapped.assign(data, data + nbytes);
+      int elem_bytes = (tensor->dtype.bits + 7) / 8;
+      dmlc::ByteSwap(swapped.data(), elem_bytes, nbytes / elem_bytes);
+      data = swapped.data();
+    }
+    os->write(data, nbytes);
+    offset = offsets[i] + nbytes;
+  }
+}
+
+void SaveParamsToFile(const std::string& path, const Map<String, NDArray>& params) {
+  std::ofstream fs(path, std::ios::out | std::ios::binary);
+  ICHECK(!fs.fail()) << "Cannot open " << path;
+  SaveParamsToFile(&fs, params);
+  ICHECK(!fs.fail()) << "Cannot write " << path;
+}
+
+MappedParamFile::MappedParamFile(const std::string& path, uint64_t offset)
+    : file_(std::make_shared<MappedFile>(path)), base_(offset) {
+  ICHECK_LE(base_, file_->size()) << "Invalid parameters offset in " << path;
+  dmlc::MemoryFixedSizeStream strm(file_->data() + base_, file_->size() - base_);
+  uint64_t header, alignment;
+  ICHECK(strm.Read(&header)) << "Invalid parameters file format";
+  if (header == kTVMNDArrayListMagic) {
+    strm.Seek(0);
+    Map<String, NDArray> params = LoadParams(&strm);
+    for (auto& p : params) {
+      entries_.push_back(Entry{p.first, p.second.DataType(), {}, 0, 0});
+      loaded_.push_back(p.second);
+    }
+    file_.reset();
+    return;
+  }
+  ICHECK(header == kTVMParamFileMagic) << "Invalid parameters file format";
+  ICHECK(strm.Read(&alignment)) << "Invalid parameters file format";
+  std::vector<std::string> names;
+  ICHECK(strm.Read(&names)) << "Invalid parameters file format";
+  uint64_t sz;
+  ICHECK(strm.Read(&sz)) << "Invalid parameters file format";
+  ICHECK(sz == names.size()) << "Invalid parameters file format";
+  for (size_t i = 0; i < names.size(); ++i) {
+    Entry entry;
+    entry.name = names[i];
+    ICHECK(strm.Read(&entry.dtype)) << "Invalid parameters file format";
+    ICHECK(strm.Read(&entry.shape)) << "Invalid parameters file format";
+    ICHECK(strm.Read(&entry.offset)) << "Invalid parameters file format";
+    ICHECK(strm.Read(&entry.nbytes)) << "Invalid parameters file format";
+    ICHECK_LE(base_ + entry.offset + entry.nbytes, file_->size()) << "Truncated parameters file";
+    entries_.push_back(std::move(entry));
+  }
+}
+
+DLTensor MappedParamFile::GetDLTensor(size_t i) const {
+  const Entry& entry = entries_[i];
+  DLTensor tensor;
+  tensor.data = file_->data() + base_ + entry.offset;
+  tensor.device = Device{kDLCPU, 0};
+  tensor.ndim = static_cast<int>(entry.shape.size());
+  tensor.dtype = entry.dtype;
+  tensor.shape = const_cast<int64_t*>(entry.shape.data());
+  tensor.strides = nullptr;
+  tensor.byte_offset = 0;
+  return tensor;
+}
+
+NDArray MappedParamFile::View(size_t i) const {
+  ICHECK_LT(i, entries_.size());
+  if (!loaded_.empty()) return loaded_[i];
+  const Entry& entry = entries_[i];
+  if (!DMLC_IO_NO_ENDIAN_SWAP) {
+    NDArray ret = NDArray::Empty(ShapeTuple(entry.shape), entry.dtype, Device{kDLCPU, 0});
+    this->CopyTo(i, ret);
+    return ret;
+  }
+  MappedTensor* mapped = new MappedTensor();
+  mapped->file = file_;
+  mapped->shape = entry.shape;
+  mapped->tensor.dl_tensor = GetDLTensor(i);
+  mapped->tensor.dl_tensor.shape = mapped->shape.data();
+  mapped->tensor.manager_ctx = mapped;
+  mapped->tensor.deleter = MappedTensor::Deleter;
+  return NDArray::FromDLPack(&mapped->tensor);
+}
+
+void MappedParamFile::CopyTo(size_t i, NDArray dst) const {
+  ICHECK_LT(i, entries_.size());
+  if (!loaded_.empty()) {
+    dst.CopyFrom(loaded_[i]);
+    return;
+  }
+  DLTensor tensor = GetDLTensor(i);
+  if (!DMLC_IO_NO_ENDIAN_SWAP) {
+    const Entry& entry = entries_[i];
+    std::vector<char> swapped(static_cast<char*>(tensor.data),
+                              static_cast<char*>(tensor.data) + entry.nbytes);
+    int elem_bytes = (entry.dtype.bits + 7) / 8;
+    dmlc::ByteSwap(swapped.data(), elem_bytes, entry.nbytes / elem_bytes);
+    tensor.data = swapped.data();
+    dst.CopyFrom(&tensor);
+    return;
+  }
+  dst.CopyFrom(&tensor);
+}
+
+void MappedParamFile::Release(size_t i) const {
+  ICHECK_LT(i, entries_.size());
+  if (file_ != nullptr) {
+    file_->Release(base_ + entries_[i].offset, entries_[i].nbytes);
+  }
+}
+
+Map<String, NDArray> LoadParamsFromFile(const std::string& path) {
+  MappedParamFile file(path);
+  Map<String, NDArray> params;
+  for (size_t i = 0; i < file.size(); ++i) {
+    params.Set(file.name(i), file.View(i));
+  }
+  return params;
+}
+
 TVM_REGISTER_GLOBAL("runtime.SaveParams").set_body_typed([](const Map<String, NDArray>& params) {
   std::string s = ::tvm::runtime::SaveParams(params);
   // copy return array so it is owned by the ret value
@@ -226,6 +499,13 @@ TVM_REGISTER_GLOBAL("runtime.SaveParams").set_body_typed([](const Map<String, ND
 TVM_REGISTER_GLOBAL("runtime.LoadParams").set_body_typed([](const String& s) {
   return ::tvm::runtime::LoadParams(s);
 });
+TVM_REGISTER_GLOBAL("runtime.SaveParamsToFile")
+    .set_body_typed([](const Map<String, NDArray>& params, const String& path) {
+      ::tvm::runtime::SaveParamsToFile(path, params);
+    });
+TVM_REGISTER_GLOBAL("runtime.LoadParamsFromFile").set_body_typed([](const String& path) {
+  return ::tvm::runtime::LoadParamsFromFile(path);
+});
 
 }  // namespace runtime
 }  // namespace tvm
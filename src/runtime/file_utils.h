@@ -26,9 +26,13 @@
 
 #include <tvm/runtime/container/map.h>
 #include <tvm/runtime/container/string.h>
+#include <tvm/runtime/ndarray.h>
 
+#include <memory>
+#include <ostream>
 #include <string>
 #include <unordered_map>
+#include <vector>
 
 #include "meta_data.h"
 
@@ -121,6 +125,96 @@ std::string SaveParams(const Map<String, NDArray>& params);
  * \param params Parameters to save.
  */
 void SaveParams(dmlc::Stream* strm, const Map<String, NDArray>& params);
+
+constexpr uint64_t kTVMParamFileMagic = 0xF7E58D4F05049CB8;
+/*! \brief Alignment of the tensor data in a parameter file. */
+constexpr uint64_t kParamFileAlignment = 4096;
+/*!
+ * \brief Save parameters to a file that can be memory-mapped by LoadParamsFromFile.
+ *
+ *  The tensor data is stored in little endian at offsets aligned to kParamFileAlignment,
+ *  after a header listing the name, dtype, shape and location of every tensor.
+ * \param path The file path.
+ * \param params Parameters to save.
+ */
+void SaveParamsToFile(const std::string& path, const Map<String, NDArray>& params);
+/*!
+ * \brief Write parameters in the format of SaveParamsToFile to an output stream.
+ *
+ *  The tensor offsets are relative to the position of the stream when it is called, which
+ *  must be aligned to kParamFileAlignment within the file for the data to be mapped.
+ * \param os The output stream.
+ * \param params Parameters to save.
+ */
+void SaveParamsToFile(std::ostream* os, const Map<String, NDArray>& params);
+
+class MappedFile;
+
+/*!
+ * \brief A parameter file mapped into memory.
+ *
+ *  Files written by SaveParamsToFile are not read: the tensors are served from the mapping,
+ *  so their pages are only loaded when touched. The blobs written by SaveParams are also
+ *  accepted, they are deserialized when the file is opened.
+ */
+class MappedParamFile {
+ public:
+  /*!
+   * \brief Map a parameter file.
+   * \param path The file path.
+   * \param offset The position of the parameters in the file, a multiple of
+   *  kParamFileAlignment when they are embedded in a larger file.
+   */
+  explicit MappedParamFile(const std::string& path, uint64_t offset = 0);
+  /*! \return The number of tensors in the file. */
+  size_t size() const { return entries_.size(); }
+  /*!
+   * \param i The tensor index.
+   * \return The name of the i-th tensor.
+   */
+  const std::string& name(size_t i) const { return entries_[i].name; }
+  /*!
+   * \brief Get a CPU NDArray viewing the data of the i-th tensor in the mapping.
+   *  The array keeps the mapping alive.
+   * \param i The tensor index.
+   */
+  NDArray View(size_t i) const;
+  /*!
+   * \brief Copy the i-th tensor straight from the mapping to an array on any device.
+   * \param i The tensor index.
+   * \param dst The destination array, of the same shape and dtype.
+   */
+  void CopyTo(size_t i, NDArray dst) const;
+  /*!
+   * \brief Hint that the data of the i-th tensor is no longer needed by this process,
+   *  so its pages can be dropped. Arrays from View still read the file contents afterwards.
+   * \param i The tensor index.
+   */
+  void Release(size_t i) const;
+
+ private:
+  struct Entry {
+    std::string name;
+    DLDataType dtype;
+    std::vector<int64_t> shape;
+    uint64_t offset;
+    uint64_t nbytes;
+  };
+  DLTensor GetDLTensor(size_t i) const;
+  std::shared_ptr<MappedFile> file_;
+  /*! \brief The position of the parameters in the file. */
+  uint64_t base_{0};
+  std::vector<Entry> entries_;
+  /*! \brief The deserialized tensors of a file in the SaveParams format. */
+  std::vector<NDArray> loaded_;
+};
+
+/*!
+ * \brief Load parameters from a file by mapping it into memory.
+ * \param path The file path.
+ * \return Map of parameter name to a CPU NDArray viewing the mapping.
+ */
+Map<String, NDArray> LoadParamsFromFile(const std::string& path);
 }  // namespace runtime
 }  // namespace tvm
 #endif  // TVM_RUNTIME_FILE_UTILS_H_
@@ -30,12 +30,17 @@
 #include <tvm/runtime/profiling.h>
 #include <tvm/runtime/registry.h>
 #include <tvm/runtime/serializer.h>
+#include <tvm/runtime/threading_backend.h>
 
 #include <algorithm>
+#include <atomic>
+#include <exception>
 #include <functional>
 #include <memory>
+#include <mutex>
 #include <numeric>
 #include <string>
+#include <thread>
 #include <unordered_set>
 #include <utility>
 #include <vector>
@@ -56,6 +61,19 @@ inline size_t GetDataAlignment(const DLTensor& arr) {
  * \brief Run all the operations one by one.
  */
 void GraphExecutor::Run() {
+  // hold the sampler for the whole run
+  std::shared_ptr<profiling::SamplingProfiler> sampler = sampler_;
+  if (sampler != nullptr && sampler->StartRun()) {
+    for (size_t i = 0; i < op_execs_.size(); ++i) {
+      if (op_execs_[i]) {
+        sampler->StartCall(nodes_[i].param.func_name, data_entry_[entry_id(i, 0)]->device);
+        op_execs_[i]();
+        sampler->StopCall();
+      }
+    }
+    sampler->StopRun();
+    return;
+  }
   // setup the array and requirements.
   for (size_t i = 0; i < op_execs_.size(); ++i) {
     if (op_execs_[i]) op_execs_[i]();
@@ -259,6 +277,44 @@ void GraphExecutor::LoadParams(dmlc::Stream* strm) {
   }
 }
 
+void GraphExecutor::LoadParamsFromFile(const std::string& path) {
+  MappedParamFile file(path);
+  std::vector<std::pair<size_t, uint32_t>> todo;
+  for (size_t i = 0; i < file.size(); ++i) {
+    int in_idx = GetInputIndex(file.name(i));
+    if (in_idx < 0) continue;
+    todo.emplace_back(i, this->entry_id(input_nodes_[in_idx], 0));
+  }
+  // Pages are only read when copied, and dropped once the copy is done,
+  // so at most one copy of the weights is resident.
+  std::atomic<size_t> next{0};
+  std::exception_ptr error;
+  std::mutex error_mutex;
+  auto worker = [&]() {
+    try {
+      for (size_t k = next++; k < todo.size(); k = next++) {
+        file.CopyTo(todo[k].first, data_entry_[todo[k].second]);
+        file.Release(todo[k].first);
+      }
+    } catch (...) {
+      std::lock_guard<std::mutex> lock(error_mutex);
+      if (!error) error = std::current_exception();
+      next = todo.size();
+    }
+  };
+  size_t num_threads =
+      std::min(todo.size(), static_cast<size_t>(std::max(threading::MaxConcurrency(), 1)));
+  std::vector<std::thread> threads;
+  for (size_t i = 1; i < num_threads; ++i) {
+    threads.emplace_back(worker);
+  }
+  worker();
+  for (auto& thread : threads) {
+    thread.join();
+  }
+  if (error) std::rethrow_exception(error);
+}
+
 void GraphExecutor::ShareParams(const GraphExecutor& other, dmlc::Stream* strm) {
   uint64_t header, reserved;
   ICHECK(strm->Read(&header)) << "Invalid parameters file format";
@@ -281,6 +337,13 @@ void GraphExecutor::ShareParams(const GraphExecutor& other, dmlc::Stream* strm)
     const DLTensor* tmp = data_entry_[eid].operator->();
     data_alignment_[eid] = details::GetDataAlignment(*tmp);
   }
+  // Free the storage that only backed the parameters now shared with other,
+  // so that the executors sharing parameters hold a single copy of them.
+  for (NDArray& storage : storage_pool_) {
+    if (storage.defined() && storage.use_count() == 1) {
+      storage = NDArray();
+    }
+  }
   this->SetupOpExecs();
 }
 
@@ -568,6 +631,27 @@ PackedFunc GraphExecutor::GetFunction(const std::string& name,
         [sptr_to_self, this](TVMArgs args, TVMRetValue* rv) { *rv = this->NumInputs(); });
   } else if (name == "run") {
     return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) { this->Run(); });
+  } else if (name == "set_sampling_profiler") {
+    return TypedPackedFunc<void(int, int)>([sptr_to_self, this](int interval, int capacity) {
+      if (interval > 0) {
+        this->sampler_ = std::make_shared<profiling::SamplingProfiler>(interval, capacity);
+      } else {
+        this->sampler_ = nullptr;
+      }
+    });
+  } else if (name == "get_sampling_report") {
+    return TypedPackedFunc<profiling::Report()>([sptr_to_self, this]() {
+      std::shared_ptr<profiling::SamplingProfiler> sampler = this->sampler_;
+      ICHECK(sampler != nullptr) << "The sampling profiler is not enabled";
+      return sampler->Report();
+    });
+  } else if (name == "get_sampling_report_rpc") {
+    // Reports cannot be returned over RPC, send them as JSON.
+    return TypedPackedFunc<std::string()>([sptr_to_self, this]() {
+      std::shared_ptr<profiling::SamplingProfiler> sampler = this->sampler_;
+      ICHECK(sampler != nullptr) << "The sampling profiler is not enabled";
+      return std::string(sampler->Report()->AsJSON());
+    });
   } else if (name == "run_from_inputs") {
     return PackedFunc(
         [sptr_to_self, this](TVMArgs args, TVMRetValue* rv) {
@@ -600,6 +684,10 @@ PackedFunc GraphExecutor::GetFunction(const std::string& name,
     return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) {
       this->LoadParams(args[0].operator std::string());
     });
+  } else if (name == "load_params_from_file") {
+    return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) {
+      this->LoadParamsFromFile(args[0].operator std::string());
+    });
   } else if (name == "share_params") {
     return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) {
       const auto& module = args[0].operator Module();
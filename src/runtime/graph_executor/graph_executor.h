@@ -30,6 +30,7 @@
 #include <dmlc/memory_io.h>
 #include <tvm/runtime/ndarray.h>
 #include <tvm/runtime/packed_func.h>
+#include <tvm/runtime/profiling.h>
 
 #include <memory>
 #include <string>
@@ -174,6 +175,12 @@ class TVM_DLL GraphExecutor : public ModuleNode {
    * \param param_blob A binary blob of parameter.
    */
   void LoadParams(const std::string& param_blob);
+  /*!
+   * \brief Load parameters from a parameter file by mapping it into memory.
+   *  Each parameter is copied straight from the mapping, in parallel.
+   * \param path The path of a file written by SaveParamsToFile or SaveParams.
+   */
+  void LoadParamsFromFile(const std::string& path);
 
   /*!
    * \brief Share parameters from pre-existing GraphExecutor instance.
@@ -454,6 +461,8 @@ class TVM_DLL GraphExecutor : public ModuleNode {
    * When the module does not include linked parmeters, module_lookup_linked_param_ will be nullptr.
    */
   bool module_lookup_linked_param_valid_;
+  /*! \brief The sampling profiler recording some of the runs, when enabled. */
+  std::shared_ptr<profiling::SamplingProfiler> sampler_;
 };
 
 std::vector<Device> GetAllDevice(const TVMArgs& args, int dev_start_arg);
@@ -24,6 +24,7 @@
 
 #include "./graph_executor_factory.h"
 
+#include <tvm/runtime/container/array.h>
 #include <tvm/runtime/container/string.h>
 #include <tvm/runtime/device_api.h>
 #include <tvm/runtime/registry.h>
@@ -56,6 +57,14 @@ PackedFunc GraphExecutorFactory::GetFunction(
   } else if (name == "get_graph_json") {
     return PackedFunc(
         [sptr_to_self, this](TVMArgs args, TVMRetValue* rv) { *rv = this->graph_json_; });
+  } else if (name == "get_param_names") {
+    return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) {
+      Array<String> names;
+      for (const auto& p : this->params_) {
+        names.push_back(p.first);
+      }
+      *rv = names;
+    });
 
   } else if (name == "debug_create") {
     return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) {
@@ -535,6 +535,93 @@ Report Profiler::Report(bool aggregate, bool sort) {
   return profiling::Report(converted_rows, device_metrics);
 }
 
+SamplingProfiler::SamplingProfiler(int interval, size_t capacity)
+    : interval_(interval), runs_(capacity) {
+  ICHECK_GT(interval, 0) << "The sampling interval must be positive";
+  ICHECK_GT(capacity, 0) << "The sampling capacity must be positive";
+}
+
+bool SamplingProfiler::StartRun() {
+  if (++num_runs_ % interval_ != 0) {
+    return false;
+  }
+  current_.calls.clear();
+  run_start_ = std::chrono::high_resolution_clock::now();
+  return true;
+}
+
+void SamplingProfiler::StartCall(const String& name, Device dev) {
+  auto it = name_index_.find(name);
+  size_t index;
+  if (it == name_index_.end()) {
+    std::lock_guard<std::mutex> lock(mutex_);
+    index = names_.size();
+    names_.push_back(name);
+    name_index_[name] = index;
+  } else {
+    index = it->second;
+  }
+  current_.calls.push_back(SampledCall{index, dev, Timer::Start(dev), 0});
+}
+
+void SamplingProfiler::StopCall() { current_.calls.back().timer->Stop(); }
+
+void SamplingProfiler::StopRun() {
+  for (auto& call : current_.calls) {
+    call.nanos = call.timer->SyncAndGetElapsedNanos();
+    call.timer = Timer();
+  }
+  current_.nanos = std::chrono::duration_cast<std::chrono::nanoseconds>(
+                       std::chrono::high_resolution_clock::now() - run_start_)
+                       .count();
+  std::lock_guard<std::mutex> lock(mutex_);
+  // swap, so that the buffers keep their allocations
+  std::swap(runs_[next_], current_);
+  next_ = (next_ + 1) % runs_.size();
+  num_sampled_ = std::min(num_sampled_ + 1, runs_.size());
+}
+
+Report SamplingProfiler::Report() {
+  std::lock_guard<std::mutex> lock(mutex_);
+  // (name, device) -> (total nanoseconds, count)
+  std::map<std::pair<size_t, std::string>, std::pair<int64_t, int64_t>> totals;
+  std::map<std::string, bool> devices;
+  int64_t run_nanos = 0;
+  for (size_t i = 0; i < num_sampled_; ++i) {
+    const SampledRun& run = runs_[i];
+    run_nanos += run.nanos;
+    for (const auto& call : run.calls) {
+      std::string dev = DeviceString(call.dev);
+      auto& total = totals[{call.name, dev}];
+      total.first += call.nanos;
+      total.second += 1;
+      devices[dev] = true;
+    }
+  }
+
+  std::vector<Map<String, ObjectRef>> rows;
+  for (const auto& kv : totals) {
+    std::unordered_map<String, ObjectRef> row;
+    row["Name"] = names_[kv.first.first];
+    row["Device"] = String(kv.first.second);
+    row["Duration (us)"] = ObjectRef(make_object<DurationNode>(kv.second.first / 1e3));
+    row["Count"] = ObjectRef(make_object<CountNode>(kv.second.second));
+    row["Percent"] = ObjectRef(make_object<PercentNode>(
+        run_nanos > 0 ? static_cast<double>(kv.second.first) / run_nanos * 100 : 0));
+    rows.push_back(Map<String, ObjectRef>(row.begin(), row.end()));
+  }
+  std::unordered_map<String, Map<String, ObjectRef>> device_metrics;
+  for (const auto& kv : devices) {
+    std::unordered_map<String, ObjectRef> row;
+    row["Name"] = String("Total");
+    row["Device"] = String(kv.first);
+    row["Duration (us)"] = ObjectRef(make_object<DurationNode>(run_nanos / 1e3));
+    row["Count"] = ObjectRef(make_object<CountNode>(static_cast<int64_t>(num_sampled_)));
+    device_metrics[String(kv.first)] = Map<String, ObjectRef>(row.begin(), row.end());
+  }
+  return profiling::Report(rows, device_metrics);
+}
+
 Report::Report(Array<Map<String, ObjectRef>> calls,
                Map<String, Map<String, ObjectRef>> device_metrics) {
   auto node = make_object<ReportNode>();
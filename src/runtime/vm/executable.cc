@@ -29,6 +29,7 @@
 #include <tvm/runtime/vm/vm.h>
 
 #include <algorithm>
+#include <fstream>
 #include <iomanip>
 #include <iostream>
 #include <memory>
@@ -65,6 +66,11 @@ PackedFunc Executable::GetFunction(const std::string& name, const ObjectPtr<Obje
     return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) { *rv = this->Stats(); });
   } else if (name == "save") {
     return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) { *rv = this->Save(); });
+  } else if (name == "save_to_file") {
+    return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) {
+      std::string path = args[0];
+      this->SaveToMappableFile(path);
+    });
   } else if (name == "get_function_arity") {
     return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) {
       std::string func_name = args[0];
@@ -211,26 +217,66 @@ TVMByteArray Executable::Save() {
   // Initialize the stream object.
   code_.clear();
   dmlc::MemoryStringStream strm(&code_);
+  SaveSections(&strm, true);
+
+  TVMByteArray arr;
+  arr.data = code_.c_str();
+  arr.size = code_.length();
+  return arr;
+}
 
+void Executable::SaveSections(dmlc::Stream* strm, bool with_constant_data) {
   // Save header
-  SaveHeader(&strm);
+  SaveHeader(strm);
 
   // Global section.
-  SaveGlobalSection(&strm);
+  SaveGlobalSection(strm);
 
   // Constant section.
-  SaveConstantSection(&strm);
+  SaveConstantSection(strm, with_constant_data);
 
   // Primitive names.
-  SavePrimitiveOpNames(&strm);
+  SavePrimitiveOpNames(strm);
 
   // Code section.
-  SaveCodeSection(&strm);
+  SaveCodeSection(strm);
+}
 
-  TVMByteArray arr;
-  arr.data = code_.c_str();
-  arr.size = code_.length();
-  return arr;
+/*! \brief Serialize the header of a mappable executable file. */
+static std::string MappableFileHeader(uint64_t code_size, uint64_t constant_offset) {
+  std::string header;
+  dmlc::MemoryStringStream strm(&header);
+  uint64_t magic = kTVMVMMappableExecutableMagic;
+  strm.Write(magic);
+  strm.Write(constant_offset);
+  strm.Write(code_size);
+  return header;
+}
+
+void Executable::SaveToMappableFile(const std::string& path) {
+  std::string code;
+  {
+    dmlc::MemoryStringStream strm(&code);
+    SaveSections(&strm, false);
+  }
+  Map<String, NDArray> constants;
+  for (size_t i = 0; i < this->constants.size(); ++i) {
+    constants.Set(std::to_string(i), Downcast<NDArray>(this->constants[i]));
+  }
+  // The header has a fixed size, so the constant offset can be computed first.
+  uint64_t code_end = MappableFileHeader(code.size(), 0).size() + code.size();
+  uint64_t constant_offset =
+      (code_end + kParamFileAlignment - 1) / kParamFileAlignment * kParamFileAlignment;
+  std::string header = MappableFileHeader(code.size(), constant_offset);
+
+  std::ofstream fs(path, std::ios::out | std::ios::binary);
+  ICHECK(!fs.fail()) << "Cannot open " << path;
+  fs.write(header.data(), header.size());
+  fs.write(code.data(), code.size());
+  std::string padding(constant_offset - code_end, '\0');
+  fs.write(padding.data(), padding.size());
+  SaveParamsToFile(&fs, constants);
+  ICHECK(!fs.fail()) << "Cannot write " << path;
 }
 
 void Executable::SaveGlobalSection(dmlc::Stream* strm) {
@@ -248,15 +294,17 @@ void Executable::SaveGlobalSection(dmlc::Stream* strm) {
   strm->Write(glbs);
 }
 
-void Executable::SaveConstantSection(dmlc::Stream* strm) {
+void Executable::SaveConstantSection(dmlc::Stream* strm, bool with_data) {
   std::vector<DLTensor*> arrays;
   for (const auto& obj : this->constants) {
     const auto cell = Downcast<runtime::NDArray>(obj);
     arrays.push_back(const_cast<DLTensor*>(cell.operator->()));
   }
   strm->Write(static_cast<uint64_t>(this->constants.size()));
-  for (const auto& it : arrays) {
-    runtime::SaveDLTensor(strm, it);
+  if (with_data) {
+    for (const auto& it : arrays) {
+      runtime::SaveDLTensor(strm, it);
+    }
   }
 
   // Save the const to device mapping.
@@ -530,23 +578,63 @@ runtime::Module Executable::Load(const std::string& code, const runtime::Module
 
   exec->code_ = code;
   dmlc::MemoryStringStream strm(&exec->code_);
+  exec->LoadSections(&strm, true);
+
+  return runtime::Module(exec);
+}
+
+runtime::Module Executable::LoadFromMappableFile(const std::string& path,
+                                                 const runtime::Module lib) {
+  auto exec = make_object<Executable>();
+  if (lib.defined()) {
+    exec->SetLib(lib);
+  }
+
+  std::ifstream fs(path, std::ios::in | std::ios::binary);
+  ICHECK(!fs.fail()) << "Cannot open " << path;
+  std::string header(MappableFileHeader(0, 0).size(), '\0');
+  fs.read(&header[0], header.size());
+  uint64_t magic, constant_offset, code_size;
+  dmlc::MemoryStringStream header_strm(&header);
+  STREAM_CHECK(!fs.fail() && header_strm.Read(&magic), "header");
+  STREAM_CHECK(magic == kTVMVMMappableExecutableMagic, "header");
+  STREAM_CHECK(header_strm.Read(&constant_offset), "header");
+  STREAM_CHECK(header_strm.Read(&code_size), "header");
+  exec->code_.resize(code_size);
+  fs.read(&exec->code_[0], code_size);
+  STREAM_CHECK(!fs.fail(), "code");
+  fs.close();
+
+  // The constants view the mapping, their pages are read when first used.
+  MappedParamFile constants(path, constant_offset);
+  exec->constants.resize(constants.size());
+  for (size_t i = 0; i < constants.size(); ++i) {
+    size_t index = std::stoul(constants.name(i));
+    STREAM_CHECK(index < constants.size(), "constant");
+    exec->constants[index] = constants.View(i);
+  }
+
+  dmlc::MemoryStringStream strm(&exec->code_);
+  exec->LoadSections(&strm, false);
 
+  return runtime::Module(exec);
+}
+
+void Executable::LoadSections(dmlc::Stream* strm, bool with_constant_data) {
   // Load header.
-  LoadHeader(&strm);
+  LoadHeader(strm);
 
   // Global section.
-  exec->LoadGlobalSection(&strm);
+  LoadGlobalSection(strm);
 
   // Constant section.
-  exec->LoadConstantSection(&strm);
+  LoadConstantSection(strm, with_constant_data);
 
   // Primitive names that will be invoked by `InvokePacked` instructions.
-  exec->LoadPrimitiveOpNames(&strm);
+  LoadPrimitiveOpNames(strm);
 
   // Code section.
-  exec->LoadCodeSection(&strm);
-
-  return runtime::Module(exec);
+  LoadCodeSection(strm);
 }
 
 void Executable::LoadGlobalSection(dmlc::Stream* strm) {
@@ -557,17 +645,21 @@ void Executable::LoadGlobalSection(dmlc::Stream* strm) {
   }
 }
 
-void Executable::LoadConstantSection(dmlc::Stream* strm) {
+void Executable::LoadConstantSection(dmlc::Stream* strm, bool with_data) {
   uint64_t sz;
   // Load the number of constants.
   STREAM_CHECK(strm->Read(&sz, sizeof(sz)), "constant");
 
   size_t size = static_cast<size_t>(sz);
-  // Load each of the constants.
-  for (size_t i = 0; i < size; i++) {
-    runtime::NDArray constant;
-    STREAM_CHECK(constant.Load(strm), "constant");
-    this->constants.push_back(constant);
+  if (with_data) {
+    // Load each of the constants.
+    for (size_t i = 0; i < size; i++) {
+      runtime::NDArray constant;
+      STREAM_CHECK(constant.Load(strm), "constant");
+      this->constants.push_back(constant);
+    }
+  } else {
+    STREAM_CHECK(size == this->constants.size(), "constant");
   }
 
   // Load the const to device mapping.
@@ -913,6 +1005,11 @@ TVM_REGISTER_GLOBAL("runtime.Load_Executable")
       return Executable::Load(code, lib);
     });
 
+TVM_REGISTER_GLOBAL("runtime.Load_ExecutableFromFile")
+    .set_body_typed([](std::string path, runtime::Module lib) {
+      return Executable::LoadFromMappableFile(path, lib);
+    });
+
 }  // namespace vm
 }  // namespace runtime
 }  // namespace tvm
@@ -39,6 +39,8 @@ namespace vm {
 
 /*! \brief The magic number for the serialized VM bytecode file  */
 constexpr uint64_t kTVMVMBytecodeMagic = 0xD225DE2F4214151D;
+/*! \brief The magic number for the VM executable file with mappable constants  */
+constexpr uint64_t kTVMVMMappableExecutableMagic = 0xD225DE2F4214151E;
 
 template <typename T>
 static inline uint64_t VectorHash(uint64_t key, const std::vector<T>& values) {
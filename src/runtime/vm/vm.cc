@@ -195,6 +195,34 @@ PackedFunc VirtualMachine::GetFunction(const std::string& name,
           }
           return static_cast<int64_t>(-1);
         });
+  } else if (name == "set_sampling_profiler") {
+    return TypedPackedFunc<void(int, int)>([sptr_to_self, this](int interval, int capacity) {
+      ICHECK(exec_) << "The executable is not created yet.";
+      if (interval <= 0) {
+        sampler_ = nullptr;
+        return;
+      }
+      for (const auto& kv : exec_->primitive_map) {
+        if (packed_names_.size() <= static_cast<size_t>(kv.second)) {
+          packed_names_.resize(kv.second + 1);
+        }
+        packed_names_[kv.second] = kv.first;
+      }
+      sampler_ = std::make_shared<profiling::SamplingProfiler>(interval, capacity);
+    });
+  } else if (name == "get_sampling_report") {
+    return TypedPackedFunc<profiling::Report()>([sptr_to_self, this]() {
+      std::shared_ptr<profiling::SamplingProfiler> sampler = sampler_;
+      ICHECK(sampler != nullptr) << "The sampling profiler is not enabled";
+      return sampler->Report();
+    });
+  } else if (name == "get_sampling_report_rpc") {
+    // Reports cannot be returned over RPC, send them as JSON.
+    return TypedPackedFunc<std::string()>([sptr_to_self, this]() {
+      std::shared_ptr<profiling::SamplingProfiler> sampler = sampler_;
+      ICHECK(sampler != nullptr) << "The sampling profiler is not enabled";
+      return std::string(sampler->Report()->AsJSON());
+    });
   } else if (name == "init") {
     return PackedFunc([sptr_to_self, this](TVMArgs args, TVMRetValue* rv) {
       ICHECK_EQ(args.size() % 3, 0);
@@ -296,8 +324,15 @@ void VirtualMachine::InvokeGlobal(const VMFunction& func, const std::vector<Obje
 ObjectRef VirtualMachine::Invoke(const VMFunction& func, const std::vector<ObjectRef>& args) {
   DLOG(INFO) << "Executing Function: " << std::endl << func;
 
+  // hold the sampler for the whole invocation
+  std::shared_ptr<profiling::SamplingProfiler> sampler = sampler_;
+  sampling_ = sampler != nullptr && sampler->StartRun() ? sampler.get() : nullptr;
   InvokeGlobal(func, args);
   RunLoop();
+  if (sampling_ != nullptr) {
+    sampling_->StopRun();
+    sampling_ = nullptr;
+  }
   return return_register_;
 }
 
@@ -504,7 +539,24 @@ void VirtualMachine::RunLoop() {
 
         // We no longer need to write the registers back, we write directly
         // through the registers mutably.
-        InvokePacked(instr.packed_index, func, arity, instr.output_size, args);
+        if (sampling_ != nullptr) {
+          // The device of the first input of the operator is used for timing, or the
+          // first device of the VM when that input is not a tensor.
+          ObjectRef arg = args.empty() ? ObjectRef() : args[0];
+          while (arg.defined() && arg->IsInstance<ADTObj>()) {
+            ADT adt = Downcast<ADT>(arg);
+            arg = adt.size() > 0 ? adt[0] : ObjectRef();
+          }
+          Device dev = devices_[0];
+          if (arg.defined() && arg->IsInstance<NDArray::ContainerType>()) {
+            dev = Downcast<NDArray>(arg)->device;
+          }
+          sampling_->StartCall(packed_names_[instr.packed_index], dev);
+          InvokePacked(instr.packed_index, func, arity, instr.output_size, args);
+          sampling_->StopCall();
+        } else {
+          InvokePacked(instr.packed_index, func, arity, instr.output_size, args);
+        }
         pc_++;
         goto main_loop;
       }
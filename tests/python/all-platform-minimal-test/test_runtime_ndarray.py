@@ -65,7 +65,67 @@ def test_dtype():
     assert dtype.type_code == tvm.DataTypeCode.HANDLE
 
 
+@tvm.testing.uses_gpu
+def test_numpy_out_and_host_pool():
+    for target, dev in tvm.testing.enabled_targets():
+        pool = tvm.nd.HostArrayPool()
+        x = np.random.uniform(size=(3, 4)).astype("float32")
+        y = tvm.nd.array(x, device=dev)
+
+        out = np.empty((3, 4), "float32")
+        assert y.numpy(out=out) is out
+        np.testing.assert_equal(out, x)
+
+        first = y.numpy(pool=pool)
+        np.testing.assert_equal(first, x)
+        address = first.ctypes.data
+        # a view keeps the buffer out of the pool
+        view = first[1:]
+        del first
+        second = y.numpy(pool=pool)
+        assert second.ctypes.data != address
+        del view, second
+        # the buffers of the collected arrays are reused
+        for _ in range(10):
+            np.testing.assert_equal(y.numpy(pool=pool), x)
+        stats = pool.stats()
+        assert stats["misses"] == 2
+        assert stats["hits"] == 10
+        assert stats["hit_rate"] == 10 / 12
+        assert stats["outstanding_bytes"] == 0
+
+    pool = tvm.nd.HostArrayPool(max_cached_bytes=0)
+    z = tvm.nd.array(np.arange(6, dtype="int32").reshape(2, 3), pool=pool)
+    assert z.device == tvm.cpu(0)
+    assert z.handle.contents.data % 128 == 0
+    np.testing.assert_equal(z.numpy(), np.arange(6).reshape(2, 3))
+    assert pool.stats()["outstanding_bytes"] == 256
+    del z
+    # nothing is kept beyond max_cached_bytes
+    assert pool.stats()["cached_bytes"] == 0
+    assert pool.stats()["outstanding_bytes"] == 0
+
+
+def test_host_pool_ndarray_kept_by_runtime():
+    pool = tvm.nd.HostArrayPool()
+    x = np.arange(6, dtype="float32").reshape(2, 3)
+    arr = tvm.nd.array(x, pool=pool)
+    assert not arr.is_view
+    # the runtime keeps the only reference to the array
+    kept = tvm.runtime.container.tuple_object([arr])
+    del arr
+    assert pool.stats()["outstanding_bytes"] == 256
+    other = tvm.nd.array(np.zeros((2, 3), "float32"), pool=pool)
+    assert pool.stats()["misses"] == 2
+    np.testing.assert_equal(kept[0].numpy(), x)
+    del other, kept
+    assert pool.stats()["outstanding_bytes"] == 0
+    assert pool.stats()["cached_bytes"] == 512
+
+
 if __name__ == "__main__":
     test_nd_create()
     test_fp16_conversion()
     test_dtype()
+    test_numpy_out_and_host_pool()
+    test_host_pool_ndarray_kept_by_runtime()
@@ -220,6 +220,21 @@ def test_compile_onnx_module(onnx_resnet50):
     verify_compile_onnx_module(onnx_resnet50, shape_dict)
 
 
+def test_compile_onnx_module__build_profile(onnx_resnet50, tmpdir_factory):
+    # some CI environments wont offer onnx, so skip in case it is not present
+    pytest.importorskip("onnx")
+    package_path = os.path.join(str(tmpdir_factory.mktemp("data")), "module.tar")
+    profiler = tvm.ir.instrument.BuildProfilingInstrument()
+    with profiler.collect():
+        tvmc_model = tvmc.load(onnx_resnet50)
+        tvmc.compiler.compile_model(
+            tvmc_model, target="llvm", package_path=package_path, instruments=[profiler]
+        )
+
+    categories = {event["category"] for event in profiler.events}
+    assert {"frontend", "pass", "strategy", "codegen", "link"} <= categories
+
+
 # This test will be skipped if the AArch64 cross-compilation toolchain is not installed.
 @pytest.mark.skipif(
     not shutil.which("aarch64-linux-gnu-gcc"), reason="cross-compilation toolchain not installed"
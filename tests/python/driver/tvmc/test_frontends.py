@@ -16,9 +16,11 @@
 # under the License.
 import os
 import tarfile
+from unittest import mock
 
 import pytest
 
+import tvm
 from tvm.ir.module import IRModule
 
 from tvm.driver import tvmc
@@ -211,3 +213,22 @@ def test_load_model___wrong_language__to_pytorch(tflite_mobilenet_v1_1_quant):
             model_format="pytorch",
             shape_dict={"input": [1, 3, 224, 224]},
         )
+
+
+def test_load_model__import_cache(onnx_resnet50, tmpdir_factory):
+    # some CI environments wont offer onnx, so skip in case it is not present
+    pytest.importorskip("onnx")
+
+    cache_dir = str(tmpdir_factory.mktemp("import_cache"))
+    tvmc_model = tvmc.load(onnx_resnet50, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+    with mock.patch.object(tvmc.frontends.OnnxFrontend, "load") as mock_load:
+        cached_model = tvmc.load(onnx_resnet50, cache_dir=cache_dir)
+        mock_load.assert_not_called()
+    tvm.ir.assert_structural_equal(cached_model.mod, tvmc_model.mod)
+    assert cached_model.params.keys() == tvmc_model.params.keys()
+
+    # other shapes are imported again
+    tvmc.load(onnx_resnet50, shape_dict={"data": [2, 3, 224, 224]}, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 2
@@ -5659,6 +5659,171 @@ def test_convinteger(target, dev):
     )
 
 
+@tvm.testing.parametrize_targets("llvm")
+def test_external_data(target, dev):
+    w_array = np.random.uniform(size=(32, 16)).astype("float32")
+    b_array = np.random.uniform(size=(16,)).astype("float32")
+    x_array = np.random.uniform(size=(4, 32)).astype("float32")
+    graph = helper.make_graph(
+        [
+            helper.make_node("MatMul", ["x", "w"], ["xw"]),
+            helper.make_node("Add", ["xw", "b"], ["y"]),
+        ],
+        "external_data_test",
+        inputs=[helper.make_tensor_value_info("x", TensorProto.FLOAT, [4, 32])],
+        outputs=[helper.make_tensor_value_info("y", TensorProto.FLOAT, [4, 16])],
+        initializer=[
+            numpy_helper.from_array(w_array, "w"),
+            numpy_helper.from_array(b_array, "b"),
+        ],
+    )
+    model = helper.make_model(graph, producer_name="external_data_test")
+
+    d = tvm.contrib.utils.tempdir()
+    model_path = d.relpath("model.onnx")
+    onnx.save_model(
+        model,
+        model_path,
+        save_as_external_data=True,
+        all_tensors_to_one_file=True,
+        location="weights.bin",
+        size_threshold=0,
+    )
+
+    # from the path, and from a model loaded without its external data
+    for source, kwargs in [
+        (model_path, {}),
+        (onnx.load(model_path, load_external_data=False), {"external_data_dir": d.temp_dir}),
+    ]:
+        mod, params = relay.frontend.from_onnx(source, {"x": x_array.shape}, **kwargs)
+        tvm.testing.assert_allclose(params["w"].numpy(), w_array)
+        tvm.testing.assert_allclose(params["b"].numpy(), b_array)
+        result = relay.create_executor("graph", mod, device=dev, target=target).evaluate()(
+            x_array, **params
+        )
+        tvm.testing.assert_allclose(result.numpy(), x_array.dot(w_array) + b_array, rtol=1e-5)
+
+
+def _make_repeated_blocks_model(num_layers, hidden, extra_outputs=()):
+    nodes = []
+    initializer = []
+    weights = []
+    h = "x"
+    for i in range(num_layers):
+        w_array = np.random.uniform(size=(hidden, hidden)).astype("float32")
+        b_array = np.random.uniform(size=(hidden,)).astype("float32")
+        weights.append((w_array, b_array))
+        initializer += [
+            numpy_helper.from_array(w_array, "w_%d" % i),
+            numpy_helper.from_array(b_array, "b_%d" % i),
+            numpy_helper.from_array(np.array([4, 4, 4], "int64"), "split_%d" % i),
+            numpy_helper.from_array(np.array([4, hidden], "int64"), "merge_%d" % i),
+        ]
+        nodes += [
+            helper.make_node("MatMul", [h, "w_%d" % i], ["mm_%d" % i]),
+            helper.make_node("Add", ["mm_%d" % i, "b_%d" % i], ["add_%d" % i]),
+            helper.make_node("Relu", ["add_%d" % i], ["relu_%d" % i]),
+            helper.make_node("Reshape", ["relu_%d" % i, "split_%d" % i], ["split_out_%d" % i]),
+            helper.make_node("Transpose", ["split_out_%d" % i], ["t_%d" % i], perm=[0, 2, 1]),
+            helper.make_node("Reshape", ["t_%d" % i, "merge_%d" % i], ["merge_out_%d" % i]),
+            helper.make_node(
+                "Constant",
+                [],
+                ["scale_%d" % i],
+                value=numpy_helper.from_array(np.array(0.5, "float32")),
+            ),
+            helper.make_node("Mul", ["merge_out_%d" % i, "scale_%d" % i], ["mul_%d" % i]),
+            helper.make_node("Add", ["mul_%d" % i, h], ["h_%d" % i]),
+        ]
+        h = "h_%d" % i
+    graph = helper.make_graph(
+        nodes,
+        "repeated_blocks_test",
+        inputs=[helper.make_tensor_value_info("x", TensorProto.FLOAT, [4, hidden])],
+        outputs=[
+            helper.make_tensor_value_info(name, TensorProto.FLOAT, [4, hidden])
+            for name in [h] + list(extra_outputs)
+        ],
+        initializer=initializer,
+    )
+    return helper.make_model(graph, producer_name="repeated_blocks_test"), weights
+
+
+def _check_repeated_blocks(model, x_array, expected, target, dev, freeze_params=False):
+    mod_ref, _ = relay.frontend.from_onnx(
+        model,
+        {"x": x_array.shape},
+        freeze_params=freeze_params,
+        convert_config={"deduplicate_repeated_blocks": False},
+    )
+    mod, params = relay.frontend.from_onnx(
+        model,
+        {"x": x_array.shape},
+        freeze_params=freeze_params,
+        convert_config={"deduplicate_repeated_blocks": True},
+    )
+    tvm.ir.assert_structural_equal(mod["main"], mod_ref["main"])
+    result = relay.create_executor("graph", mod, device=dev, target=target).evaluate()(
+        x_array, **params
+    )
+    results = result if len(expected) > 1 else [result]
+    for output, expected_output in zip(results, expected):
+        tvm.testing.assert_allclose(output.numpy(), expected_output, rtol=1e-5)
+
+
+@tvm.testing.parametrize_targets("llvm")
+def test_repeated_blocks(target, dev):
+    num_layers = 6
+    hidden = 16
+    model, weights = _make_repeated_blocks_model(num_layers, hidden)
+
+    # the first layer reads the graph input, the others the previous layer
+    repeats = relay.frontend.onnx._find_repeated_blocks(model.graph)
+    assert repeats == {9: (9, num_layers - 1)}
+
+    x_array = np.random.uniform(size=(4, hidden)).astype("float32")
+    expected = x_array
+    for w_array, b_array in weights:
+        out = np.maximum(expected.dot(w_array) + b_array, 0)
+        out = out.reshape(4, 4, 4).transpose(0, 2, 1).reshape(4, hidden)
+        expected = out * 0.5 + expected
+    _check_repeated_blocks(model, x_array, [expected], target, dev)
+
+
+@tvm.testing.parametrize_targets("llvm")
+def test_repeated_blocks_intermediate_output(target, dev):
+    num_layers = 4
+    hidden = 16
+    # a graph output taken from the middle of the last layer, read by no other layer
+    last = num_layers - 1
+    model, weights = _make_repeated_blocks_model(num_layers, hidden, ["relu_%d" % last])
+    repeats = relay.frontend.onnx._find_repeated_blocks(model.graph)
+    assert repeats == {9: (9, num_layers - 1)}
+
+    x_array = np.random.uniform(size=(4, hidden)).astype("float32")
+    expected = x_array
+    for w_array, b_array in weights:
+        relu = np.maximum(expected.dot(w_array) + b_array, 0)
+        out = relu.reshape(4, 4, 4).transpose(0, 2, 1).reshape(4, hidden)
+        expected = out * 0.5 + expected
+    _check_repeated_blocks(model, x_array, [expected, relu], target, dev)
+
+
+@tvm.testing.parametrize_targets("llvm")
+def test_repeated_blocks_freeze_params(target, dev):
+    num_layers = 4
+    hidden = 16
+    # the frozen weights are bound to the placeholders of the block and folded
+    model, weights = _make_repeated_blocks_model(num_layers, hidden)
+    x_array = np.random.uniform(size=(4, hidden)).astype("float32")
+    expected = x_array
+    for w_array, b_array in weights:
+        out = np.maximum(expected.dot(w_array) + b_array, 0)
+        out = out.reshape(4, 4, 4).transpose(0, 2, 1).reshape(4, hidden)
+        expected = out * 0.5 + expected
+    _check_repeated_blocks(model, x_array, [expected], target, dev, freeze_params=True)
+
+
 if __name__ == "__main__":
     test_flatten()
     test_reshape()
@@ -5748,3 +5913,7 @@ if __name__ == "__main__":
     test_random_uniform()
     test_convinteger()
     test_batch_matmul()
+    test_external_data()
+    test_repeated_blocks()
+    test_repeated_blocks_intermediate_output()
+    test_repeated_blocks_freeze_params()
@@ -14,7 +14,14 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
-from tvm.relay.frontend.common import StrAttrsDict
+import numpy as np
+
+import tvm
+import tvm.testing
+from tvm import relay
+from tvm.relay.frontend import common
+from tvm.relay.frontend.common import StrAttrsDict, IncrementalTypeInference
+from tvm.relay.frontend.common import infer_shape, infer_type, infer_value
 
 
 def test_key_is_present():
@@ -27,6 +34,69 @@ def test_key_is_not_present():
     assert not attrs.has_attr("b")
 
 
+def test_incremental_type_inference():
+    x = relay.var("x", shape=(1, 4), dtype="float32")
+    nodes = [x]
+    with IncrementalTypeInference() as context:
+        for i in range(20):
+            node = relay.nn.relu(nodes[-1] + relay.const(1.0))
+            if i % 5 == 4:
+                node = relay.reshape(node, (4, 1)) if i % 10 == 4 else relay.reshape(node, (1, 4))
+            nodes.append(node)
+            expected = (4, 1) if i % 10 >= 4 and i % 10 < 9 else (1, 4)
+            assert infer_shape(node) == expected
+        # every node is checked once, from the types of its inputs
+        assert context.num_partial == 20
+        assert context.num_full == 0
+        assert infer_type(nodes[-1]).checked_type.dtype == "float32"
+        assert context.num_partial == 20
+        assert context.types[nodes[-1]] == relay.TensorType((1, 4), "float32")
+
+        # nodes of unknown types are checked together
+        y = relay.add(relay.nn.relu(nodes[-1]), relay.const(2.0))
+        assert infer_shape(y) == (1, 4)
+        assert context.num_partial == 21
+
+    # outside of the context, the whole graph is checked
+    assert infer_shape(nodes[-1]) == (1, 4)
+    assert IncrementalTypeInference.current is None
+
+
+@tvm.testing.requires_llvm
+def test_infer_value_cache():
+    x = relay.var("x", shape=(2, 3, 4), dtype="float32")
+    num_modules = len(common._CONSTANT_EVALUATOR._modules)
+
+    # shape arithmetic is evaluated without compiling it
+    shape = relay.shape_of(x, dtype="int64")
+    new_shape = relay.concatenate(
+        [relay.take(shape, relay.const([0], "int64")), relay.const([-1], "int64")], axis=0
+    )
+    params = {"x": tvm.nd.array(np.zeros((2, 3, 4), "float32"))}
+    value = infer_value(new_shape, params)
+    np.testing.assert_equal(value.numpy(), [2, -1])
+    assert infer_value(new_shape, params) is value
+    assert len(common._CONSTANT_EVALUATOR._modules) == num_modules
+
+    # the indices are clamped or wrapped as in the compiled take
+    indices = relay.const([-1, 1, 5], "int64")
+    for mode, expected in [("clip", [2, 3, 4]), ("wrap", [4, 3, 4])]:
+        value = infer_value(relay.take(shape, indices, axis=0, mode=mode), params)
+        np.testing.assert_equal(value.numpy(), expected)
+    assert len(common._CONSTANT_EVALUATOR._modules) == num_modules
+
+    # a compiled module is reused for other values of the inputs
+    y = relay.var("y", shape=(16, 16), dtype="float32")
+    expr = relay.nn.relu(relay.nn.dense(y, y))
+    for _ in range(3):
+        data = np.random.uniform(-1, 1, size=(16, 16)).astype("float32")
+        value = infer_value(expr, {"y": tvm.nd.array(data)})
+        tvm.testing.assert_allclose(value.numpy(), np.maximum(data @ data.T, 0), rtol=1e-5)
+    assert len(common._CONSTANT_EVALUATOR._modules) == num_modules + 1
+
+
 if __name__ == "__main__":
     test_key_is_present()
     test_key_is_present()
+    test_incremental_type_inference()
+    test_infer_value_cache()
@@ -3969,6 +3969,31 @@ def test_forward_mobilenet_v1():
     )
 
 
+def test_forward_mobilenet_v1_mapped():
+    """Test importing the Mobilenet V1 TF Lite model mapped from its file."""
+    tflite_model_file = tf_testing.get_workload_official(
+        "http://download.tensorflow.org/models/mobilenet_v1_2018_08_02/mobilenet_v1_1.0_224.tgz",
+        "mobilenet_v1_1.0_224.tflite",
+    )
+    with open(tflite_model_file, "rb") as f:
+        tflite_model_buf = f.read()
+    try:
+        import tflite.Model
+
+        tflite_model = tflite.Model.Model.GetRootAsModel(tflite_model_buf, 0)
+    except AttributeError:
+        import tflite
+
+        tflite_model = tflite.Model.GetRootAsModel(tflite_model_buf, 0)
+    shape_dict = {"input": (1, 224, 224, 3)}
+    mod_ref, params_ref = relay.frontend.from_tflite(tflite_model, shape_dict=shape_dict)
+    mod, params = relay.frontend.from_tflite(tflite_model_file, shape_dict=shape_dict)
+    tvm.ir.assert_structural_equal(mod["main"], mod_ref["main"])
+    assert params.keys() == params_ref.keys()
+    for name, value in params.items():
+        tvm.testing.assert_allclose(value.numpy(), params_ref[name].numpy())
+
+
 def test_forward_mobilenet_v2():
     """Test the Mobilenet V2 TF Lite model."""
     # MobilenetV2
@@ -4573,6 +4598,7 @@ if __name__ == "__main__":
 
     # End to End
     test_forward_mobilenet_v1()
+    test_forward_mobilenet_v1_mapped()
     test_forward_mobilenet_v2()
     test_forward_mobilenet_v3()
     test_forward_inception_v3_net()
@@ -161,6 +161,83 @@ def test_select_implementation():
                 assert impl.name == "conv2d_1"
 
 
+def test_select_implementation_memo():
+    target = tvm.target.Target("llvm")
+    num_strategy_calls = [0]
+
+    @tvm.target.override_native_generic_func("test_conv2d_memo_strategy")
+    def _counting_strategy(attrs, inputs, out_type, target):
+        num_strategy_calls[0] += 1
+        return _tmp_strategy(attrs, inputs, out_type, target)
+
+    def _select_impl(dshape, wshape, padding=(1, 1)):
+        data = relay.var("data", shape=dshape)
+        weight = relay.var("wshape", shape=wshape)
+        out = run_infer_type(relay.nn.conv2d(data, weight, padding=padding))
+        inputs = [te.placeholder(dshape), te.placeholder(wshape)]
+        impl, outs = relay.backend.compile_engine.select_implementation(
+            relay.op.get("nn.conv2d"), out.attrs, inputs, out.checked_type, target
+        )
+        # the outputs are always computed from the given inputs
+        tensors = [outs[0]]
+        for tensor in tensors:
+            tensors.extend(tensor.op.input_tensors)
+        assert inputs[0] in tensors and inputs[1] in tensors
+        return impl.name
+
+    with TempOpAttr("nn.conv2d", "FTVMStrategy", _counting_strategy):
+        assert _select_impl((1, 8, 7, 7), (32, 8, 3, 3)) == "conv2d_2"
+        assert _select_impl((1, 8, 7, 7), (32, 8, 3, 3)) == "conv2d_2"
+        assert num_strategy_calls[0] == 1
+        assert _select_impl((1, 8, 7, 7), (32, 8, 3, 3), padding=(0, 0)) == "conv2d_2"
+        assert _select_impl((1, 16, 7, 7), (32, 16, 3, 3)) == "conv2d_3"
+        assert num_strategy_calls[0] == 3
+
+        records = [_create_record("test/conv2d_1", (1, 8, 7, 7), (32, 8, 3, 3), target, 0.5)]
+        with target:
+            with autotvm.apply_history_best(records) as dispatch_ctx:
+                assert _select_impl((1, 8, 7, 7), (32, 8, 3, 3)) == "conv2d_1"
+                assert _select_impl((1, 8, 7, 7), (32, 8, 3, 3)) == "conv2d_1"
+                assert num_strategy_calls[0] == 4
+                # loading records selects again
+                records = [
+                    _create_record("test/conv2d_2", (1, 8, 7, 7), (32, 8, 3, 3), target, 0.2)
+                ]
+                dispatch_ctx.load(records)
+                assert _select_impl((1, 8, 7, 7), (32, 8, 3, 3)) == "conv2d_2"
+                assert num_strategy_calls[0] == 5
+
+
+def test_select_implementation_memo_across_builds():
+    # alter_op_layout stores the same configs on every build, which keeps the memo
+    target = tvm.target.Target("llvm")
+    data = relay.var("data", shape=(1, 8, 14, 14))
+    weight = relay.var("weight", shape=(16, 8, 3, 3))
+    out = relay.nn.conv2d(data, weight, padding=(1, 1))
+    mod = tvm.IRModule.from_expr(relay.Function([data, weight], out))
+    params = {"weight": np.random.uniform(size=(16, 8, 3, 3)).astype("float32")}
+    tasks = autotvm.task.extract_from_program(mod["main"], target=target, params=params)
+    assert len(tasks) == 1
+    inp = autotvm.MeasureInput(target, tasks[0], tasks[0].config_space.get(0))
+    res = autotvm.MeasureResult(costs=(1.0,), error_no=0, all_cost=-1, timestamp=-1)
+    num_strategy_calls = [0]
+
+    @tvm.target.override_native_generic_func("test_conv2d_nchwc_memo_strategy")
+    def _counting_strategy(attrs, inputs, out_type, target):
+        num_strategy_calls[0] += 1
+        return relay.op.strategy.conv2d_NCHWc_strategy(attrs, inputs, out_type, target)
+
+    with TempOpAttr("nn.contrib_conv2d_NCHWc", "FTVMStrategy", _counting_strategy):
+        with autotvm.apply_history_best([(inp, res)]) as dispatch_ctx:
+            with tvm.transform.PassContext(opt_level=3):
+                relay.build(mod, target=target, params=params)
+                assert num_strategy_calls[0] == 1
+                version = dispatch_ctx.version
+                relay.build(mod, target=target, params=params)
+            assert num_strategy_calls[0] == 1
+            assert dispatch_ctx.version == version
+
+
 def test_compile_engine():
     engine = relay.backend.compile_engine.get()
 
@@ -264,6 +341,8 @@ def test_compile_nhwc_pack():
 if __name__ == "__main__":
     test_get_valid_implementations()
     test_select_implementation()
+    test_select_implementation_memo()
+    test_select_implementation_memo_across_builds()
     test_compile_engine()
     test_compile_placeholder_bypass()
     test_compile_injective_with_tuple()
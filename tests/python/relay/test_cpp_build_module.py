@@ -14,11 +14,16 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import os
+from unittest import mock
+
 import numpy as np
 
 import tvm
 from tvm import te
 from tvm import relay, runtime
+import tvm.relay.testing
+from tvm.relay.backend import kernel_cache
 from tvm.contrib.nvcc import have_fp16
 import tvm.testing
 
@@ -122,7 +127,108 @@ def test_fp16_conversion(target, dev):
         np.testing.assert_allclose(out.numpy(), X.numpy().astype(dst), atol=1e-5, rtol=1e-5)
 
 
+@tvm.testing.requires_llvm
+def test_kernel_cache():
+    dev = tvm.cpu()
+    temp = tvm.contrib.utils.tempdir()
+    cache_dir = temp.relpath("kernels")
+
+    def build_and_run(activation, data):
+        x = relay.var("x", shape=(16, 8))
+        w1 = relay.var("w1", shape=(8, 8))
+        w2 = relay.var("w2", shape=(8, 8))
+        y = relay.nn.relu(relay.nn.dense(x, w1))
+        z = activation(relay.nn.dense(y, w2))
+        mod = tvm.IRModule.from_expr(relay.Function([x, w1, w2], z))
+        config = {"relay.backend.kernel_cache_dir": cache_dir}
+        # count the kernels generated instead of loaded from the cache
+        with mock.patch.object(
+            kernel_cache, "_build_kernel", wraps=kernel_cache._build_kernel
+        ) as build_kernel:
+            with tvm.transform.PassContext(opt_level=3, config=config):
+                lib = relay.build(mod, "llvm")
+        # the cached kernels are exported with the others
+        lib_path = temp.relpath(
+            "lib_%s_%d.so" % (activation.__name__, len(os.listdir(temp.temp_dir)))
+        )
+        lib.export_library(lib_path)
+        outputs = []
+        for factory in [lib, runtime.load_module(lib_path)]:
+            rt = tvm.contrib.graph_executor.GraphModule(factory["default"](dev))
+            rt.run(**data)
+            outputs.append(rt.get_output(0).numpy())
+        return outputs, build_kernel.call_count
+
+    def cache_mtimes():
+        return {
+            name: os.stat(os.path.join(cache_dir, name)).st_mtime_ns
+            for name in os.listdir(cache_dir)
+        }
+
+    data = {
+        "x": np.random.uniform(-1, 1, (16, 8)).astype("float32"),
+        "w1": np.random.uniform(-1, 1, (8, 8)).astype("float32"),
+        "w2": np.random.uniform(-1, 1, (8, 8)).astype("float32"),
+    }
+    hidden = np.maximum(data["x"].dot(data["w1"].T), 0).dot(data["w2"].T)
+
+    outputs, num_generated = build_and_run(relay.tanh, data)
+    for out in outputs:
+        np.testing.assert_allclose(out, np.tanh(hidden), rtol=1e-5, atol=1e-5)
+    num_kernels = len(os.listdir(cache_dir))
+    assert num_kernels == 2
+    assert num_generated == num_kernels
+    mtimes = cache_mtimes()
+
+    # a build of the same model generates no kernel
+    outputs, num_generated = build_and_run(relay.tanh, data)
+    for out in outputs:
+        np.testing.assert_allclose(out, np.tanh(hidden), rtol=1e-5, atol=1e-5)
+    assert num_generated == 0
+    assert cache_mtimes() == mtimes
+
+    # changing the last layer only generates its kernel again
+    outputs, num_generated = build_and_run(relay.sigmoid, data)
+    for out in outputs:
+        np.testing.assert_allclose(out, 1 / (1 + np.exp(-hidden)), rtol=1e-5, atol=1e-5)
+    assert num_generated == 1
+    assert len(os.listdir(cache_dir)) == num_kernels + 1
+
+
+@tvm.testing.requires_llvm
+def test_parallel_build():
+    dev = tvm.cpu()
+    mod, params = relay.testing.mlp.get_workload(batch_size=1)
+    data = np.random.uniform(size=(1, 1, 28, 28)).astype("float32")
+
+    def build(num_workers):
+        config = {"relay.backend.num_build_workers": num_workers}
+        with tvm.transform.PassContext(opt_level=3, config=config):
+            return relay.build(mod, "llvm", params=params)
+
+    def run(lib):
+        rt = tvm.contrib.graph_executor.GraphModule(lib["default"](dev))
+        rt.run(data=data)
+        return rt.get_output(0).numpy()
+
+    def sources(lib):
+        # the kernels are imported in the same order whatever the order they were built in
+        modules = [lib.get_lib()]
+        for module in modules:
+            modules.extend(module.imported_modules)
+        return [m.get_source("ll") for m in modules if m.type_key == "llvm"]
+
+    expected = run(build(1))
+    libs = [build(4) for _ in range(2)]
+    assert len(sources(libs[0])) > 1
+    assert sources(libs[0]) == sources(libs[1])
+    for lib in libs:
+        np.testing.assert_allclose(run(lib), expected, rtol=1e-5, atol=1e-5)
+
+
 if __name__ == "__main__":
     test_basic_build()
     test_fp16_build()
     test_fp16_conversion()
+    test_kernel_cache()
+    test_parallel_build()
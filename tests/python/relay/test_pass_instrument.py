@@ -16,11 +16,20 @@
 # under the License.
 """ Instrument test cases.
 """
+import json
+
 import pytest
 import tvm
 import tvm.relay
+import tvm.testing
+from tvm.contrib import utils
 from tvm.relay import op
-from tvm.ir.instrument import PassTimingInstrument, pass_instrument
+from tvm.ir.instrument import (
+    BuildProfilingInstrument,
+    PassTimingInstrument,
+    pass_instrument,
+    profile_build_step,
+)
 
 
 def get_test_model():
@@ -533,3 +542,35 @@ def test_instrument_call_sequence():
         "%1 exit_pass_ctx"
         "%2 exit_pass_ctx" == "".join(events)
     )
+
+
+@tvm.testing.requires_llvm
+def test_build_profiling_instrument():
+    profiler = BuildProfilingInstrument()
+    with profile_build_step("frontend", "not recorded"):
+        pass
+    with profiler.collect():
+        with profile_build_step("frontend", "test"):
+            mod = get_test_model()
+        with tvm.transform.PassContext(opt_level=3, instruments=[profiler]):
+            tvm.relay.build(mod, target="llvm")
+    with profile_build_step("link", "not recorded"):
+        pass
+
+    categories = {event["category"] for event in profiler.events}
+    assert {"frontend", "pass", "strategy", "codegen", "build"} <= categories
+    assert "not recorded" not in {event["name"] for event in profiler.events}
+    # the TIR passes are attributed to the primitive functions they lower
+    assert any("fused_" in event["args"].get("function", "") for event in profiler.events)
+    totals = profiler.category_totals()
+    assert totals["pass"] <= totals["build"]
+
+    path = utils.tempdir().relpath("trace.json")
+    profiler.save(path)
+    with open(path) as trace_file:
+        trace = json.load(trace_file)
+    assert len(trace["traceEvents"]) == len(profiler.events)
+    assert all(event["ph"] == "X" for event in trace["traceEvents"])
+    report = profiler.render(top=len(profiler.events))
+    assert "relay.build" in report
+    assert "InferType" in report
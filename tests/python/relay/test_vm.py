@@ -14,6 +14,8 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import asyncio
+
 import numpy as np
 import pytest
 import time
@@ -887,6 +889,107 @@ def test_get_output_multiple(target, dev):
     np.testing.assert_allclose(outputs[1].numpy(), inp)
 
 
+def test_set_input_zero_copy():
+    target = tvm.target.Target("llvm")
+
+    x = relay.var("x", shape=(10,))
+    y = relay.var("y", shape=(10,))
+    f = relay.Function([x, y], x + y)
+    mod = IRModule.from_expr(f)
+
+    vm_exec = vm.compile(mod, target=target)
+    vm_factory = runtime.vm.VirtualMachine(vm_exec, tvm.cpu())
+    x_in = tvm.nd.aligned_numpy_empty((10,), "float32")
+    x_in[:] = np.arange(10)
+    # an unaligned array is copied
+    y_in = np.ones(11, dtype="float32")[1:]
+    vm_factory.set_input_zero_copy("main", x_in, y=y_in)
+    out = vm_factory.invoke("main")
+    np.testing.assert_allclose(out.numpy(), x_in + y_in)
+
+    if hasattr(x_in, "__dlpack__"):
+        # the aligned array is read in place
+        x_in[:] = 2
+        out = vm_factory.invoke("main")
+        np.testing.assert_allclose(out.numpy(), 2 + y_in)
+
+
+@tvm.testing.parametrize_targets("llvm")
+def test_output_buffers(target, dev):
+    x = relay.var("x", shape=(10,))
+    f = relay.Function([x], relay.Tuple([x + x, x]))
+    mod = IRModule.from_expr(f)
+
+    vm_exec = vm.compile(mod, target=target)
+    vm_factory = runtime.vm.VirtualMachine(vm_exec, dev)
+    out0 = np.empty(10, dtype="float32")
+    out1 = tvm.nd.empty((10,), "float32")
+    vm_factory.set_output_buffers(out0, out1)
+    for _ in range(2):
+        inp = np.random.uniform(size=10).astype("float32")
+        vm_factory.invoke_stateful("main", inp)
+        outputs = vm_factory.get_outputs()
+        assert outputs[0] is out0 and outputs[1] is out1
+        np.testing.assert_allclose(out0, inp + inp)
+        np.testing.assert_allclose(out1.numpy(), inp)
+
+
+def test_invoke_async(target, dev):
+    x = relay.var("x", shape=(10,))
+    f = relay.Function([x], relay.Tuple([x + x, x]))
+    mod = IRModule.from_expr(f)
+
+    vm_exec = vm.compile(mod, target=target)
+    vm_factory = runtime.vm.VirtualMachine(vm_exec, dev)
+    inputs = [np.random.uniform(size=10).astype("float32") for _ in range(8)]
+    futures = [vm_factory.run_async(inp) for inp in inputs]
+    for inp, future in zip(inputs, futures):
+        out0, out1 = future.result()
+        np.testing.assert_allclose(out0, inp + inp)
+        np.testing.assert_allclose(out1, inp)
+
+    async def serve():
+        return await asyncio.gather(
+            *[asyncio.wrap_future(vm_factory.invoke_async("main", x=inp)) for inp in inputs]
+        )
+
+    loop = asyncio.new_event_loop()
+    try:
+        results = loop.run_until_complete(serve())
+    finally:
+        loop.close()
+    for inp, (out0, _) in zip(inputs, results):
+        np.testing.assert_allclose(out0, inp + inp)
+
+    # errors are reported by the futures
+    with pytest.raises(Exception):
+        vm_factory.invoke_async("unknown", inputs[0]).result()
+
+    # closing finishes the queued requests and joins the threads of the stages
+    futures = [vm_factory.run_async(inp) for inp in inputs]
+    threads = [thread for pool, _ in vm_factory._pipeline._stages for thread in pool._threads]
+    vm_factory.close_async()
+    assert all(future.done() for future in futures)
+    assert not any(thread.is_alive() for thread in threads)
+
+
+def test_sampling_profiler(target, dev):
+    x = relay.var("x", shape=(4, 10))
+    y = relay.nn.relu(relay.nn.dense(x, relay.var("w", shape=(10, 10))))
+    mod = IRModule.from_expr(relay.Function(relay.analysis.free_vars(y), y))
+
+    vm_exec = vm.compile(mod, target=target)
+    vm_factory = runtime.vm.VirtualMachine(vm_exec, dev)
+    w_data = np.random.uniform(size=(10, 10)).astype("float32")
+    vm_factory.enable_sampling_profiler(interval=2, capacity=8)
+    for _ in range(6):
+        vm_factory.run(np.random.uniform(size=(4, 10)).astype("float32"), w_data)
+    report = vm_factory.sampling_report()
+    assert all(call["Count"].value == 3 for call in report.calls)
+    assert "fused_nn_dense" in str(report)
+    assert [m["Count"].value for m in report.device_metrics.values()] == [3]
+
+
 @tvm.testing.parametrize_targets("llvm")
 def test_get_input_index(target, dev):
     # Build a IRModule.
@@ -16,6 +16,8 @@
 # under the License.
 # pylint: disable=invalid-name, missing-docstring, no-else-return
 """Unit tests for the Relay VM serialization and deserialization."""
+import os
+
 import pytest
 import numpy as np
 
@@ -145,6 +147,35 @@ def test_save_load():
     tvm.testing.assert_allclose(res.numpy(), x_data + x_data)
 
 
+def test_save_load_mappable_file():
+    x = relay.var("x", shape=(10, 10))
+    w = relay.var("w", shape=(10, 10))
+    f = relay.Function([x, w], relay.nn.dense(x, w) + relay.const(1.0))
+    x_data = np.random.rand(10, 10).astype("float32")
+    w_data = np.random.rand(10, 10).astype("float32")
+
+    vm = create_exec(f, params={"w": w_data})
+    tmp = utils.tempdir()
+    path_lib = tmp.relpath("lib.so")
+    path_code = tmp.relpath("code.ro")
+    vm.lib.export_library(path_lib)
+    vm.save_to_file(path_code)
+    # the constants start at a page boundary after the bytecode
+    code, _ = vm.save()
+    assert os.path.getsize(path_code) >= 4096
+
+    des_exec = _vm.Executable.load_exec(path_code, tvm.runtime.load_module(path_lib))
+    assert des_exec.bytecode == vm.bytecode
+    des_vm = _vm.VirtualMachine(des_exec, tvm.cpu())
+    res = des_vm.run(x_data)
+    tvm.testing.assert_allclose(res.numpy(), np.dot(x_data, w_data.T) + 1, rtol=1e-5)
+
+    # the blob returned by save is still accepted, also as bytes
+    des_exec = _vm.Executable.load_exec(bytes(code), vm.lib)
+    res = _vm.VirtualMachine(des_exec, tvm.cpu()).run(x_data)
+    tvm.testing.assert_allclose(res.numpy(), np.dot(x_data, w_data.T) + 1, rtol=1e-5)
+
+
 def test_const():
     c = relay.const(1.0, "float32")
     x = relay.var("x", shape=(10, 10), dtype="float32")
@@ -423,6 +423,39 @@ def test_measure_special_inputs_map_by_name_rpc_runner():
         assert mress[0].error_no == 0
 
 
+def test_measure_local_builder_rpc_runner_reuse_session():
+    if not tvm.testing.device_enabled("llvm"):
+        return
+
+    task = auto_scheduler.SearchTask(
+        func=matmul_auto_scheduler_test, args=(64, 64, 64), target="llvm"
+    )
+    minps = [auto_scheduler.MeasureInput(task, task.compute_dag.init_state) for _ in range(4)]
+    local_builder = auto_scheduler.LocalBuilder()
+    measure_ctx = auto_scheduler.LocalRPCMeasureContext(
+        n_parallel=2, timeout=60, reuse_session=True
+    )
+    rpc_runner = measure_ctx.runner
+
+    bress = local_builder.build(minps)
+    assert all(bres.error_no == 0 for bres in bress)
+    # the second batch runs on the sessions kept by the first one
+    for _ in range(2):
+        mress = rpc_runner.run(minps, bress)
+        assert all(mres.error_no == 0 for mres in mress)
+    assert len(auto_scheduler.measure._RPC_RUNNER_POOLS) == 1
+    # a context only releases the sessions on its own tracker
+    other_ctx = auto_scheduler.LocalRPCMeasureContext(n_parallel=1, timeout=60, reuse_session=True)
+    mress = other_ctx.runner.run(minps[:1], bress[:1])
+    assert mress[0].error_no == 0
+    assert len(auto_scheduler.measure._RPC_RUNNER_POOLS) == 2
+    del other_ctx
+    assert len(auto_scheduler.measure._RPC_RUNNER_POOLS) == 1
+    auto_scheduler.measure.release_rpc_runner_sessions()
+    assert not auto_scheduler.measure._RPC_RUNNER_POOLS
+    del measure_ctx
+
+
 if __name__ == "__main__":
     test_record_split_reorder_fuse_annotation()
     test_record_compute_at_root_inline_cache_read_write()
@@ -437,3 +470,4 @@ if __name__ == "__main__":
     test_measure_target_host()
     test_measure_special_inputs_map_by_name_local_runner()
     test_measure_special_inputs_map_by_name_rpc_runner()
+    test_measure_local_builder_rpc_runner_reuse_session()
@@ -86,9 +86,83 @@ def test_task_runner_with_ref_input():
     assert runner.executor.ran_dummy_executor
 
 
+def test_adaptive_measure():
+    """test adaptive repeat stops on a narrow confidence interval or a slow candidate"""
+    from tvm.autotvm.measure.measure_methods import adaptive_measure
+
+    stable = adaptive_measure(lambda: [1.0], repeat=3, max_repeat=20)
+    assert len(stable) == 3
+
+    noisy_costs = iter([1.0, 3.0] * 10)
+    noisy = adaptive_measure(lambda: [next(noisy_costs)], repeat=3, max_repeat=8)
+    assert len(noisy) == 8
+
+    slow = adaptive_measure(
+        lambda: [10.0], repeat=3, max_repeat=20, early_stop_ratio=3.0, best_cost=1.0
+    )
+    assert len(slow) == 1
+
+    assert MeasureResult((1.0,), MeasureErrorNo.NO_ERROR, 0, 0).variance is None
+
+
+def test_task_runner_with_adaptive_repeat():
+    """test runner passes the adaptive options and tracks the best cost"""
+    runner = measure.LocalRunner(max_repeat=10, early_stop_ratio=3.0)
+
+    class DummyExecutor(measure.executor.Executor):
+        def __init__(self):
+            self.adaptive_kwargs = []
+
+        def submit(self, func, *args, **kwargs):
+            sig = Signature.from_callable(func)
+            adaptive_kwargs = sig.bind(*args, **kwargs).arguments["adaptive_kwargs"]
+            self.adaptive_kwargs.append(adaptive_kwargs)
+            dummy_future = concurrent.futures.Future()
+            dummy_future.set_result(
+                MeasureResult((2.0, 4.0), MeasureErrorNo.NO_ERROR, 0, 0, variance=2.0)
+            )
+            return dummy_future
+
+    runner.executor = DummyExecutor()
+    runner.run([None], [None])
+    runner.run([None], [None])
+    assert runner.executor.adaptive_kwargs[0]["max_repeat"] == 10
+    assert runner.executor.adaptive_kwargs[0]["best_cost"] is None
+    assert runner.executor.adaptive_kwargs[1]["best_cost"] == 3.0
+
+
+def test_task_runner_with_input_cache():
+    """test runner passes per task input cache keys with re-randomization epochs"""
+    task, target = get_sample_task()
+    runner = measure.LocalRunner(cache_inputs=True, rerandomize_every=2)
+
+    class DummyExecutor(measure.executor.Executor):
+        def __init__(self):
+            self.cache_keys = []
+
+        def submit(self, func, *args, **kwargs):
+            sig = Signature.from_callable(func)
+            arguments = sig.bind(*args, **kwargs).arguments
+            self.cache_keys.append(arguments["input_cache_key"])
+            assert arguments["module_loader"].session_lifetime == 20 * runner.timeout
+            dummy_future = concurrent.futures.Future()
+            dummy_future.set_result(None)
+            return dummy_future
+
+    runner.executor = DummyExecutor()
+    inp = measure.MeasureInput(target, task, task.config_space.get(0))
+    runner.run([inp] * 3, [None] * 3)
+    epochs = [key[-1] for key in runner.executor.cache_keys]
+    assert epochs == [0, 0, 1]
+    assert all(key[0] == task.name for key in runner.executor.cache_keys)
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
 
     test_task_tuner_without_measurement()
     test_task_tuner_without_measurement_spawn()
     test_task_runner_with_ref_input()
+    test_adaptive_measure()
+    test_task_runner_with_adaptive_repeat()
+    test_task_runner_with_input_cache()
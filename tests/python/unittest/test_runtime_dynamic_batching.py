@@ -0,0 +1,118 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import threading
+
+import numpy as np
+import pytest
+
+import tvm
+import tvm.testing
+from tvm import relay
+from tvm.contrib import graph_executor
+from tvm.contrib.dynamic_batching import DynamicBatcher
+
+
+def build_modules(batch_size, num_instances):
+    x = relay.var("x", shape=(batch_size, 3))
+    mod = tvm.IRModule.from_expr(relay.Function([x], relay.Tuple([x * relay.const(2.0), x])))
+    lib = relay.build(mod, target="llvm")
+    return [graph_executor.GraphModule(lib["default"](tvm.cpu(0))) for _ in range(num_instances)]
+
+
+def check_requests(batcher, num_clients, num_requests):
+    errors = []
+
+    def client(seed):
+        rng = np.random.RandomState(seed)
+        for _ in range(num_requests):
+            rows = rng.randint(1, 3)
+            data = rng.uniform(size=(rows, 3)).astype("float32")
+            try:
+                out0, out1 = batcher.infer(x=data)
+                np.testing.assert_allclose(out0, data * 2)
+                np.testing.assert_allclose(out1, data)
+            # pylint: disable=broad-except
+            except Exception as err:
+                errors.append(err)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(num_clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+
+
+@tvm.testing.requires_llvm
+def test_dynamic_batching_batched_module():
+    with DynamicBatcher(build_modules(4, 1), ["x"], max_latency_ms=1) as batcher:
+        assert batcher.batch_sizes == [4]
+        check_requests(batcher, num_clients=6, num_requests=20)
+        with pytest.raises(ValueError):
+            batcher.submit(x=np.zeros((5, 3), "float32"))
+        with pytest.raises(ValueError):
+            batcher.submit(y=np.zeros((1, 3), "float32"))
+
+    with pytest.raises(RuntimeError):
+        batcher.submit(x=np.zeros((1, 3), "float32"))
+
+
+@tvm.testing.requires_llvm
+def test_dynamic_batching_module_pool():
+    modules = build_modules(2, 3)
+    with DynamicBatcher(modules, ["x"], max_latency_ms=1) as batcher:
+        check_requests(batcher, num_clients=6, num_requests=20)
+
+
+@tvm.testing.requires_llvm
+def test_dynamic_batching_deadline():
+    # a lone request is run once its deadline passes
+    with DynamicBatcher(build_modules(8, 1), ["x"], max_latency_ms=50) as batcher:
+        data = np.ones((1, 3), "float32")
+        out0, _ = batcher.submit(x=data).result(timeout=10)
+        np.testing.assert_allclose(out0, data * 2)
+
+
+@tvm.testing.requires_llvm
+def test_dynamic_batching_mixed_rows():
+    with DynamicBatcher(build_modules(4, 1), ["x"], max_latency_ms=2000) as batcher:
+        # queue the requests at once: the last one fills the batch of the first
+        # instead of waiting behind the second, which does not fit in it
+        with batcher._cond:
+            data = [np.full((rows, 3), i, "float32") for i, rows in enumerate([3, 3, 1])]
+            futures = [batcher.submit(x=x) for x in data]
+        out0, _ = futures[2].result(timeout=1)
+        np.testing.assert_allclose(out0, data[2] * 2)
+        assert futures[0].done()
+        assert not futures[1].done()
+        for x, future in zip(data, futures):
+            out0, out1 = future.result(timeout=10)
+            np.testing.assert_allclose(out0, x * 2)
+            np.testing.assert_allclose(out1, x)
+
+    # the requests of two rows skip the module of one row
+    modules = build_modules(4, 1) + build_modules(1, 2)
+    with DynamicBatcher(modules, ["x"], max_latency_ms=1) as batcher:
+        assert batcher.batch_sizes == [4, 1, 1]
+        check_requests(batcher, num_clients=6, num_requests=20)
+
+
+if __name__ == "__main__":
+    test_dynamic_batching_batched_module()
+    test_dynamic_batching_module_pool()
+    test_dynamic_batching_deadline()
+    test_dynamic_batching_mixed_rows()
@@ -14,6 +14,10 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import asyncio
+import threading
+
+import pytest
 import tvm
 import tvm.testing
 from tvm import te, runtime
@@ -138,6 +142,229 @@ def test_load_unexpected_params():
     rt_mod.load_params(runtime.save_param_dict(new_params))
 
 
+@tvm.testing.requires_llvm
+def test_load_params_from_file():
+    x = relay.var("x", shape=(1, 10))
+    y = relay.var("y", shape=(1, 10))
+    w = relay.var("w", shape=(10,), dtype="int8")
+    z = relay.add(relay.add(x, y), relay.cast(w, "float32"))
+    mod = tvm.IRModule.from_expr(relay.Function([x, y, w], z))
+    graph_module = relay.build(mod, target="llvm")
+
+    params = {
+        "y": np.random.uniform(size=(1, 10)).astype("float32"),
+        "w": np.arange(10).astype("int8"),
+    }
+    temp = utils.tempdir()
+    path = temp.relpath("params.bin")
+    runtime.save_param_dict_to_file(params, path)
+
+    # the loaded arrays view the file and keep it mapped
+    loaded = runtime.load_param_dict_from_file(path)
+    assert set(loaded.keys()) == set(params.keys())
+    for name, value in params.items():
+        np.testing.assert_equal(loaded[name].numpy(), value)
+
+    # the byte blob format saved to a file is accepted as well
+    blob_path = temp.relpath("params.blob")
+    with open(blob_path, "wb") as f:
+        f.write(runtime.save_param_dict(params))
+    for name, value in runtime.load_param_dict_from_file(blob_path).items():
+        np.testing.assert_equal(value.numpy(), params[name])
+
+    for params_path in [path, blob_path]:
+        rt_mod = graph_executor.GraphModule(graph_module["default"](tvm.cpu(0)))
+        rt_mod.load_params(params_path)
+        x_in = np.ones((1, 10)).astype("float32")
+        rt_mod.run(x=x_in)
+        np.testing.assert_allclose(
+            rt_mod.get_output(0).numpy(), x_in + params["y"] + params["w"].astype("float32")
+        )
+
+
+@tvm.testing.requires_llvm
+def test_set_input_output_zero_copy():
+    x = relay.var("x", shape=(1, 10))
+    y = relay.var("y", shape=(1, 10))
+    mod = tvm.IRModule.from_expr(relay.Function([x, y], relay.add(x, y)))
+    graph_module = relay.build(mod, target="llvm")
+    rt_mod = graph_executor.GraphModule(graph_module["default"](tvm.cpu(0)))
+
+    x_in = tvm.nd.aligned_numpy_empty((1, 10), "float32")
+    y_in = tvm.nd.aligned_numpy_empty((1, 10), "float32")
+    x_in[:] = np.random.uniform(size=(1, 10))
+    y_in[:] = np.random.uniform(size=(1, 10))
+    out = tvm.nd.aligned_numpy_empty((1, 10), "float32")
+    rt_mod.set_input_zero_copy(x=x_in, y=y_in)
+    rt_mod.set_output_zero_copy(0, out)
+    rt_mod.run()
+    np.testing.assert_allclose(out, x_in + y_in)
+
+    # the bound arrays are read and written in place
+    x_in[:] = 1
+    rt_mod.run()
+    np.testing.assert_allclose(out, 1 + y_in)
+    np.testing.assert_allclose(rt_mod.get_output(0).numpy(), 1 + y_in)
+
+    # unaligned or strided arrays are copied
+    x_unaligned = np.zeros((1, 11), "float32")[:, 1:]
+    out_strided = np.zeros((1, 20), "float32")[:, ::2]
+    rt_mod.set_input_zero_copy("x", x_unaligned)
+    rt_mod.set_output_zero_copy(0, out_strided)
+    x_in[:] = 2
+    rt_mod.run()
+    np.testing.assert_allclose(out_strided, y_in)
+
+    # set_input takes the input back from the bound array
+    rt_mod.set_input_zero_copy("x", x_in)
+    rt_mod.set_input("x", np.full((1, 10), 3, "float32"))
+    rt_mod.run()
+    np.testing.assert_allclose(out_strided, 3 + y_in)
+
+
+@tvm.testing.requires_llvm
+def test_output_buffers():
+    x = relay.var("x", shape=(1, 10))
+    mod = tvm.IRModule.from_expr(relay.Function([x], relay.Tuple([x + x, x * x])))
+    graph_module = relay.build(mod, target="llvm")
+    rt_mod = graph_executor.GraphModule(graph_module["default"](tvm.cpu(0)))
+
+    x_in = np.random.uniform(size=(1, 10)).astype("float32")
+    out0 = np.empty((1, 10), "float32")
+    rt_mod.set_input("x", x_in)
+    rt_mod.run()
+    assert rt_mod.get_output(0, out0) is out0
+    np.testing.assert_allclose(out0, x_in + x_in)
+
+    # the second output is left to the module
+    rt_mod.set_output_buffers(out0, None)
+    for _ in range(2):
+        x_in = np.random.uniform(size=(1, 10)).astype("float32")
+        rt_mod.run(x=x_in)
+        np.testing.assert_allclose(out0, x_in + x_in)
+        np.testing.assert_allclose(rt_mod.get_output(1).numpy(), x_in * x_in)
+
+
+@tvm.testing.requires_llvm
+def test_graph_module_pool():
+    x = relay.var("x", shape=(1, 10))
+    w = relay.var("w", shape=(10, 10))
+    mod = tvm.IRModule.from_expr(relay.Function([x, w], relay.nn.dense(x, w)))
+    w_np = np.random.uniform(size=(10, 10)).astype("float32")
+    lib = relay.build(mod, target="llvm", params={"w": w_np})
+
+    pool = graph_executor.GraphModulePool(lib, tvm.cpu(0), num_instances=3)
+    assert len(pool.modules) == 3
+    # the instances hold a single copy of the weights
+    for name in lib.get_params():
+        data = set(m.get_input(name).handle.contents.data for m in pool.modules)
+        assert len(data) == 1
+
+    errors = []
+
+    def client():
+        for _ in range(10):
+            x_in = np.random.uniform(size=(1, 10)).astype("float32")
+            try:
+                (out,) = pool.run(x=x_in)
+                tvm.testing.assert_allclose(out, np.dot(x_in, w_np.T), rtol=1e-5)
+            # pylint: disable=broad-except
+            except Exception as err:
+                errors.append(err)
+
+    threads = [threading.Thread(target=client) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+
+    stats = pool.stats()
+    assert sum(s["uses"] for s in stats) == 40
+    assert all(0 <= s["utilization"] <= 1 for s in stats)
+    with pool.instance() as module:
+        assert module in pool.modules
+        others = [pool.acquire(timeout=0.01) for _ in range(2)]
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.01)
+        for other in others:
+            pool.release(other)
+    # the released instances are handed out again
+    acquired = [pool.acquire(timeout=0.01) for _ in range(3)]
+    assert sorted(map(id, acquired)) == sorted(map(id, pool.modules))
+    for module in acquired:
+        pool.release(module)
+    assert sum(s["uses"] for s in pool.stats()) == 46
+
+
+@tvm.testing.requires_llvm
+def test_run_async():
+    x = relay.var("x", shape=(4, 10))
+    mod = tvm.IRModule.from_expr(relay.Function([x], relay.Tuple([x * relay.const(2.0), x])))
+    lib = relay.build(mod, target="llvm")
+    gmod = graph_executor.GraphModule(lib["default"](tvm.cpu(0)))
+
+    inputs = [np.random.uniform(size=(4, 10)).astype("float32") for _ in range(8)]
+    futures = [gmod.run_async(x=inp) for inp in inputs]
+    for inp, future in zip(inputs, futures):
+        out0, out1 = future.result()
+        tvm.testing.assert_allclose(out0, inp * 2)
+        tvm.testing.assert_allclose(out1, inp)
+
+    async def serve():
+        return await asyncio.gather(*[asyncio.wrap_future(gmod.run_async(x=inp)) for inp in inputs])
+
+    loop = asyncio.new_event_loop()
+    try:
+        results = loop.run_until_complete(serve())
+    finally:
+        loop.close()
+    for inp, (out0, _) in zip(inputs, results):
+        tvm.testing.assert_allclose(out0, inp * 2)
+
+    # errors are reported by the futures
+    with pytest.raises(Exception):
+        gmod.run_async(x=np.zeros((3, 10), "float32")).result()
+
+    # closing finishes the queued requests and joins the threads of the stages
+    futures = [gmod.run_async(x=inp) for inp in inputs]
+    threads = [thread for pool, _ in gmod._pipeline._stages for thread in pool._threads]
+    gmod.close_async()
+    assert all(future.done() for future in futures)
+    assert not any(thread.is_alive() for thread in threads)
+
+
+@tvm.testing.requires_llvm
+def test_sampling_profiler():
+    x = relay.var("x", shape=(4, 10))
+    y = relay.nn.relu(relay.nn.dense(x, relay.var("w", shape=(10, 10))))
+    mod = tvm.IRModule.from_expr(relay.Function(relay.analysis.free_vars(y), y))
+    lib = relay.build(mod, target="llvm")
+    gmod = graph_executor.GraphModule(lib["default"](tvm.cpu(0)))
+    gmod.set_input(w=np.random.uniform(size=(10, 10)).astype("float32"))
+
+    gmod.enable_sampling_profiler(interval=3, capacity=2)
+    report = gmod.sampling_report()
+    assert len(report.calls) == 0
+    for _ in range(9):
+        gmod.run(x=np.random.uniform(size=(4, 10)).astype("float32"))
+    report = gmod.sampling_report()
+    # 3 runs were sampled, the buffer keeps the last 2
+    assert all(call["Count"].value == 2 for call in report.calls)
+    assert "fused_nn_dense" in str(report)
+    assert [m["Count"].value for m in report.device_metrics.values()] == [2]
+
+    gmod.disable_sampling_profiler()
+    with pytest.raises(tvm.TVMError):
+        gmod.sampling_report()
+
+
 if __name__ == "__main__":
     test_graph_simple()
     test_load_unexpected_params()
+    test_load_params_from_file()
+    test_set_input_output_zero_copy()
+    test_output_buffers()
+    test_graph_module_pool()
+    test_run_async()
+    test_sampling_profiler()
@@ -26,9 +26,9 @@ import tvm
 import tvm.testing
 from tvm import te
 import numpy as np
-from tvm import rpc
+from tvm import relay, rpc
 from tvm.contrib import utils
-from tvm.contrib.debugger import debug_executor
+from tvm.contrib.debugger import debug_executor, debug_result
 
 
 @tvm.testing.requires_llvm
@@ -185,5 +185,78 @@ def test_graph_simple():
     check_remote(rpc.Server("127.0.0.1"))
 
 
+@tvm.testing.requires_llvm
+def test_output_tensor_dump():
+    x = relay.var("x", shape=(2, 8), dtype="float32")
+    y = relay.nn.relu(x * relay.const(2.0))
+    mod = tvm.IRModule.from_expr(relay.Function([x], relay.sum(y, axis=1)))
+    lib = relay.build(mod, target="llvm")
+    data = np.random.uniform(-1, 1, size=(2, 8)).astype("float32")
+
+    temp = utils.tempdir()
+    paths = []
+    for name in ["a", "b"]:
+        try:
+            m = debug_executor.create(
+                lib.get_graph_json(), lib.get_lib(), tvm.cpu(0), dump_root=temp.relpath(name)
+            )
+        except ValueError:
+            return
+        m.run(x=data)
+        paths.append(os.path.join(m._dump_path, debug_result.OUTPUT_TENSORS_FILE_NAME))
+
+        # the dump is a parameter file, loaded by mapping it
+        tensors = m.debug_datum.get_output_tensors()
+        np.testing.assert_equal(tensors["x_0"].numpy(), data)
+        dumped = tvm.runtime.load_param_dict_from_file(paths[-1])
+        assert len(dumped) == len(tensors)
+
+    dump = debug_result.OutputTensorDump(paths[0])
+    assert dump.names[0] == "x____0"
+    np.testing.assert_equal(np.asarray(dump["x____0"]), data)
+    np.testing.assert_allclose(
+        np.asarray(dump[dump.names[-1]]), np.maximum(data * 2, 0).sum(axis=1), rtol=1e-5
+    )
+
+    diffs = list(debug_result.compare_output_tensor_dumps(paths[0], paths[1]))
+    assert [diff.name for diff in diffs] == dump.names
+    assert all(diff.num_mismatched == 0 and diff.max_abs_diff == 0 for diff in diffs)
+
+    # a diverging node is located, in small chunks
+    entries = [(name, "float32", list(dump[name].shape)) for name in dump.names]
+    path_c = temp.relpath("c.params")
+    with debug_result.OutputTensorWriter(path_c, entries) as writer:
+        for i, name in enumerate(dump.names):
+            value = np.array(dump[name])
+            if i == len(entries) - 1:
+                value[0] += 1.0
+            writer.write(value)
+    diffs = list(debug_result.compare_output_tensor_dumps(paths[0], path_c, chunk_size=1))
+    assert [diff.num_mismatched for diff in diffs[:-1]] == [0] * (len(diffs) - 1)
+    assert diffs[-1].num_mismatched == 1
+    np.testing.assert_allclose(diffs[-1].max_abs_diff, 1.0, rtol=1e-5)
+
+    # an empty tensor at the end of the file is still mapped within it
+    entries = [("zero", "float32", [4]), ("empty", "float32", [0])]
+    path_e = temp.relpath("e.params")
+    with debug_result.OutputTensorWriter(path_e, entries) as writer:
+        writer.write(np.zeros((4,), "float32"))
+        writer.write(np.zeros((0,), "float32"))
+    assert tvm.runtime.load_param_dict_from_file(path_e)["empty"].shape == (0,)
+    # the differences to zeros of the reference are relative to eps
+    path_f = temp.relpath("f.params")
+    with debug_result.OutputTensorWriter(path_f, entries) as writer:
+        writer.write(np.full((4,), 1e-3, "float32"))
+        writer.write(np.zeros((0,), "float32"))
+    diffs = list(debug_result.compare_output_tensor_dumps(path_e, path_f))
+    assert diffs[0].num_mismatched == 4
+    assert diffs[0].max_rel_diff > 1.0
+    assert diffs[1].num_mismatched == 0
+
+    with pytest.raises(ValueError):
+        with debug_result.OutputTensorWriter(temp.relpath("d.params"), entries) as writer:
+            writer.write(np.zeros((3,), "float32"))
+
+
 if __name__ == "__main__":
     sys.exit(pytest.main([__file__] + sys.argv[1:]))
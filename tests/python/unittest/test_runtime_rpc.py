@@ -538,3 +538,120 @@ def test_rpc_tracker_request():
     proc2.join()
     server.terminate()
     tracker.terminate()
+
+
+@tvm.testing.requires_rpc
+def test_rpc_asyncio_tracker():
+    # the asyncio tracker speaks the same protocol as the tornado one
+    from tvm.rpc import asyncio_tracker
+
+    tracker = asyncio_tracker.Tracker(port=9000, port_end=10000)
+    device_key = "test_device"
+    server = rpc.Server(
+        host="127.0.0.1",
+        port=9000,
+        port_end=10000,
+        key=device_key,
+        tracker_addr=("127.0.0.1", tracker.port),
+    )
+    time.sleep(1)
+    client = rpc.connect_tracker("127.0.0.1", tracker.port)
+    summary = client.summary()
+    assert summary["queue_info"][device_key]["free"] == 1
+
+    def check_remote():
+        remote = client.request(device_key)
+        f1 = remote.get_function("rpc.test.addone")
+        assert f1(10) == 11
+        summary = client.summary()
+        assert summary["queue_info"][device_key]["free"] == 0
+
+    check_remote()
+    time.sleep(1)
+    summary = client.summary()
+    assert summary["queue_info"][device_key]["free"] == 1
+
+    server.terminate()
+    time.sleep(1)
+    summary = client.summary()
+    assert summary["queue_info"][device_key]["free"] == 0
+    tracker.terminate()
+
+
+@tvm.testing.requires_rpc
+def test_rpc_asyncio_proxy():
+    # a server behind the asyncio proxy is requested through the tracker
+    from tvm.rpc import asyncio_proxy, asyncio_tracker
+
+    tracker = asyncio_tracker.Tracker(port=9000, port_end=10000)
+    proxy = asyncio_proxy.Proxy(
+        "127.0.0.1", port=9000, port_end=10000, tracker_addr=("127.0.0.1", tracker.port)
+    )
+    device_key = "test_device"
+    server = rpc.Server(host="127.0.0.1", port=proxy.port, is_proxy=True, key=device_key)
+    time.sleep(1)
+    client = rpc.connect_tracker("127.0.0.1", tracker.port)
+    summary = client.summary()
+    assert summary["queue_info"][device_key]["free"] == 1
+
+    remote = client.request(device_key)
+    f1 = remote.get_function("rpc.test.addone")
+    assert f1(10) == 11
+    summary = client.summary()
+    assert summary["queue_info"][device_key]["free"] == 0
+    del f1, remote
+    # the server connects to the proxy again once its session is over
+    time.sleep(3)
+    summary = client.summary()
+    assert summary["queue_info"][device_key]["free"] == 1
+
+    server.terminate()
+    proxy.terminate()
+    tracker.terminate()
+
+
+def test_rpc_asyncio_tracker_load():
+    from tvm.rpc import asyncio_tracker
+    from tvm.exec.rpc_load_test import run_load_test
+
+    tracker = asyncio_tracker.Tracker("127.0.0.1", port=9000, port_end=10000, silent=True)
+    res = run_load_test(("127.0.0.1", tracker.port), num_servers=4, num_clients=8, num_requests=5)
+    assert res["num_sessions"] == 8 * 5
+    assert res["num_mismatch"] == 0
+    assert res["request_latency"]["p99"] >= res["request_latency"]["p50"]
+    tracker.terminate()
+
+
+@tvm.testing.requires_rpc
+def test_rpc_server_session_slots():
+    # one server process serves one concurrent session per slot
+    tracker = Tracker(port=9000, port_end=10000)
+    device_key = "test_device"
+    server = rpc.Server(
+        host="127.0.0.1",
+        port=9000,
+        port_end=10000,
+        key=device_key,
+        tracker_addr=("127.0.0.1", tracker.port),
+        slots=[rpc.SessionSlot("slot0"), rpc.SessionSlot("slot1", env={"TVM_TEST_SLOT": "1"})],
+    )
+    assert len(server.ports) == 2
+    time.sleep(1)
+    client = rpc.connect_tracker("127.0.0.1", tracker.port)
+    summary = client.summary()
+    assert summary["queue_info"][device_key]["free"] == 2
+
+    def check_remote():
+        remote0 = client.request(device_key)
+        remote1 = client.request(device_key)
+        assert remote0.get_function("rpc.test.addone")(1) == 2
+        assert remote1.get_function("rpc.test.addone")(2) == 3
+        summary = client.summary()
+        assert summary["queue_info"][device_key]["free"] == 0
+
+    check_remote()
+    time.sleep(1)
+    summary = client.summary()
+    assert summary["queue_info"][device_key]["free"] == 2
+    server.terminate()
+    tracker.terminate()